@@ -40,6 +40,8 @@ from opentelemetry.sdk.trace import TracerProvider, export
 from pydantic import BaseModel
 from vertexai import agent_engines
 from vertexai.preview.reasoning_engines import AdkApp
+from vicaran_agent.cancellation import investigation_cancellations
+from vicaran_agent.outbox import callback_outbox
 
 # Required APIs for Agent Engine deployment
 REQUIRED_APIS = [
@@ -661,16 +663,28 @@ class AgentEngineApp(AdkApp):
         provider.add_span_processor(processor)
         trace.set_tracer_provider(provider)
         self.enable_tracing = True
+        # Deliver callbacks a previous instance left undelivered
+        callback_outbox.start_recovery()
 
     def register_feedback(self, feedback: dict[str, Any]) -> None:
         """Collect and log feedback from users."""
         feedback_obj = Feedback.model_validate(feedback)
         self.logger.log_struct(feedback_obj.model_dump(), severity="INFO")
 
+    def cancel_investigation(
+        self,
+        investigation_id: str,
+        reason: str = "Cancelled by the user",
+        notify: bool = False,
+    ) -> dict[str, bool]:
+        """Stop an investigation's run on this instance (see server.py)."""
+        cancelled = investigation_cancellations.cancel(investigation_id, reason, notify)
+        return {"success": True, "cancelled": cancelled}
+
     def register_operations(self) -> dict[str, list[str]]:
         """Register available operations for the agent."""
         operations = super().register_operations()
-        operations[""] = operations[""] + ["register_feedback"]
+        operations[""] = operations[""] + ["register_feedback", "cancel_investigation"]
         return operations
 
     def clone(self) -> "AgentEngineApp":
@@ -97,16 +97,15 @@ def main() -> None:
     env.update(env_vars)
 
     # Build command - use python module path to avoid Windows path canonicalization issues
+    # vicaran_agent.server is `adk api_server` plus Vicaran's startup hook
     cmd = [
         "uv",
         "run",
         "python",
         "-m",
-        "google.adk.cli",
-        "api_server",
+        "vicaran_agent.server",
         f"--session_service_uri={database_url}",
         "--port=8000",
-        ".",
     ]
 
     # Allow overriding port and host via command line arguments
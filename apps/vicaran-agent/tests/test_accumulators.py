@@ -0,0 +1,96 @@
+"""
+Tests for the append-only session state accumulators.
+"""
+
+from typing import Any
+
+from google.adk.sessions.state import State
+from vicaran_agent.accumulators import StateAccumulator
+
+accumulator = StateAccumulator("sources_accumulated", "source_id")
+
+
+def source(source_id: str, **fields: Any) -> dict[str, Any]:
+    return {"source_id": source_id, "title": "", "key_claims": [], **fields}
+
+
+class TestStateAccumulator:
+    """Tests for StateAccumulator."""
+
+    def test_delta_contains_only_new_item(self) -> None:
+        """Test that appending writes one item key, not the whole list."""
+        session_state: dict[str, Any] = {}
+        accumulator.clear(session_state)
+        accumulator.append(State(session_state, {}), source("s1", title="One"))
+
+        delta: dict[str, Any] = {}
+        accumulator.append(State(session_state, delta), source("s2", title="Two"))
+
+        assert list(delta) == ["sources_accumulated#s2"]
+        assert [s["title"] for s in session_state["sources_accumulated"]] == [
+            "One",
+            "Two",
+        ]
+
+    def test_overlapping_appends_keep_every_item(self) -> None:
+        """Test that concurrent tool contexts do not overwrite each other."""
+        session_state: dict[str, Any] = {}
+        accumulator.clear(session_state)
+        first_delta: dict[str, Any] = {}
+        second_delta: dict[str, Any] = {}
+
+        accumulator.append(State(session_state, first_delta), source("s1"))
+        accumulator.append(State(session_state, second_delta), source("s2"))
+
+        merged = {**first_delta, **second_delta}
+        assert set(merged) == {"sources_accumulated#s1", "sources_accumulated#s2"}
+        assert len(session_state["sources_accumulated"]) == 2
+
+    def test_same_id_is_merged(self) -> None:
+        """Test that a repeated ID merges fields instead of duplicating."""
+        state = State({}, {})
+        accumulator.clear(state)
+        accumulator.append(state, source("s1", title="One", key_claims=["a"]))
+        accumulator.append(state, source("s1", title="", key_claims=["a", "b"]))
+
+        assert accumulator.items(state) == [
+            source("s1", title="One", key_claims=["a", "b"])
+        ]
+        assert accumulator.get(state, "s1")["key_claims"] == ["a", "b"]
+
+    def test_rehydrate_restores_order_from_item_keys(self) -> None:
+        """Test that the rendered list can be rebuilt from persisted deltas."""
+        persisted: dict[str, Any] = {}
+        state = State({}, persisted)
+        accumulator.clear(state)
+        for source_id in ["s3", "s1", "s2"]:
+            accumulator.append(state, source(source_id))
+
+        # Reload: only the per-item keys were persisted
+        reloaded = State(
+            {k: v for k, v in persisted.items() if "#" in k},
+            {},
+        )
+        items = accumulator.rehydrate(reloaded)
+
+        assert [s["source_id"] for s in items] == ["s3", "s1", "s2"]
+
+    def test_reloaded_session_reads_persisted_items(self) -> None:
+        """Test that a stale persisted list is rebuilt on first read and append."""
+        persisted: dict[str, Any] = {}
+        state = State({}, persisted)
+        accumulator.clear(state)
+        accumulator.append(state, source("s1"))
+
+        # Reload: the list was persisted empty by clear(), temp: keys not at all
+        reloaded = State(
+            {
+                "sources_accumulated": [],
+                "sources_accumulated#s1": persisted["sources_accumulated#s1"],
+            },
+            {},
+        )
+
+        assert [s["source_id"] for s in accumulator.items(reloaded)] == ["s1"]
+        accumulator.append(reloaded, source("s2"))
+        assert [s["source_id"] for s in accumulator.items(reloaded)] == ["s1", "s2"]
@@ -0,0 +1,188 @@
+"""
+Tests for the investigation budget controller and its callbacks.
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator, Iterator
+from types import SimpleNamespace
+
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from vicaran_agent import callbacks
+from vicaran_agent.budget import InvestigationBudgetController, investigation_budget
+from vicaran_agent.callbacks import save_final_summary, skip_over_budget
+from vicaran_agent.fact_check_fanout import top_claims
+from vicaran_agent.pipelines import ModeRouterAgent
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeClock]:
+    fake = FakeClock()
+    monkeypatch.setattr(investigation_budget, "_clock", fake)
+    investigation_budget.start("inv", "quick")
+    yield fake
+    investigation_budget.finish("inv")
+
+
+def stage_context(agent_name: str, output_key: str, state: dict) -> SimpleNamespace:
+    return SimpleNamespace(
+        agent_name=agent_name,
+        state=state,
+        _invocation_context=SimpleNamespace(
+            agent=SimpleNamespace(output_key=output_key)
+        ),
+    )
+
+
+class TestInvestigationBudgetController:
+    """Tests for degradation steps."""
+
+    def test_steps_follow_the_most_used_budget(self) -> None:
+        """Test that steps deepen with time or calls and are never left."""
+        fake = FakeClock()
+        budget = InvestigationBudgetController(clock=fake)
+        budget.start("inv", "quick")
+        assert budget.step("inv") is None
+
+        fake.now = 330  # 55% of the quick wall-clock budget
+        assert budget.step("inv") == "fewer_sources"
+        assert budget.source_limit("inv", 15) == 8
+        assert budget.claim_limit("inv") is None
+
+        for _ in range(52):  # 52 of 60 model calls: 87%
+            budget.record_model_call("inv", SimpleNamespace(total_token_count=10))
+        assert budget.step("inv") == "top_claims"
+        assert budget.claim_limit("inv") == 5
+        assert budget.partial_reason("inv") is None
+
+        fake.now = 600
+        assert budget.partial_reason("inv") == (
+            "The quick mode wall-clock budget ran out"
+        )
+        fake.now = 0
+        assert budget.step("inv") == "summary_only"
+
+    def test_untracked_investigations_never_degrade(self) -> None:
+        """Test that an investigation without a started clock runs in full."""
+        budget = InvestigationBudgetController()
+        budget.record_tool_call("other")
+
+        assert budget.step("other") is None
+        assert budget.source_limit("other", 15) == 15
+
+
+class TestBudgetCallbacks:
+    """Tests for the callbacks acting on degradation steps."""
+
+    def test_timeline_skipped_before_other_stages(self, clock: FakeClock) -> None:
+        """Test that the timeline goes first and only the summary survives."""
+        state: dict = {"investigation_id": "inv"}
+        clock.now = 450  # 75%: skip_timeline
+
+        timeline = stage_context("timeline_builder", "timeline_events", state)
+        content = skip_over_budget(timeline)
+        assert content.parts[0].text.startswith("[TIMELINE_SKIPPED]")
+        assert state["timeline_events"].startswith("[TIMELINE_SKIPPED]")
+        assert skip_over_budget(stage_context("bias_analyzer", "b", state)) is None
+
+        clock.now = 600
+        assert skip_over_budget(stage_context("bias_analyzer", "b", state))
+        assert skip_over_budget(stage_context("summary_writer", "s", state)) is None
+
+    def test_summary_after_budget_runs_out_is_partial(
+        self, clock: FakeClock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the summary is delivered as INVESTIGATION_PARTIAL."""
+        sent: list[tuple[str, dict]] = []
+        monkeypatch.setattr(
+            callbacks.callback_outbox,
+            "enqueue",
+            lambda investigation_id, callback_type, data: sent.append(
+                (callback_type, data)
+            ),
+        )
+        monkeypatch.setattr(callbacks.stage_checkpoints, "clear", lambda _: None)
+
+        async def close_investigation(investigation_id: str) -> None:
+            return None
+
+        monkeypatch.setattr(
+            callbacks.callback_transport, "close_investigation", close_investigation
+        )
+        state = {
+            "investigation_id": "inv",
+            "investigation_summary": "**4/10**\n\n[INVESTIGATION_COMPLETE]",
+        }
+        clock.now = 601
+
+        asyncio.run(save_final_summary(SimpleNamespace(state=state)))
+
+        assert sent == [
+            (
+                "INVESTIGATION_PARTIAL",
+                {
+                    "summary": state["investigation_summary"],
+                    "overall_bias_score": 2.0,
+                    "partial_reason": "The quick mode wall-clock budget ran out",
+                },
+            )
+        ]
+        assert investigation_budget.step("inv") is None
+
+    def test_failed_run_stops_tracking(self) -> None:
+        """Test that the router forgets the budget of a run that raised."""
+
+        class FailingPipeline(BaseAgent):
+            async def _run_async_impl(
+                self, ctx: InvocationContext
+            ) -> AsyncGenerator[Event, None]:
+                investigation_budget.start("inv-failed", "quick")
+                raise RuntimeError("model unavailable")
+                yield
+
+        async def run() -> None:
+            router = ModeRouterAgent(
+                name="investigation_pipeline",
+                sub_agents=[FailingPipeline(name="quick_pipeline")],
+            )
+            service = InMemorySessionService()
+            session = await service.create_session(
+                app_name="test", user_id="u", state={"investigation_id": "inv-failed"}
+            )
+            ctx = InvocationContext(
+                session_service=service,
+                invocation_id="i",
+                agent=router,
+                session=session,
+            )
+            async for _ in router.run_async(ctx):
+                pass
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(run())
+
+        assert "inv-failed" not in investigation_budget._usage
+
+    def test_top_claims_keep_original_order(self) -> None:
+        """Test that the most important claims are kept in extraction order."""
+        claims = [
+            {"claim_id": "a", "importance_score": 0.2},
+            {"claim_id": "b", "importance_score": 0.9},
+            {"claim_id": "c"},
+            {"claim_id": "d", "importance_score": 0.5},
+        ]
+
+        assert [c["claim_id"] for c in top_claims(claims, 2)] == ["b", "d"]
@@ -0,0 +1,225 @@
+"""
+Tests for cooperative cancellation and the no-progress watchdog.
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.run_config import RunConfig
+from google.adk.events import Event
+from google.adk.models.llm_request import LlmRequest
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from vicaran_agent import callbacks
+from vicaran_agent.cancellation import (
+    CancellationRegistry,
+    InvestigationCancelledError,
+    investigation_cancellations,
+)
+from vicaran_agent.checkpoints import CheckpointStore
+from vicaran_agent.config import config
+from vicaran_agent.pipelines import ModeRouterAgent
+from vicaran_agent.tools import callback_api
+from vicaran_agent.transport import CallbackDeliveryError
+
+
+class HangingPipeline(BaseAgent):
+    """Fake pipeline that reports one source, then waits on a slow request."""
+
+    closed: list[str] = []
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            content=types.Content(role="model", parts=[types.Part(text="1 source")]),
+        )
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            self.closed.append("request cancelled")
+            raise
+
+
+async def run_router(cancel_after: float) -> tuple[list[str], list[str]]:
+    pipeline = HangingPipeline(name="quick_pipeline")
+    router = ModeRouterAgent(name="investigation_pipeline", sub_agents=[pipeline])
+    service = InMemorySessionService()
+    session = await service.create_session(
+        app_name="test", user_id="u", state={"investigation_id": "inv-1"}
+    )
+    ctx = InvocationContext(
+        session_service=service,
+        invocation_id="inv",
+        agent=router,
+        session=session,
+        run_config=RunConfig(),
+    )
+    asyncio.get_running_loop().call_later(
+        cancel_after,
+        investigation_cancellations.cancel,
+        "inv-1",
+        "No progress for 5 minutes",
+        True,
+    )
+
+    async def collect() -> list[str]:
+        return [event.content.parts[0].text async for event in router.run_async(ctx)]
+
+    return await asyncio.wait_for(collect(), timeout=5), pipeline.closed
+
+
+class TestModeRouterCancellation:
+    """Tests for ending a running pipeline."""
+
+    def test_cancel_closes_the_pipeline_mid_request(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the in-flight request is cancelled and the run reported."""
+        sent: list[tuple[str, dict[str, Any]]] = []
+        monkeypatch.setattr(
+            callbacks.callback_outbox,
+            "enqueue",
+            lambda investigation_id, callback_type, data: sent.append(
+                (callback_type, data)
+            ),
+        )
+
+        texts, closed = asyncio.run(run_router(cancel_after=0.05))
+
+        assert texts == [
+            "1 source",
+            "[INVESTIGATION_CANCELLED] No progress for 5 minutes",
+        ]
+        assert closed == ["request cancelled"]
+        assert sent == [
+            (
+                "INVESTIGATION_FAILED",
+                {"error_message": "No progress for 5 minutes"},
+            )
+        ]
+        assert not investigation_cancellations.is_cancelled("inv-1")
+
+
+class TestCancellationRegistry:
+    """Tests for hooks, the watchdog and deleted investigations."""
+
+    def test_watchdog_cancels_runs_without_progress(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that only runs idle for the stall window are cancelled."""
+        monkeypatch.setattr(config, "watchdog_stall_minutes", 5.0)
+        now = [0.0]
+        registry = CancellationRegistry(clock=lambda: now[0])
+        registry.start("idle")
+        registry.start("busy")
+
+        now[0] = 240
+        registry.progress("busy")
+        now[0] = 300
+
+        assert registry.check_stalled() == ["idle"]
+        with pytest.raises(InvestigationCancelledError) as error:
+            registry.check("idle")
+        assert error.value.notify is True
+        registry.check("busy")
+
+    def test_cancel_from_another_thread_wakes_the_run(self) -> None:
+        """Test that Agent Engine's threaded cancel reaches the run's loop."""
+        registry = CancellationRegistry()
+
+        async def cancel_from_thread() -> bool:
+            registry.start("inv-1")
+            run = registry._runs["inv-1"]
+            cancelled = await asyncio.to_thread(registry.cancel, "inv-1", "Abandoned")
+            await asyncio.wait_for(run.cancelled.wait(), timeout=1)
+            registry.finish("inv-1")
+            return cancelled
+
+        assert asyncio.run(cancel_from_thread()) is True
+
+    def test_model_and_tool_calls_count_as_progress(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a run busy in model or tool calls is not stalled."""
+        now = [0.0]
+        registry = CancellationRegistry(clock=lambda: now[0])
+        monkeypatch.setattr(callbacks, "investigation_cancellations", registry)
+        registry.start("inv-4")
+        state = {"investigation_id": "inv-4"}
+
+        now[0] = 500
+        callbacks.track_tool_call(
+            SimpleNamespace(name="tavily_search"), {}, SimpleNamespace(state=state)
+        )
+        now[0] = 900
+        asyncio.run(
+            callbacks.throttle_model_call(
+                SimpleNamespace(
+                    agent_name="fact_checker",
+                    invocation_id="i",
+                    state=state,
+                    _invocation_context=SimpleNamespace(branch=None),
+                ),
+                LlmRequest(),
+            )
+        )
+        now[0] = 1400
+
+        assert registry.check_stalled() == []
+
+    def test_deleted_investigation_is_cancelled(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a 404 from the callback API cancels the run."""
+
+        async def save(investigation_id: str, callback_type: str, data: dict) -> dict:
+            raise CallbackDeliveryError(404, "Investigation not found")
+
+        monkeypatch.setattr(
+            callback_api, "stage_checkpoints", CheckpointStore(str(tmp_path / "c.db"))
+        )
+        monkeypatch.setattr(callback_api.persistence_backend, "save", save)
+        investigation_cancellations.start("inv-2")
+        try:
+            with pytest.raises(CallbackDeliveryError):
+                asyncio.run(
+                    callback_api.save_item({}, "inv-2", "SOURCE_FOUND", {"url": "u"})
+                )
+            with pytest.raises(InvestigationCancelledError):
+                investigation_cancellations.check("inv-2")
+        finally:
+            investigation_cancellations.finish("inv-2")
+
+    def test_stream_close_failure_is_contained(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a failing stream close is awaited without raising."""
+        sent: list[str] = []
+        closed: list[str] = []
+
+        async def close_investigation(investigation_id: str) -> None:
+            closed.append(investigation_id)
+            raise ConnectionError("stream reset")
+
+        monkeypatch.setattr(
+            callbacks.callback_outbox,
+            "enqueue",
+            lambda investigation_id, callback_type, data: sent.append(callback_type),
+        )
+        monkeypatch.setattr(
+            callbacks.callback_transport, "close_investigation", close_investigation
+        )
+
+        asyncio.run(callbacks.end_cancelled_investigation("inv-3", "gone", True))
+
+        assert sent == ["INVESTIGATION_FAILED"]
+        assert closed == ["inv-3"]
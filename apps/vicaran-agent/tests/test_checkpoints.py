@@ -0,0 +1,69 @@
+"""
+Tests for stage checkpoints and the persisted-item ledger.
+"""
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from vicaran_agent.accumulators import claims_accumulator, sources_accumulator
+from vicaran_agent.checkpoints import CheckpointStore, checkpoint_state, restore_state
+from vicaran_agent.tools import callback_api
+
+
+def make_store(tmp_path: Path) -> CheckpointStore:
+    return CheckpointStore(str(tmp_path / "checkpoints.db"))
+
+
+class TestCheckpointStore:
+    """Tests for CheckpointStore."""
+
+    def test_resume_restores_latest_stage_state(self, tmp_path: Path) -> None:
+        """Test that a new process restores outputs and accumulated lists."""
+        state: dict = {"investigation_mode": "detailed"}
+        sources_accumulator.append(state, {"source_id": "s1", "title": "A"})
+        store = make_store(tmp_path)
+        store.save_stage("inv", "source_finder", checkpoint_state(state))
+        claims_accumulator.append(state, {"claim_id": "c1", "claim_text": "X"})
+        state["extracted_claims"] = "done"
+        store.save_stage("inv", "claim_extractor", checkpoint_state(state))
+        store.close()
+
+        reopened = make_store(tmp_path)
+        restored: dict = {}
+        restore_state(restored, reopened.latest_state("inv"))
+
+        assert reopened.completed_stages("inv") == ["source_finder", "claim_extractor"]
+        assert restored["extracted_claims"] == "done"
+        assert restored["sources_accumulated"] == [{"source_id": "s1", "title": "A"}]
+        assert restored["claims_accumulated"] == [{"claim_id": "c1", "claim_text": "X"}]
+
+
+class TestPersistedItemLedger:
+    """Tests for skipping writes of items persisted before a crash."""
+
+    def test_item_not_written_twice(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a retried fact check reuses the first write's result."""
+        writes: list[dict] = []
+
+        async def save(investigation_id: str, callback_type: str, data: dict) -> dict:
+            writes.append(data)
+            return {"fact_check_id": f"f{len(writes)}"}
+
+        monkeypatch.setattr(callback_api, "stage_checkpoints", make_store(tmp_path))
+        monkeypatch.setattr(callback_api.persistence_backend, "save", save)
+        context = SimpleNamespace(state={"investigation_id": "inv"})
+        data = {"claim_id": "c1", "source_id": "s1", "evidence_text": "E"}
+
+        first = asyncio.run(
+            callback_api.callback_api_tool("FACT_CHECKED", data, context)
+        )
+        retry = asyncio.run(
+            callback_api.callback_api_tool("FACT_CHECKED", dict(data), context)
+        )
+
+        assert len(writes) == 1
+        assert first == retry == {"success": True, "fact_check_id": "f1"}
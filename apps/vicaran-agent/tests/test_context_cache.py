@@ -0,0 +1,210 @@
+"""
+Tests for the Gemini context cache manager.
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.models.llm_request import LlmRequest
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from vicaran_agent import pipelines
+from vicaran_agent.accumulators import claims_accumulator, sources_accumulator
+from vicaran_agent.context_cache import ContextCacheManager
+from vicaran_agent.pipelines import ModeRouterAgent
+from vicaran_agent.projections import CACHED_CORPUS_FLAG
+
+
+class FakeCaches:
+    """Records cache API calls; optionally fails on create."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.created: list[types.CreateCachedContentConfig] = []
+        self.updated: list[str] = []
+        self.deleted: list[str] = []
+
+    async def create(self, *, model: str, config: Any) -> Any:
+        # Yield like a real API call, so concurrent creates can interleave
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("caching not supported")
+        self.created.append(config)
+        return SimpleNamespace(name=f"cachedContents/{len(self.created)}")
+
+    async def update(self, *, name: str, config: Any) -> None:
+        self.updated.append(name)
+
+    async def delete(self, *, name: str) -> None:
+        self.deleted.append(name)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_manager(caches: FakeCaches, clock: FakeClock) -> ContextCacheManager:
+    client = SimpleNamespace(aio=SimpleNamespace(caches=caches))
+    return ContextCacheManager(
+        ttl_seconds=600,
+        refresh_margin_seconds=120,
+        min_tokens=10,
+        client_factory=lambda: client,
+        clock=clock,
+    )
+
+
+def make_context(agent_name: str = "fact_checker") -> Any:
+    state: dict[str, Any] = {"investigation_id": "inv-1"}
+    sources_accumulator.clear(state)
+    claims_accumulator.clear(state)
+    sources_accumulator.append(state, {"source_id": "s1", "summary": "word " * 50})
+    claims_accumulator.append(state, {"claim_id": "c1", "claim_text": "A claim"})
+    return SimpleNamespace(state=state, agent_name=agent_name)
+
+
+def make_request() -> LlmRequest:
+    return LlmRequest(
+        model="gemini-test",
+        contents=[types.Content(role="user", parts=[types.Part(text="go")])],
+        config=types.GenerateContentConfig(
+            system_instruction="You are a Fact Checker.",
+            tools=[
+                types.Tool(function_declarations=[types.FunctionDeclaration(name="t")])
+            ],
+        ),
+    )
+
+
+class TestContextCacheManager:
+    """Tests for ContextCacheManager."""
+
+    def test_request_uses_cache_and_drops_duplicated_config(self) -> None:
+        """Test that requests point at one reused entry per agent."""
+        caches, clock = FakeCaches(), FakeClock()
+        manager = make_manager(caches, clock)
+        context = make_context()
+        manager.prepare_corpus(context)
+
+        first, second = make_request(), make_request()
+        asyncio.run(manager.apply(context, first))
+        asyncio.run(manager.apply(context, second))
+
+        assert context.state[CACHED_CORPUS_FLAG] is True
+        assert len(caches.created) == 1
+        assert "INVESTIGATION CORPUS" in caches.created[0].contents[0].parts[0].text
+        assert caches.created[0].system_instruction == "You are a Fact Checker."
+        assert second.config.cached_content == "cachedContents/1"
+        assert second.config.system_instruction is None
+        assert second.config.tools is None
+        assert len(second.contents) == 1
+
+    def test_concurrent_calls_share_one_entry(self) -> None:
+        """Test that shards starting together create the agent's entry once."""
+        caches, clock = FakeCaches(), FakeClock()
+        manager = make_manager(caches, clock)
+        context = make_context()
+        manager.prepare_corpus(context)
+        requests = [make_request() for _ in range(3)]
+
+        async def apply_all() -> None:
+            await asyncio.gather(*(manager.apply(context, r) for r in requests))
+
+        asyncio.run(apply_all())
+
+        assert len(caches.created) == 1
+        assert {r.config.cached_content for r in requests} == {"cachedContents/1"}
+
+    def test_ttl_refreshed_near_expiry_and_released(self) -> None:
+        """Test that entries are extended while running and deleted at the end."""
+        caches, clock = FakeCaches(), FakeClock()
+        manager = make_manager(caches, clock)
+        context = make_context()
+        manager.prepare_corpus(context)
+
+        asyncio.run(manager.apply(context, make_request()))
+        clock.now = 500
+        asyncio.run(manager.apply(context, make_request()))
+        asyncio.run(manager.release(context))
+
+        assert caches.updated == ["cachedContents/1"]
+        assert caches.deleted == ["cachedContents/1"]
+
+    def test_falls_back_to_inline_corpus_when_cache_fails(self) -> None:
+        """Test that a cache API error still delivers the corpus once."""
+        caches, clock = FakeCaches(fail=True), FakeClock()
+        manager = make_manager(caches, clock)
+        context = make_context()
+        manager.prepare_corpus(context)
+
+        request = make_request()
+        asyncio.run(manager.apply(context, request))
+
+        assert request.config.cached_content is None
+        assert request.config.system_instruction == "You are a Fact Checker."
+        assert request.contents[0].parts[0].text.startswith("INVESTIGATION CORPUS")
+        assert len(request.contents) == 2
+
+    def test_small_corpus_keeps_projections(self) -> None:
+        """Test that corpora under the minimum size are not cached."""
+        caches, clock = FakeCaches(), FakeClock()
+        manager = make_manager(caches, clock)
+        manager.min_tokens = 100_000
+        context = make_context()
+        manager.prepare_corpus(context)
+
+        request = make_request()
+        asyncio.run(manager.apply(context, request))
+
+        assert context.state[CACHED_CORPUS_FLAG] is False
+        assert caches.created == []
+        assert len(request.contents) == 1
+
+    def test_failed_run_releases_entries(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the router deletes the entries of a run that raised."""
+        caches, clock = FakeCaches(), FakeClock()
+        manager = make_manager(caches, clock)
+        monkeypatch.setattr(pipelines, "context_cache", manager)
+        context = make_context()
+
+        class FailingPipeline(BaseAgent):
+            async def _run_async_impl(
+                self, ctx: InvocationContext
+            ) -> AsyncGenerator[Event, None]:
+                manager.prepare_corpus(context)
+                await manager.apply(context, make_request())
+                raise RuntimeError("model unavailable")
+                yield
+
+        async def run() -> None:
+            router = ModeRouterAgent(
+                name="investigation_pipeline",
+                sub_agents=[FailingPipeline(name="quick_pipeline")],
+            )
+            service = InMemorySessionService()
+            session = await service.create_session(
+                app_name="test", user_id="u", state={"investigation_id": "inv-1"}
+            )
+            ctx = InvocationContext(
+                session_service=service,
+                invocation_id="i",
+                agent=router,
+                session=session,
+            )
+            async for _ in router.run_async(ctx):
+                pass
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(run())
+
+        assert caches.deleted == ["cachedContents/1"]
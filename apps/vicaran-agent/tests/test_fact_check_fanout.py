@@ -0,0 +1,127 @@
+"""
+Tests for fan-out fact checking across claim shards.
+"""
+
+import asyncio
+import json
+import re
+from collections.abc import AsyncGenerator
+
+from google.adk.agents import LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.run_config import RunConfig
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from vicaran_agent.accumulators import claims_accumulator
+from vicaran_agent.fact_check_fanout import (
+    FactCheckFanOutAgent,
+    merge_fact_check_outputs,
+)
+from vicaran_agent.rate_limiter import ModelRateLimiter
+
+TEMPLATE = "Check these claims.\nClaims: {claims_accumulated}\n"
+
+
+class EchoClaimsModel(BaseLlm):
+    """Fake model that verifies every claim ID found in its instruction."""
+
+    model: str = "echo-claims"
+    max_in_flight: int = 0
+    in_flight: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        claim_ids = re.findall(r'"(c\d+)"', str(llm_request.config.system_instruction))
+        text = json.dumps(
+            [
+                {"claim_id": claim_id, "verdict": "VERIFIED", "evidence_summary": "ok"}
+                for claim_id in claim_ids
+            ]
+        )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=text)])
+        )
+
+
+async def run_fan_out(claim_count: int) -> tuple[dict, EchoClaimsModel]:
+    model = EchoClaimsModel()
+    agent = FactCheckFanOutAgent(
+        name="fact_checker",
+        checker=LlmAgent(
+            name="fact_checker",
+            model=model,
+            include_contents="none",
+            instruction=TEMPLATE,
+            output_key="fact_check_results",
+        ),
+        template=TEMPLATE,
+        shard_size=3,
+        max_concurrency=2,
+    )
+    claims = [
+        {"claim_id": f"c{i}", "claim_text": f"Claim {i}", "source_ids": ["s1"]}
+        for i in range(claim_count)
+    ]
+    seeded: dict = {}
+    claims_accumulator.clear(seeded)
+    for claim in claims:
+        claims_accumulator.append(seeded, claim)
+    service = InMemorySessionService()
+    session = await service.create_session(
+        app_name="test",
+        user_id="u",
+        # As persisted: temp: keys are dropped
+        state={k: v for k, v in seeded.items() if not k.startswith("temp:")},
+    )
+    ctx = InvocationContext(
+        session_service=service,
+        invocation_id="i",
+        agent=agent,
+        session=session,
+        run_config=RunConfig(),
+    )
+    state: dict = {}
+    async for event in agent.run_async(ctx):
+        state.update(event.actions.state_delta)
+    return state, model
+
+
+class TestFactCheckFanOut:
+    """Tests for FactCheckFanOutAgent."""
+
+    def test_shards_merged_into_one_list(self) -> None:
+        """Test that every shard's verdicts appear once, in claim order."""
+        state, model = asyncio.run(run_fan_out(7))
+
+        results = state["fact_check_results"]
+        assert [r["claim_id"] for r in results] == [f"c{n}" for n in range(7)]
+        assert 1 < model.max_in_flight <= 2
+
+    def test_merge_strips_fences_and_drops_invalid_records(self) -> None:
+        """Test that fenced JSON is parsed and bad records or outputs are skipped."""
+        valid = {"claim_id": "c1", "verdict": "FALSE", "evidence_summary": "no"}
+        merged = merge_fact_check_outputs(
+            [
+                "```json\n" + json.dumps([valid, {"claim_id": "c2"}]) + "\n```",
+                "No claims could be checked.",
+            ]
+        )
+
+        assert merged == [{**valid, "confidence_score": 0.5}]
+
+    def test_concurrency_limited_by_rate_limiter_headroom(self) -> None:
+        """Test that the shard cap shrinks with the limiter's request headroom."""
+        limiter = ModelRateLimiter(requests_per_minute=4, tokens_per_minute=0)
+
+        assert limiter.concurrency_limit(3) == 3
+        for _ in range(3):
+            asyncio.run(limiter.acquire())
+        assert limiter.concurrency_limit(3) == 1
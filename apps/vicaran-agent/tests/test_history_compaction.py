@@ -0,0 +1,62 @@
+"""
+Tests for tool-output compaction in the request history.
+"""
+
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+from vicaran_agent.callbacks import normalize_url
+from vicaran_agent.history_compaction import compact_tool_outputs
+
+
+def page(url: str) -> types.Content:
+    return types.Content(
+        role="user",
+        parts=[
+            types.Part(
+                function_response=types.FunctionResponse(
+                    id=f"call-{url}",
+                    name="jina_reader_tool",
+                    response={
+                        "success": True,
+                        "url": url,
+                        "is_reachable": True,
+                        "content": "page text " * 500,
+                    },
+                )
+            )
+        ],
+    )
+
+
+class TestCompactToolOutputs:
+    """Tests for compact_tool_outputs."""
+
+    def test_saved_sources_are_stubbed_and_others_kept(self) -> None:
+        """Test that only saved sources lose their page text."""
+        saved, pending = page("https://www.a.com/story/"), page("https://b.com/x")
+        request = LlmRequest(contents=[saved, pending])
+
+        before, after = compact_tool_outputs(
+            request, {"https://a.com/story": "src-1"}, normalize_url
+        )
+
+        stub = request.contents[0].parts[0].function_response
+        assert stub.response == {
+            "url": "https://www.a.com/story/",
+            "is_reachable": True,
+            "source_id": "src-1",
+            "compacted": True,
+        }
+        assert stub.id == "call-https://www.a.com/story/"
+        assert request.contents[1] is pending
+        assert after < before / 1.5
+
+    def test_session_content_is_not_mutated(self) -> None:
+        """Test that the Content shared with session events stays intact."""
+        original = page("https://a.com/story")
+        request = LlmRequest(contents=[original])
+
+        compact_tool_outputs(request, {"https://a.com/story": "src-1"})
+
+        assert "content" in original.parts[0].function_response.response
+        assert request.contents[0] is not original
@@ -0,0 +1,269 @@
+"""
+Tests for per-stage model routing, overload fallback and call metrics.
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from types import SimpleNamespace
+
+import pytest
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from vicaran_agent import callbacks, model_routing
+from vicaran_agent.config import ModelPolicy, config
+from vicaran_agent.context_cache import ContextCacheManager, _CacheEntry
+from vicaran_agent.model_metrics import ModelCallMetrics
+from vicaran_agent.model_routing import model_settings, resolve_model_policy
+from vicaran_agent.pipelines import PIPELINE_STAGES, build_pipeline
+from vicaran_agent.prompt_budget import PromptBudget
+
+
+class FallbackModel(BaseLlm):
+    """Fake fallback model that answers every request."""
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        yield LlmResponse(
+            content=types.Content(
+                role="model", parts=[types.Part(text=f"from {self.model}")]
+            )
+        )
+
+
+def callback_context(agent_name: str, mode: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        agent_name=agent_name,
+        state={"investigation_mode": mode},
+        invocation_id="inv-1",
+        _invocation_context=SimpleNamespace(branch=None),
+    )
+
+
+class TestModelPolicies:
+    """Resolving and applying routing policies."""
+
+    def test_mode_entry_overrides_stage_entry(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that base, stage and stage:mode entries are layered in order."""
+        monkeypatch.setattr(
+            config,
+            "model_policies",
+            {
+                "bias_analyzer": ModelPolicy(model="flash", thinking_budget=1024),
+                "bias_analyzer:quick": ModelPolicy(thinking_budget=0),
+            },
+        )
+
+        quick = resolve_model_policy("bias_analyzer", "quick")
+        detailed = resolve_model_policy("bias_analyzer", "detailed")
+        other = resolve_model_policy("summary_writer", "quick")
+
+        assert (quick.model, quick.thinking_budget) == ("flash", 0)
+        assert (detailed.model, detailed.thinking_budget) == ("flash", 1024)
+        assert other.model == config.default_model
+        assert other.fallback_model == config.fallback_model
+
+    def test_model_alias_names_config_field(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that "reasoning_model" resolves to the configured model ID."""
+        monkeypatch.setattr(config, "reasoning_model", "deep-thinker")
+        monkeypatch.setattr(
+            config,
+            "model_policies",
+            {"fact_checker": ModelPolicy(model="reasoning_model")},
+        )
+
+        assert resolve_model_policy("fact_checker").model == "deep-thinker"
+
+    def test_settings_keep_base_generation_config(self) -> None:
+        """Test that temperature and thinking budget extend existing settings."""
+        base = types.GenerateContentConfig(top_p=0.9)
+        settings = model_settings(
+            ModelPolicy(model="flash", temperature=0.2, thinking_budget=512), base
+        )
+
+        assert settings["model"] == "flash"
+        assert settings["generate_content_config"].temperature == 0.2
+        assert settings["generate_content_config"].top_p == 0.9
+        assert settings["planner"].thinking_config.thinking_budget == 512
+        assert base.temperature is None
+
+    def test_pipelines_apply_policies_per_mode(self) -> None:
+        """Test that built stages carry the default policies' models and budgets."""
+        quick = build_pipeline("quick", PIPELINE_STAGES)
+        detailed = build_pipeline("detailed")
+
+        quick_bias = quick.find_sub_agent("bias_analyzer")
+        assert quick_bias.model == "gemini-2.5-flash"
+        assert quick_bias.planner.thinking_config.thinking_budget == 0
+        detailed_bias = detailed.find_sub_agent("bias_analyzer")
+        assert detailed_bias.planner.thinking_config.thinking_budget == 1024
+        assert detailed.find_sub_agent("summary_writer").model == config.default_model
+
+
+class TestOverloadFallback:
+    """Retrying overloaded calls on the fallback model."""
+
+    def test_overloaded_call_retried_on_fallback(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a 503 returns the fallback model's response."""
+        monkeypatch.setattr(
+            model_routing.LLMRegistry,
+            "new_llm",
+            lambda model: FallbackModel(model=model),
+        )
+        metrics = ModelCallMetrics()
+        monkeypatch.setattr(callbacks, "model_call_metrics", metrics)
+        request = LlmRequest(model="gemini-2.5-flash")
+        error = RuntimeError("503 UNAVAILABLE. The model is overloaded.")
+
+        response = asyncio.run(
+            callbacks.handle_model_error(
+                callback_context("bias_analyzer", "quick"), request, error
+            )
+        )
+
+        assert response.content.parts[0].text == "from gemini-2.5-flash-lite"
+        assert request.model == "gemini-2.5-flash-lite"
+        assert metrics.report()["bias_analyzer/gemini-2.5-flash-lite"]["fallbacks"] == 1
+
+    def test_cached_request_sent_inline_to_fallback(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the fallback gets the instruction and corpus, not the cache."""
+        sent: list[LlmRequest] = []
+
+        class RecordingModel(FallbackModel):
+            async def generate_content_async(
+                self, llm_request: LlmRequest, stream: bool = False
+            ) -> AsyncGenerator[LlmResponse, None]:
+                sent.append(llm_request)
+                async for response in super().generate_content_async(llm_request):
+                    yield response
+
+        monkeypatch.setattr(
+            model_routing.LLMRegistry,
+            "new_llm",
+            lambda model: RecordingModel(model=model),
+        )
+        monkeypatch.setattr(callbacks, "model_call_metrics", ModelCallMetrics())
+        cache = ContextCacheManager()
+        cache._corpora["inv"] = "CORPUS"
+        cache._entries["inv"] = {
+            "bias_analyzer": _CacheEntry(
+                "cachedContents/1", "f", 0.0, "You analyze bias", None, None
+            )
+        }
+        monkeypatch.setattr(callbacks, "context_cache", cache)
+        request = LlmRequest(
+            model="gemini-2.5-flash",
+            contents=[types.Content(role="user", parts=[types.Part(text="go")])],
+            config=types.GenerateContentConfig(cached_content="cachedContents/1"),
+        )
+        context = callback_context("bias_analyzer", "quick")
+        context.state["investigation_id"] = "inv"
+        error = RuntimeError("503 UNAVAILABLE. The model is overloaded.")
+
+        asyncio.run(callbacks.handle_model_error(context, request, error))
+
+        assert sent[0].config.cached_content is None
+        assert sent[0].config.system_instruction == "You analyze bias"
+        assert [c.parts[0].text for c in sent[0].contents] == ["CORPUS", "go"]
+        assert request.config.cached_content == "cachedContents/1"
+
+    def test_other_errors_propagate(self) -> None:
+        """Test that non-overload errors are not retried."""
+        request = LlmRequest(model="gemini-2.5-flash")
+
+        response = asyncio.run(
+            callbacks.handle_model_error(
+                callback_context("bias_analyzer", "quick"),
+                request,
+                ValueError("400 INVALID_ARGUMENT"),
+            )
+        )
+
+        assert response is None
+        assert request.model == "gemini-2.5-flash"
+
+    def test_failed_call_drops_pending_estimate(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that an unrecovered error leaves no per-call state behind."""
+        budget = PromptBudget({}, 100000, [])
+        metrics = ModelCallMetrics()
+        monkeypatch.setattr(callbacks, "prompt_budget", budget)
+        monkeypatch.setattr(callbacks, "model_call_metrics", metrics)
+        context = callback_context("bias_analyzer", "quick")
+        request = LlmRequest(model="gemini-2.5-flash")
+        callbacks.enforce_prompt_budget(context, request)
+        metrics.start(callbacks._model_call_key(context))
+
+        asyncio.run(
+            callbacks.handle_model_error(
+                context, request, ValueError("400 INVALID_ARGUMENT")
+            )
+        )
+
+        assert budget._pending == {}
+        assert metrics._started == {}
+        assert metrics.report()["bias_analyzer/gemini-2.5-flash"]["errors"] == 1
+
+
+class TestModelCallMetrics:
+    """Per-stage latency and token accounting."""
+
+    def test_records_latency_and_tokens_per_stage_and_model(self) -> None:
+        """Test that concurrent calls are timed separately by call key."""
+        now = [0.0]
+        metrics = ModelCallMetrics(clock=lambda: now[0])
+        usage = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=1000, candidates_token_count=200, thoughts_token_count=50
+        )
+
+        metrics.start(("inv", "shard_0", "fact_checker"))
+        now[0] = 1.0
+        metrics.start(("inv", "shard_1", "fact_checker"))
+        now[0] = 4.0
+        first = metrics.record(
+            "fact_checker", "pro", usage, ("inv", "shard_0", "fact_checker")
+        )
+        second = metrics.record(
+            "fact_checker", "pro", usage, ("inv", "shard_1", "fact_checker")
+        )
+
+        assert (first, second) == (4.0, 3.0)
+        report = metrics.report()["fact_checker/pro"]
+        assert report["calls"] == 2
+        assert report["avg_latency_seconds"] == 3.5
+        assert report["max_latency_seconds"] == 4.0
+        assert (
+            report["prompt_tokens"],
+            report["output_tokens"],
+            report["thinking_tokens"],
+        ) == (2000, 400, 100)
+
+    def test_errors_counted_apart_from_timed_calls(self) -> None:
+        """Test that failed calls raise the error rate, not the latency."""
+        now = [0.0]
+        metrics = ModelCallMetrics(clock=lambda: now[0])
+        usage = types.GenerateContentResponseUsageMetadata(prompt_token_count=10)
+
+        metrics.start("ok")
+        metrics.start("failed")
+        now[0] = 2.0
+        metrics.record("fact_checker", "pro", usage, "ok")
+        now[0] = 60.0
+        metrics.record_error("fact_checker", "pro", "failed")
+
+        report = metrics.report()["fact_checker/pro"]
+        assert (report["calls"], report["errors"]) == (1, 1)
+        assert report["error_rate"] == 0.5
+        assert report["avg_latency_seconds"] == 2.0
+        assert metrics._started == {}
@@ -0,0 +1,136 @@
+"""
+Tests for the durable callback outbox.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+from vicaran_agent.outbox import CallbackOutbox
+
+
+def make_outbox(
+    tmp_path: Path, handler: httpx.MockTransport | None = None
+) -> CallbackOutbox:
+    return CallbackOutbox(
+        db_path=str(tmp_path / "outbox.db"),
+        api_url="http://callback.test/api/agent-callback",
+        api_secret="secret",
+        base_backoff_seconds=0.0,
+        max_backoff_seconds=0.0,
+        max_attempts=3,
+        transport=handler,
+    )
+
+
+class TestCallbackOutbox:
+    """Tests for CallbackOutbox."""
+
+    def test_events_survive_restart(self, tmp_path: Path) -> None:
+        """Test that queued events are still pending in a new outbox instance."""
+        outbox = make_outbox(tmp_path)
+        outbox.enqueue("inv-1", "INVESTIGATION_STARTED", {})
+        asyncio.run(outbox.close())
+
+        reopened = make_outbox(tmp_path)
+        assert reopened.pending_count("inv-1") == 1
+
+    def test_delivers_in_order_with_idempotency_keys(self, tmp_path: Path) -> None:
+        """Test that events for one investigation arrive in enqueue order."""
+        received: list[tuple[str, str]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            received.append((body["type"], request.headers["Idempotency-Key"]))
+            return httpx.Response(200, json={"success": True})
+
+        outbox = make_outbox(tmp_path, httpx.MockTransport(handler))
+        first = outbox.enqueue("inv-1", "INVESTIGATION_STARTED", {})
+        second = outbox.enqueue("inv-1", "INVESTIGATION_COMPLETE", {"summary": "x"})
+
+        async def run() -> bool:
+            try:
+                return await outbox.flush(timeout=5)
+            finally:
+                await outbox.close()
+
+        assert asyncio.run(run()) is True
+        assert received == [
+            ("INVESTIGATION_STARTED", first),
+            ("INVESTIGATION_COMPLETE", second),
+        ]
+
+    def test_retries_transient_failures(self, tmp_path: Path) -> None:
+        """Test that a 503 is retried until delivery succeeds."""
+        responses = iter([503, 503, 200])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(next(responses))
+
+        outbox = make_outbox(tmp_path, httpx.MockTransport(handler))
+        outbox.enqueue("inv-1", "INVESTIGATION_STARTED", {})
+
+        async def run() -> bool:
+            try:
+                return await outbox.flush(timeout=5)
+            finally:
+                await outbox.close()
+
+        assert asyncio.run(run()) is True
+
+    def test_permanent_rejection_is_dead_lettered(self, tmp_path: Path) -> None:
+        """Test that a 400 is not retried and does not block later events."""
+        seen: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            callback_type = json.loads(request.content)["type"]
+            seen.append(callback_type)
+            status = 400 if callback_type == "INVESTIGATION_STARTED" else 200
+            return httpx.Response(status)
+
+        outbox = make_outbox(tmp_path, httpx.MockTransport(handler))
+        outbox.enqueue("inv-1", "INVESTIGATION_STARTED", {})
+        outbox.enqueue("inv-1", "INVESTIGATION_COMPLETE", {"summary": "x"})
+
+        async def run() -> None:
+            try:
+                await outbox.flush(timeout=5)
+            finally:
+                await outbox.close()
+
+        asyncio.run(run())
+
+        reopened = make_outbox(tmp_path)
+        assert seen == ["INVESTIGATION_STARTED", "INVESTIGATION_COMPLETE"]
+        assert [e["callback_type"] for e in reopened.dead_letters()] == [
+            "INVESTIGATION_STARTED"
+        ]
+
+    def test_coalesce_key_keeps_latest_event(self, tmp_path: Path) -> None:
+        """Test that coalesced events replace older pending ones."""
+        outbox = make_outbox(tmp_path)
+        outbox.enqueue("inv-1", "SUMMARY_UPDATED", {"summary": "a"}, "summary:inv-1")
+        outbox.enqueue("inv-1", "SUMMARY_UPDATED", {"summary": "ab"}, "summary:inv-1")
+
+        assert outbox.pending_count("inv-1") == 1
+
+    def test_recovery_delivers_leftovers_at_startup(self, tmp_path: Path) -> None:
+        """Test that events from a previous process are sent without new ones."""
+        sent: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(json.loads(request.content)["type"])
+            return httpx.Response(200)
+
+        previous = make_outbox(tmp_path)
+        previous.enqueue("inv-1", "INVESTIGATION_STARTED", {})
+        asyncio.run(previous.close())
+
+        outbox = make_outbox(tmp_path, httpx.MockTransport(handler))
+        thread = outbox.start_recovery()
+        thread.join(timeout=5)
+
+        assert sent == ["INVESTIGATION_STARTED"]
+        assert outbox.pending_count() == 0
+        assert make_outbox(tmp_path).start_recovery() is None
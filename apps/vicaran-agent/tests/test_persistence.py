@@ -0,0 +1,247 @@
+"""
+Tests for the direct database persistence backend (SQLite stand-in).
+"""
+
+import asyncio
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from vicaran_agent.persistence import (
+    DatabaseBackend,
+    claim_sources_table,
+    claims_table,
+    investigations_table,
+    sources_table,
+    timeline_events_table,
+)
+from vicaran_agent.transport import CallbackDeliveryError
+
+INVESTIGATION_ID = str(uuid.uuid4())
+
+
+@pytest.fixture
+def backend(tmp_path: Path) -> DatabaseBackend:
+    backend = DatabaseBackend(f"sqlite:///{tmp_path / 'vicaran.db'}")
+    backend.create_tables()
+    with backend.engine.begin() as conn:
+        conn.execute(investigations_table.insert(), [{"id": INVESTIGATION_ID}])
+    return backend
+
+
+class TestDatabaseBackend:
+    """Tests for DatabaseBackend."""
+
+    def test_sources_upsert_by_url(self, backend: DatabaseBackend) -> None:
+        """Test that repeated URLs reuse the existing source row."""
+        first = asyncio.run(
+            backend.save_many(
+                INVESTIGATION_ID,
+                "SOURCE_FOUND",
+                [
+                    {"url": "https://a.com", "title": "A", "summary": "old"},
+                    {"url": "https://b.com", "title": "B", "credibility_score": 4},
+                ],
+            )
+        )
+        again = asyncio.run(
+            backend.save(
+                INVESTIGATION_ID,
+                "SOURCE_FOUND",
+                {"url": "https://a.com", "title": "A2", "summary": "new"},
+            )
+        )
+
+        assert again["source_id"] == first[0]["source_id"]
+        with backend.engine.connect() as conn:
+            rows = conn.execute(select(sources_table).order_by(sources_table.c.url))
+            assert [(r.title, r.content_snippet) for r in rows] == [
+                ("A2", "new"),
+                ("B", None),
+            ]
+
+    def test_claims_fact_checks_and_bias(self, backend: DatabaseBackend) -> None:
+        """Test the claim → fact check → bias flow mirrors the callback route."""
+        [source] = asyncio.run(
+            backend.save_many(
+                INVESTIGATION_ID, "SOURCE_FOUND", [{"url": "https://a.com"}]
+            )
+        )
+        claims = asyncio.run(
+            backend.save_many(
+                INVESTIGATION_ID,
+                "CLAIM_EXTRACTED",
+                [
+                    {"claim_text": "One", "source_ids": [source["source_id"]]},
+                    {"claim_text": "Two", "source_ids": [source["source_id"]]},
+                ],
+            )
+        )
+        fact_checks = asyncio.run(
+            backend.save_many(
+                INVESTIGATION_ID,
+                "FACT_CHECKED",
+                [
+                    {
+                        "claim_id": claims[0]["claim_id"],
+                        "evidence_type": "supporting",
+                        "evidence_text": "Confirmed",
+                    },
+                    {
+                        "claim_id": claims[1]["claim_id"],
+                        "source_id": source["source_id"],
+                        "evidence_type": "supporting",
+                        "evidence_text": "Confirmed",
+                    },
+                    {
+                        "claim_id": claims[1]["claim_id"],
+                        "evidence_type": "contradicting",
+                        "evidence_text": "Refuted",
+                    },
+                ],
+            )
+        )
+        asyncio.run(
+            backend.save(
+                INVESTIGATION_ID,
+                "BIAS_ANALYZED",
+                {"source_id": source["source_id"], "bias_score": 3},
+            )
+        )
+
+        assert all("fact_check_id" in result for result in fact_checks)
+        with backend.engine.connect() as conn:
+            statuses = {
+                str(row.id): (row.status, row.evidence_count)
+                for row in conn.execute(select(claims_table))
+            }
+            links = conn.execute(select(claim_sources_table)).all()
+            bias = conn.execute(select(sources_table.c.bias_score)).scalar_one()
+        assert statuses[claims[0]["claim_id"]] == ("verified", 1)
+        assert statuses[claims[1]["claim_id"]] == ("contradicted", 2)
+        assert len(links) == 2
+        assert bias == "3.00"
+
+    def test_timeline_events_accept_date_only(self, backend: DatabaseBackend) -> None:
+        """Test that timeline events take the first of source_ids."""
+        [source] = asyncio.run(
+            backend.save_many(
+                INVESTIGATION_ID, "SOURCE_FOUND", [{"url": "https://a.com"}]
+            )
+        )
+        [event] = asyncio.run(
+            backend.save_many(
+                INVESTIGATION_ID,
+                "TIMELINE_EVENT",
+                [
+                    {
+                        "event_date": "2024-12-31",
+                        "event_text": "Launch",
+                        "source_ids": [source["source_id"]],
+                    }
+                ],
+            )
+        )
+
+        with backend.engine.connect() as conn:
+            row = conn.execute(select(timeline_events_table)).one()
+        assert str(row.id) == event["event_id"]
+        assert str(row.source_id) == source["source_id"]
+
+    def test_unknown_investigation_is_rejected(self, backend: DatabaseBackend) -> None:
+        """Test that writes for a missing investigation raise a 404."""
+        with pytest.raises(CallbackDeliveryError) as exc_info:
+            asyncio.run(
+                backend.save(
+                    str(uuid.uuid4()), "SOURCE_FOUND", {"url": "https://a.com"}
+                )
+            )
+        assert exc_info.value.status_code == 404
+
+    def test_invalid_items_rejected_like_the_route(
+        self, backend: DatabaseBackend
+    ) -> None:
+        """Test that items failing the route's schema are not written."""
+        results = asyncio.run(
+            backend.save_many(
+                INVESTIGATION_ID,
+                "SOURCE_FOUND",
+                [
+                    {"url": "https://a.com", "credibility_score": 4},
+                    {"url": "not a url"},
+                    {"url": "https://b.com", "credibility_score": 9},
+                ],
+            )
+        )
+
+        assert "source_id" in results[0]
+        assert [r["success"] for r in results[1:]] == [False, False]
+        assert "credibility_score" in results[2]["error"]
+        with backend.engine.connect() as conn:
+            urls = conn.execute(select(sources_table.c.url)).scalars().all()
+        assert urls == ["https://a.com"]
+
+        with pytest.raises(CallbackDeliveryError) as exc_info:
+            asyncio.run(
+                backend.save(
+                    INVESTIGATION_ID,
+                    "FACT_CHECKED",
+                    {
+                        "claim_id": "c1",
+                        "evidence_type": "supporting",
+                        "evidence_text": "Confirmed",
+                    },
+                )
+            )
+        assert exc_info.value.status_code == 400
+
+    def test_db_error_fails_only_that_row(self, backend: DatabaseBackend) -> None:
+        """Test that a foreign-key violation is reported for its row alone."""
+        [source] = asyncio.run(
+            backend.save_many(
+                INVESTIGATION_ID, "SOURCE_FOUND", [{"url": "https://a.com"}]
+            )
+        )
+        results = asyncio.run(
+            backend.save_many(
+                INVESTIGATION_ID,
+                "TIMELINE_EVENT",
+                [
+                    {
+                        "event_date": "2024-01-01",
+                        "event_text": "Known",
+                        "source_id": source["source_id"],
+                    },
+                    {
+                        "event_date": "2024-01-02",
+                        "event_text": "Unknown source",
+                        "source_id": str(uuid.uuid4()),
+                    },
+                ],
+            )
+        )
+
+        assert "event_id" in results[0]
+        assert results[1]["success"] is False
+        assert "Database error" in results[1]["error"]
+        with backend.engine.connect() as conn:
+            texts = conn.execute(select(timeline_events_table.c.event_text)).all()
+        assert [t for (t,) in texts] == ["Known"]
+
+    def test_database_failure_raises_delivery_error(
+        self, backend: DatabaseBackend
+    ) -> None:
+        """Test that errors outside the rows surface as CallbackDeliveryError."""
+        with backend.engine.begin() as conn:
+            conn.exec_driver_sql("DROP TABLE investigations")
+
+        with pytest.raises(CallbackDeliveryError) as exc_info:
+            asyncio.run(
+                backend.save(
+                    INVESTIGATION_ID,
+                    "BIAS_ANALYZED",
+                    {"source_id": str(uuid.uuid4()), "bias_score": 3},
+                )
+            )
+        assert exc_info.value.status_code == 500
@@ -0,0 +1,200 @@
+"""
+Tests for the mode-specific investigation pipelines.
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from types import SimpleNamespace
+
+import pytest
+from google.adk.agents import BaseAgent, ParallelAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from vicaran_agent import callbacks
+from vicaran_agent.agent import pipelines
+from vicaran_agent.config import config
+from vicaran_agent.pipelines import (
+    PIPELINE_STAGES,
+    ModeRouterAgent,
+    StageSpec,
+    build_pipeline,
+)
+
+
+def stage_names(
+    mode: str, stages: tuple[StageSpec, ...] | None = None
+) -> list[str | list[str]]:
+    pipeline = build_pipeline(mode, stages) if stages else pipelines[mode]
+    return [
+        (
+            [agent.name for agent in step.sub_agents]
+            if isinstance(step, ParallelAgent)
+            else step.name
+        )
+        for step in pipeline.sub_agents
+    ]
+
+
+class NamedAgent(BaseAgent):
+    """Stub pipeline that emits one event authored by itself."""
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        yield Event(author=self.name, invocation_id=ctx.invocation_id)
+
+
+async def run(router: BaseAgent, state: dict) -> list[Event]:
+    service = InMemorySessionService()
+    session = await service.create_session(app_name="test", user_id="u", state=state)
+    ctx = InvocationContext(
+        session_service=service, invocation_id="i", agent=router, session=session
+    )
+    return [event async for event in router.run_async(ctx)]
+
+
+async def route(mode: str) -> list[str]:
+    router = ModeRouterAgent(
+        name="investigation_pipeline",
+        sub_agents=[
+            NamedAgent(name="quick_pipeline"),
+            NamedAgent(name="detailed_pipeline"),
+        ],
+    )
+    events = await run(router, {"investigation_mode": mode})
+    return [event.author for event in events]
+
+
+def run_stages(*stages: StageSpec, **state: list) -> list[tuple[str, str | None]]:
+    router = ModeRouterAgent(
+        name="investigation_pipeline", sub_agents=[build_pipeline("quick", stages)]
+    )
+    events = asyncio.run(run(router, {"investigation_mode": "quick", **state}))
+    return [
+        (event.author, event.content.parts[0].text if event.content else None)
+        for event in events
+    ]
+
+
+class TestPipelines:
+    """Tests for pipelines built from the declarative stage list."""
+
+    def test_quick_pipeline_uses_single_call_fast_path(self) -> None:
+        """Test that quick mode analyzes the sources in one stage by default."""
+        assert stage_names("quick") == ["source_finder", "quick_analyzer"]
+
+    def test_quick_pipeline_has_no_timeline_stage(self) -> None:
+        """Test that the full quick pipeline skips the timeline stage entirely."""
+        assert stage_names("quick", PIPELINE_STAGES) == [
+            "source_finder",
+            "claim_extractor",
+            ["fact_checker", "bias_analyzer"],
+            "summary_writer",
+        ]
+
+    def test_detailed_pipeline_runs_analysis_in_parallel(self) -> None:
+        """Test that independent analysis stages share one parallel step."""
+        assert stage_names("detailed") == [
+            "source_finder",
+            "claim_extractor",
+            ["fact_checker", "bias_analyzer", "timeline_builder"],
+            "summary_writer",
+        ]
+
+    def test_parallel_stages_write_distinct_output_keys(self) -> None:
+        """Test that concurrent stages never write the same state key."""
+        [parallel] = [
+            step
+            for step in pipelines["detailed"].sub_agents
+            if isinstance(step, ParallelAgent)
+        ]
+        output_keys = [agent.output_key for agent in parallel.sub_agents]
+
+        assert len(set(output_keys)) == len(output_keys)
+
+    def test_router_delegates_by_investigation_mode(self) -> None:
+        """Test that the router runs only the pipeline for the session's mode."""
+        assert "detailed_pipeline" in asyncio.run(route("detailed"))
+        assert "quick_pipeline" not in asyncio.run(route("detailed"))
+        assert "quick_pipeline" in asyncio.run(route("quick"))
+
+
+class TestShortCircuits:
+    """Tests for code-driven stage skips and early termination."""
+
+    def test_stage_with_empty_inputs_answers_without_running(self) -> None:
+        """Test that a stage whose inputs are empty emits its marker only."""
+        events = run_stages(
+            StageSpec(
+                NamedAgent(name="bias_analyzer"),
+                requires=("sources_accumulated",),
+                skip_marker="[BIAS_SKIPPED]",
+            ),
+            StageSpec(NamedAgent(name="summary_writer")),
+            sources_accumulated=[],
+        )
+
+        assert events == [("bias_analyzer", "[BIAS_SKIPPED]"), ("summary_writer", None)]
+
+    def test_empty_output_stops_pipeline(self) -> None:
+        """Test that later stages never run once a stage produces nothing."""
+        events = run_stages(
+            StageSpec(
+                NamedAgent(name="source_finder"),
+                produces="sources_accumulated",
+                terminate_reason="No sources found",
+            ),
+            StageSpec(NamedAgent(name="claim_extractor")),
+            sources_accumulated=[],
+        )
+
+        assert [author for author, _ in events] == ["source_finder", "source_finder"]
+
+    def test_termination_releases_investigation_resources(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that stopping early releases what summary_writer would have."""
+        released: list[str] = []
+
+        async def release_investigation(investigation_id: str) -> None:
+            released.append(investigation_id)
+
+        monkeypatch.setattr(
+            callbacks.callback_outbox, "enqueue", lambda *args, **kwargs: None
+        )
+        monkeypatch.setattr(
+            callbacks.context_cache, "release_investigation", release_investigation
+        )
+        run_config = RunConfig(streaming_mode=StreamingMode.NONE)
+        context = SimpleNamespace(
+            agent_name="source_finder",
+            invocation_id="i",
+            state={"investigation_id": "inv"},
+            _invocation_context=SimpleNamespace(run_config=run_config),
+        )
+        monkeypatch.setattr(config, "stream_summary_updates", True)
+        callbacks.start_summary_streaming(context)
+
+        terminate = callbacks.terminate_without_outputs(
+            "sources_accumulated", "No sources found"
+        )
+        asyncio.run(terminate(context))
+
+        assert released == ["inv"]
+        assert "i" not in callbacks._summary_streams
+        assert run_config.streaming_mode == StreamingMode.NONE
+
+    def test_completed_stage_skipped_on_resume(self) -> None:
+        """Test that stages restored from a checkpoint do not run again."""
+        events = run_stages(
+            StageSpec(NamedAgent(name="source_finder")),
+            StageSpec(NamedAgent(name="claim_extractor")),
+            completed_stages=["source_finder"],
+        )
+
+        assert events == [
+            ("source_finder", "[RESUMED] source_finder completed"),
+            ("claim_extractor", None),
+        ]
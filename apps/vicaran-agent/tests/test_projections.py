@@ -0,0 +1,68 @@
+"""
+Tests for token-budgeted state projections.
+"""
+
+import json
+from typing import Any
+
+import pytest
+from vicaran_agent.projections import (
+    Projection,
+    encode_items,
+    estimate_tokens,
+    project,
+    render_template,
+)
+
+projection = Projection(
+    "sources_accumulated", ("source_id", "summary"), "credibility_score"
+)
+
+
+def sources(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "source_id": f"s{i}",
+            "summary": "word " * 200,
+            "credibility_score": i % 5 + 1,
+            "url": f"https://example.com/{i}",
+        }
+        for i in range(count)
+    ]
+
+
+class TestProjections:
+    """Tests for projection encoding and trimming."""
+
+    def test_encode_keeps_only_projected_fields(self) -> None:
+        """Test that items are encoded as a header row plus value rows."""
+        lines = encode_items(sources(2), projection.fields).splitlines()
+
+        assert json.loads(lines[0]) == ["source_id", "summary"]
+        assert [json.loads(line)[0] for line in lines[1:]] == ["s0", "s1"]
+        assert "example.com" not in "\n".join(lines)
+
+    def test_project_fits_budget_and_keeps_highest_ranked(self) -> None:
+        """Test that trimming respects the budget and drops low-ranked items."""
+        encoded = project(sources(40), projection, token_budget=200)
+        kept = [json.loads(line)[0] for line in encoded.splitlines()[1:]]
+
+        assert estimate_tokens(encoded) <= 200
+        assert kept and len(kept) < 40
+        # Credibility 5 sources (s4, s9, ...) survive first
+        assert "s4" in kept
+
+    def test_render_template_does_not_rescan_injected_text(self) -> None:
+        """Test that braces inside injected values are left untouched."""
+        rendered = render_template(
+            "Sources: {sources_accumulated}\nConfig: {investigation_config}\n{x?}",
+            {"investigation_config": {"mode": "quick"}},
+            {"sources_accumulated": '["{title}"]'},
+        )
+
+        assert rendered == "Sources: [\"{title}\"]\nConfig: {'mode': 'quick'}\n"
+
+    def test_render_template_missing_key_raises(self) -> None:
+        """Test that a required placeholder missing from state fails loudly."""
+        with pytest.raises(KeyError):
+            render_template("{bias_analysis}", {}, {})
@@ -0,0 +1,118 @@
+"""
+Tests for pre-call prompt budget enforcement.
+"""
+
+from types import SimpleNamespace
+
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+from vicaran_agent.projections import encode_items
+from vicaran_agent.prompt_budget import PromptBudget, estimate_request_tokens
+
+
+def tool_result(call_id: str, size: int) -> types.Content:
+    return types.Content(
+        role="user",
+        parts=[
+            types.Part(
+                function_response=types.FunctionResponse(
+                    id=call_id,
+                    name="jina_reader_tool",
+                    response={"url": f"https://a.com/{call_id}", "content": "x" * size},
+                )
+            )
+        ],
+    )
+
+
+def sources_instruction() -> str:
+    sources = [
+        {"source_id": f"s{i}", "title": f"T{i}", "summary": "word " * 100}
+        for i in range(10)
+    ]
+    encoded = encode_items(sources, ("source_id", "title", "summary"))
+    return f"Static prompt.\nAccumulated Sources: {encoded}\n"
+
+
+class TestPromptBudget:
+    """Tests for PromptBudget."""
+
+    def test_oldest_tool_outputs_trimmed_first(self) -> None:
+        """Test that old responses shrink while the latest one is kept."""
+        budget = PromptBudget({"source_finder": 2000}, 100000, ["tool_outputs"])
+        request = LlmRequest(contents=[tool_result(f"c{i}", 4000) for i in range(4)])
+
+        before, after = budget.enforce("source_finder", request)
+
+        responses = [c.parts[0].function_response.response for c in request.contents]
+        assert before > 2000 >= after
+        assert responses[0] == {"url": "https://a.com/c0", "trimmed": True}
+        assert responses[-1]["content"] == "x" * 4000
+
+    def test_source_summaries_trimmed_in_instruction(self) -> None:
+        """Test that per-source summaries are shortened to fit the budget."""
+        budget = PromptBudget({}, 400, ["tool_outputs", "source_summaries"])
+        request = LlmRequest(
+            config=types.GenerateContentConfig(system_instruction=sources_instruction())
+        )
+
+        before, after = budget.enforce("summary_writer", request)
+
+        instruction = request.config.system_instruction
+        assert before > 400 >= after
+        assert instruction.startswith("Static prompt.\nAccumulated Sources: [")
+        assert '["s0","T0",' in instruction
+
+    def test_estimate_paired_with_actual_usage(self) -> None:
+        """Test that estimated and actual prompt tokens are recorded per agent."""
+        budget = PromptBudget({}, 100000, [])
+        request = LlmRequest(contents=[tool_result("c0", 400)])
+        estimate = estimate_request_tokens(request)
+
+        budget.enforce("fact_checker", request, "k")
+        pair = budget.record_actual(
+            "fact_checker", SimpleNamespace(prompt_token_count=estimate * 2), "k"
+        )
+
+        assert pair == (estimate, estimate * 2)
+        assert budget.report()["fact_checker"]["estimate_ratio"] == 0.5
+
+    def test_cached_request_compared_with_uncached_tokens(self) -> None:
+        """Test that tokens served from the context cache are not compared."""
+        budget = PromptBudget({}, 100000, [])
+        request = LlmRequest(
+            contents=[tool_result("c0", 400)],
+            config=types.GenerateContentConfig(cached_content="cachedContents/1"),
+        )
+        _, estimate = budget.enforce("summary_writer", request, "k")
+
+        pair = budget.record_actual(
+            "summary_writer",
+            SimpleNamespace(
+                prompt_token_count=estimate + 5000, cached_content_token_count=5000
+            ),
+            "k",
+        )
+
+        assert pair == (estimate, estimate)
+
+    def test_concurrent_calls_keep_their_own_estimates(self) -> None:
+        """Test that shards of one agent are paired by their call keys."""
+        budget = PromptBudget({}, 100000, [])
+        small = LlmRequest(contents=[tool_result("c0", 40)])
+        large = LlmRequest(contents=[tool_result("c1", 400)])
+        shard_0 = ("inv", "fact_checker.shard_0", "fact_checker")
+        shard_1 = ("inv", "fact_checker.shard_1", "fact_checker")
+
+        _, small_estimate = budget.enforce("fact_checker", small, shard_0)
+        _, large_estimate = budget.enforce("fact_checker", large, shard_1)
+        usage = SimpleNamespace(prompt_token_count=100)
+
+        assert budget.record_actual("fact_checker", usage, shard_1) == (
+            large_estimate,
+            100,
+        )
+        assert budget.record_actual("fact_checker", usage, shard_0) == (
+            small_estimate,
+            100,
+        )
@@ -0,0 +1,107 @@
+"""
+Tests for the prefix-stable prompt layout and cache usage instrumentation.
+"""
+
+import re
+from types import SimpleNamespace
+
+import pytest
+from vicaran_agent import prompts
+from vicaran_agent.cache_metrics import CacheUsageTracker
+from vicaran_agent.projections import (
+    AGENT_PROJECTIONS,
+    CLAIMS,
+    SOURCES,
+    render_template,
+)
+
+INSTRUCTIONS = [name for name in dir(prompts) if name.endswith("_INSTRUCTION")]
+
+STATE_KEYS = [
+    "investigation_id",
+    "investigation_mode",
+    "investigation_config",
+    "user_sources",
+    "sources_accumulated",
+    "claims_accumulated",
+    "fact_check_results",
+    "bias_analysis",
+    "timeline_events",
+    "fetched_page",
+    "fetched_pages",
+]
+
+
+class TestPromptLayout:
+    """Tests for the static-prefix / dynamic-suffix instruction layout."""
+
+    @pytest.mark.parametrize("name", INSTRUCTIONS)
+    def test_static_prefix_identical_across_investigations(self, name: str) -> None:
+        """Test that rendering different state only changes the context block."""
+        template = getattr(prompts, name)
+        first = render_template(template, dict.fromkeys(STATE_KEYS, "alpha"), {})
+        second = render_template(template, dict.fromkeys(STATE_KEYS, "omega-2"), {})
+
+        prefix = template[: template.index(prompts.CONTEXT_HEADER)]
+        assert first.startswith(prefix)
+        assert second.startswith(prefix)
+        assert first != second
+
+
+# Column lists a prompt announces, e.g. "one JSON array per source: a, b, c"
+COLUMN_LIST = re.compile(
+    r"(?:one JSON array per\s+(source|claim):|(Claims) are listed the same way:)"
+    r"\s*(`?\w+`?(?:, `?\w+`?)*)"
+)
+
+PROMPT_AGENTS = {
+    "CLAIM_EXTRACTOR_STATIC": "claim_extractor",
+    "CLAIM_RECONCILER_STATIC": "claim_reconciler",
+    "FACT_CHECKER_STATIC": "fact_checker",
+    "BIAS_ANALYZER_STATIC": "bias_analyzer",
+    "TIMELINE_BUILDER_STATIC": "timeline_builder",
+    "QUICK_ANALYZER_STATIC": "quick_analyzer",
+    "SUMMARY_WRITER_STATIC": "summary_writer",
+}
+
+
+class TestPromptColumnLists:
+    """Tests that prompts describe the columns their projections render."""
+
+    @pytest.mark.parametrize("name", sorted(PROMPT_AGENTS))
+    def test_column_lists_match_projections(self, name: str) -> None:
+        """Test each announced column list against AGENT_PROJECTIONS."""
+        projected = {
+            p.state_key: p.fields
+            for p in AGENT_PROJECTIONS[PROMPT_AGENTS[name]].projections
+        }
+        for match in COLUMN_LIST.finditer(getattr(prompts, name)):
+            kind = (match.group(1) or match.group(2)).lower()
+            state_key = SOURCES if kind == "source" else CLAIMS
+            columns = tuple(c.strip("` ") for c in match.group(3).split(","))
+            assert columns == projected[state_key], f"{name}: {kind} columns"
+
+
+class TestCacheUsageTracker:
+    """Tests for CacheUsageTracker."""
+
+    def test_ratio_per_call_and_cumulative(self) -> None:
+        """Test that cached ratios are reported per call and per agent."""
+        tracker = CacheUsageTracker()
+        first = tracker.record(
+            "fact_checker",
+            SimpleNamespace(prompt_token_count=1000, cached_content_token_count=None),
+        )
+        second = tracker.record(
+            "fact_checker",
+            SimpleNamespace(prompt_token_count=1000, cached_content_token_count=800),
+        )
+
+        assert first == 0.0
+        assert second == 0.8
+        assert tracker.report()["fact_checker"] == {
+            "calls": 2,
+            "prompt_tokens": 2000,
+            "cached_tokens": 800,
+            "cached_ratio": 0.4,
+        }
@@ -0,0 +1,147 @@
+"""
+Tests for the shared model-call rate limiter.
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from types import SimpleNamespace
+
+import pytest
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from vicaran_agent import callbacks, model_routing
+from vicaran_agent.rate_limiter import (
+    ModelRateLimiter,
+    is_rate_limit_error,
+    retry_after_seconds,
+)
+
+
+class FakeTime:
+    """Clock whose sleep advances time instantly."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def clock(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(fake: FakeTime, rpm: int = 2, tpm: int = 1000) -> ModelRateLimiter:
+    return ModelRateLimiter(
+        requests_per_minute=rpm,
+        tokens_per_minute=tpm,
+        base_backoff_seconds=2.0,
+        clock=fake.clock,
+        sleep=fake.sleep,
+    )
+
+
+class TestModelRateLimiter:
+    """Tests for ModelRateLimiter."""
+
+    def test_no_wait_with_headroom(self) -> None:
+        """Test that requests within quota are admitted immediately."""
+        fake = FakeTime()
+        limiter = make_limiter(fake)
+
+        waits = [asyncio.run(limiter.acquire(100)) for _ in range(2)]
+
+        assert waits == [0.0, 0.0]
+        assert fake.sleeps == []
+
+    def test_request_quota_waits_for_window(self) -> None:
+        """Test that the third request waits for the oldest to expire."""
+        fake = FakeTime()
+        limiter = make_limiter(fake)
+        asyncio.run(limiter.acquire(10))
+        fake.now = 20.0
+        asyncio.run(limiter.acquire(10))
+
+        assert limiter.current_wait() == 40.0
+        assert asyncio.run(limiter.acquire(10)) == 40.0
+        assert limiter.stats()["throttled_calls"] == 1
+
+    def test_token_quota_waits(self) -> None:
+        """Test that token usage alone can delay a request."""
+        fake = FakeTime()
+        limiter = make_limiter(fake, rpm=0, tpm=1000)
+        asyncio.run(limiter.acquire(800))
+        fake.now = 10.0
+
+        assert asyncio.run(limiter.acquire(300)) == 50.0
+
+    def test_rate_limit_blocks_with_retry_after_then_resets(self) -> None:
+        """Test that a 429 blocks callers for the server-suggested delay."""
+        fake = FakeTime()
+        limiter = make_limiter(fake, rpm=0, tpm=0)
+        error = SimpleNamespace(
+            code=429,
+            details={"error": {"details": [{"retryDelay": "17s"}]}},
+        )
+
+        assert is_rate_limit_error(error)
+        limiter.record_rate_limit(retry_after_seconds(error))
+
+        assert limiter.stats()["blocked_until_seconds"] == 17.0
+        assert asyncio.run(limiter.acquire()) == 17.0
+        assert limiter.stats()["blocked_seconds_total"] == 17.0
+
+    def test_backoff_grows_without_retry_after(self) -> None:
+        """Test that repeated 429s back off exponentially until a success."""
+        limiter = make_limiter(FakeTime())
+
+        first = limiter.record_rate_limit()
+        second = limiter.record_rate_limit()
+        limiter.record_success()
+        third = limiter.record_rate_limit()
+
+        assert 1.0 <= first <= 2.0
+        assert 2.0 <= second <= 4.0
+        assert 1.0 <= third <= 2.0
+
+
+class TestRateLimitRetry:
+    """Tests for retrying a rate-limited model call."""
+
+    def test_rate_limited_call_retried_after_block(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a 429 is retried once, after waiting out the block."""
+        fake = FakeTime()
+        limiter = make_limiter(fake, rpm=0, tpm=0)
+        monkeypatch.setattr(callbacks, "model_rate_limiter", limiter)
+        sent_at: list[float] = []
+
+        class RetryModel(BaseLlm):
+            async def generate_content_async(
+                self, llm_request: LlmRequest, stream: bool = False
+            ) -> AsyncGenerator[LlmResponse, None]:
+                sent_at.append(fake.now)
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text="ok")])
+                )
+
+        monkeypatch.setattr(
+            model_routing.LLMRegistry, "new_llm", lambda model: RetryModel(model=model)
+        )
+        error = SimpleNamespace(
+            code=429, details={"error": {"details": [{"retryDelay": "17s"}]}}
+        )
+        context = SimpleNamespace(agent_name="fact_checker", state={})
+
+        response = asyncio.run(
+            callbacks.handle_model_error(
+                context, LlmRequest(model="gemini-2.5-flash"), error
+            )
+        )
+
+        assert response.content.parts[0].text == "ok"
+        assert sent_at == [17.0]
@@ -0,0 +1,114 @@
+"""
+Tests for the ADK API server app (startup hook and Vicaran routes).
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncGenerator
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.run_config import RunConfig
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from vicaran_agent import callbacks, server
+from vicaran_agent.pipelines import ModeRouterAgent
+
+
+class SlowPipeline(BaseAgent):
+    """Fake pipeline stuck in a long model call."""
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            content=types.Content(role="model", parts=[types.Part(text="started")]),
+        )
+        await asyncio.sleep(3600)
+
+
+async def run_and_cancel(app: object) -> tuple[list[str], dict, float]:
+    router = ModeRouterAgent(
+        name="investigation_pipeline", sub_agents=[SlowPipeline(name="quick_pipeline")]
+    )
+    service = InMemorySessionService()
+    session = await service.create_session(
+        app_name="test", user_id="u", state={"investigation_id": "inv-9"}
+    )
+    ctx = InvocationContext(
+        session_service=service,
+        invocation_id="inv",
+        agent=router,
+        session=session,
+        run_config=RunConfig(),
+    )
+
+    async def collect() -> list[str]:
+        return [event.content.parts[0].text async for event in router.run_async(ctx)]
+
+    run = asyncio.create_task(collect())
+    await asyncio.sleep(0.1)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        started = time.monotonic()
+        response = await client.post(
+            "/investigations/inv-9/cancel",
+            json={"reason": "Request timed out", "notify": True},
+        )
+        texts = await asyncio.wait_for(run, timeout=5)
+    return texts, response.json(), time.monotonic() - started
+
+
+@pytest.fixture
+def started(monkeypatch: pytest.MonkeyPatch) -> list[bool]:
+    started: list[bool] = []
+    monkeypatch.setattr(server.callback_outbox, "start", lambda: started.append(True))
+    return started
+
+
+class TestServerApp:
+    """Tests for the app built by server.create_app."""
+
+    def test_outbox_sender_started_with_the_server(self, started: list[bool]) -> None:
+        """Test that the outbox sender starts at startup, not at import."""
+        app = server.create_app()
+        assert started == []
+
+        with TestClient(app) as client:
+            assert started == [True]
+            assert client.get("/list-apps").status_code == 200
+
+    def test_cancel_route_stops_the_run(
+        self, started: list[bool], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a running investigation ends within seconds of the call."""
+        sent: list[tuple[str, dict]] = []
+        monkeypatch.setattr(
+            callbacks.callback_outbox,
+            "enqueue",
+            lambda investigation_id, callback_type, data: sent.append(
+                (callback_type, data)
+            ),
+        )
+
+        texts, body, elapsed = asyncio.run(run_and_cancel(server.create_app()))
+
+        assert body == {"success": True, "cancelled": True}
+        assert texts == ["started", "[INVESTIGATION_CANCELLED] Request timed out"]
+        assert elapsed < 2
+        assert sent == [
+            ("INVESTIGATION_FAILED", {"error_message": "Request timed out"})
+        ]
+
+    def test_cancel_unknown_investigation_is_a_no_op(self, started: list[bool]) -> None:
+        """Test that cancelling a run this server does not have reports False."""
+        with TestClient(server.create_app()) as client:
+            response = client.post("/investigations/missing/cancel")
+
+        assert response.json() == {"success": True, "cancelled": False}
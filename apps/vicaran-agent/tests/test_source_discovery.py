@@ -0,0 +1,248 @@
+"""
+Tests for code-driven source discovery.
+"""
+
+import asyncio
+import json
+import re
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.run_config import RunConfig
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from vicaran_agent import source_discovery
+from vicaran_agent.models import SourceAssessment, SourceBatch
+from vicaran_agent.prompts import (
+    SOURCE_BATCH_SUMMARIZER_INSTRUCTION,
+    SOURCE_SUMMARIZER_INSTRUCTION,
+)
+from vicaran_agent.source_discovery import (
+    SourceDiscoveryAgent,
+    rank_candidates,
+    search_queries,
+)
+
+PLAN = """## 📋 Investigation Plan
+
+**What I'll Investigate:**
+- Who funded the new stadium?
+- Did costs exceed the approved budget?
+
+**Sources I'll Gather:**
+- Council records
+"""
+
+
+class PageAssessmentModel(BaseLlm):
+    """Fake summarizer that echoes each page URL as its summary."""
+
+    model: str = "page-assessment"
+    calls: int = 0
+    batch_calls: int = 0
+    # Batch answers leave these pages out (or are not JSON when "malformed")
+    omit: set[str] = set()
+    malformed: bool = False
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        instruction = str(llm_request.config.system_instruction)
+        urls = re.findall(r"URL: (\S+)", instruction)
+        if "Fetched Pages:" in instruction:
+            self.batch_calls += 1
+            records = [
+                {"url": url, "title": url, "summary": url, "key_claims": ["c"]}
+                for url in urls
+                if url not in self.omit
+            ]
+            text = "not json" if self.malformed else json.dumps({"sources": records})
+        else:
+            self.calls += 1
+            text = json.dumps(
+                {"summary": urls[0], "credibility_score": 4, "key_claims": ["c"]}
+            )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=text)])
+        )
+
+
+def result(url: str, score: float) -> dict[str, Any]:
+    return {"title": url, "url": url, "content": "", "score": score}
+
+
+async def run_discovery(
+    monkeypatch: pytest.MonkeyPatch,
+    urls: list[str],
+    blocked: set[str],
+    limit: int,
+    model: PageAssessmentModel | None = None,
+    batch: bool = False,
+) -> tuple[dict, PageAssessmentModel, list[str]]:
+    saved: list[str] = []
+
+    async def search_web(query: str, max_results: int = 10) -> dict:
+        return {"success": True, "results": [result(u, 0.5) for u in urls]}
+
+    async def fetch_url(url: str) -> dict:
+        reachable = url not in blocked
+        return {
+            "url": url,
+            "domain": url.split("/")[2],
+            "is_reachable": reachable,
+            "content": "page text {not a placeholder}" if reachable else "",
+        }
+
+    async def save_item(state, investigation_id, callback_type, data) -> dict:
+        saved.append(data["url"])
+        source_id = f"s{len(saved)}"
+        source_discovery.sources_accumulator.append(
+            state, {"source_id": source_id, **data}
+        )
+        return {"source_id": source_id}
+
+    monkeypatch.setattr(source_discovery, "search_web", search_web)
+    monkeypatch.setattr(source_discovery, "fetch_url", fetch_url)
+    monkeypatch.setattr(source_discovery, "save_item", save_item)
+
+    model = model or PageAssessmentModel()
+    summarizer = LlmAgent(
+        name="source_summarizer",
+        model=model,
+        include_contents="none",
+        instruction=SOURCE_SUMMARIZER_INSTRUCTION,
+        output_schema=SourceAssessment,
+    )
+    batch_summarizer = summarizer.clone(
+        update={
+            "instruction": SOURCE_BATCH_SUMMARIZER_INSTRUCTION,
+            "output_schema": SourceBatch,
+        }
+    )
+    agent = SourceDiscoveryAgent(
+        name="source_finder",
+        summarizer=summarizer,
+        batch_summarizer=batch_summarizer if batch else None,
+        overfetch=1.0 if batch else 2.0,
+        max_batch_pages=4,
+    )
+    service = InMemorySessionService()
+    session = await service.create_session(
+        app_name="test",
+        user_id="u",
+        state={
+            "investigation_id": "inv-1",
+            "investigation_config": {"title": "Stadium funding", "source_limit": limit},
+            "investigation_plan": PLAN,
+        },
+    )
+    ctx = InvocationContext(
+        session_service=service,
+        invocation_id="inv",
+        agent=agent,
+        session=session,
+        run_config=RunConfig(),
+    )
+    async for event in agent.run_async(ctx):
+        await service.append_event(session, event)
+    return session.state, model, saved
+
+
+class TestCandidates:
+    """Query derivation and result ranking."""
+
+    def test_queries_from_title_and_plan_questions(self) -> None:
+        """Test that the title and the plan's key questions become queries."""
+        queries = search_queries({"title": "Stadium funding"}, PLAN, 4)
+
+        assert queries == [
+            "Stadium funding",
+            "Who funded the new stadium?",
+            "Did costs exceed the approved budget?",
+        ]
+
+    def test_ranking_dedupes_and_diversifies(self) -> None:
+        """Test that repeats rank higher and one domain cannot crowd the list."""
+        ranked = rank_candidates(
+            [
+                [result("https://a.com/1", 0.9), result("https://b.com/1", 0.8)],
+                [result("https://www.b.com/1/", 0.7), result("https://a.com/2", 0.6)],
+                [result("https://a.com/3", 0.5), result("https://c.com/1", 0.1)],
+            ],
+            first_urls=["https://user.org/post"],
+            exclude={"https://c.com/1"},
+            max_per_domain=2,
+        )
+
+        assert [r["url"] for r in ranked] == [
+            "https://user.org/post",
+            "https://a.com/1",
+            "https://b.com/1",
+            "https://a.com/2",
+            "https://a.com/3",
+        ]
+
+
+class TestSourceDiscoveryAgent:
+    """End-to-end discovery with fake search, fetch and persistence."""
+
+    def test_saves_summarized_sources_up_to_limit(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that blocked pages are skipped and the source limit is kept."""
+        urls = [f"https://site{i}.com/a" for i in range(6)]
+
+        state, model, saved = asyncio.run(
+            run_discovery(monkeypatch, urls, blocked={urls[0]}, limit=3)
+        )
+
+        assert len(saved) == 3
+        assert urls[0] not in saved
+        assert model.calls == 3
+        sources = state["sources_accumulated"]
+        assert [s["summary"] for s in sources] == saved
+        assert set(sources[0]) >= {
+            "source_id",
+            "url",
+            "title",
+            "summary",
+            "credibility_score",
+            "key_claims",
+        }
+        assert "All 3 sources analyzed" in state["discovered_sources"]
+
+    def test_batches_pages_and_retries_omitted_ones_singly(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that pages share calls and a page missing from a batch is retried."""
+        urls = [f"https://site{i}.com/a" for i in range(6)]
+        model = PageAssessmentModel(omit={urls[2]})
+
+        state, model, saved = asyncio.run(
+            run_discovery(monkeypatch, urls, set(), limit=6, model=model, batch=True)
+        )
+
+        assert sorted(saved) == sorted(urls)
+        assert model.batch_calls == 2
+        assert model.calls == 1
+        assert len(state["sources_accumulated"]) == 6
+
+    def test_malformed_batch_falls_back_to_per_page_calls(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that an unparseable batch answer is replaced by single calls."""
+        urls = [f"https://site{i}.com/a" for i in range(3)]
+        model = PageAssessmentModel(malformed=True)
+
+        _, model, saved = asyncio.run(
+            run_discovery(monkeypatch, urls, set(), limit=3, model=model, batch=True)
+        )
+
+        assert sorted(saved) == sorted(urls)
+        assert (model.batch_calls, model.calls) == (1, 3)
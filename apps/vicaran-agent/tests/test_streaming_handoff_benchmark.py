@@ -0,0 +1,156 @@
+"""
+Benchmark: wall-clock time of source finding + claim extraction, with and
+without the streaming hand-off.
+
+A simulated source finder saves one source every FETCH_SECONDS (search +
+page fetch + SOURCE_FOUND). A fake claim-extraction model takes
+EXTRACT_SECONDS per source in its prompt (one CLAIM_EXTRACTED round trip per
+claim dominates extraction time) and RECONCILE_SECONDS for the
+reconciliation pass, which only adds a few cross-source claims.
+
+The tests check the overlap itself (batches start while sources are still
+being found); timings are only compared when run directly:
+    PYTHONPATH=. python tests/test_streaming_handoff_benchmark.py
+"""
+
+import asyncio
+import re
+import time
+from collections.abc import AsyncGenerator
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.run_config import RunConfig
+from google.adk.events import Event
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from vicaran_agent.accumulators import sources_accumulator
+from vicaran_agent.projections import projected_instruction
+from vicaran_agent.prompts import CLAIM_RECONCILER_INSTRUCTION
+from vicaran_agent.streaming_handoff import StreamingHandoffAgent
+
+SOURCES = 10
+FETCH_SECONDS = 0.05
+EXTRACT_SECONDS = 0.05
+RECONCILE_SECONDS = 0.04
+TEMPLATE = "Extract claims.\nAccumulated Sources: {sources_accumulated}\n"
+
+# Order in which sources were saved and extraction calls started
+TIMELINE: list[str] = []
+
+
+class SimulatedSourceFinder(BaseAgent):
+    """Saves one source per simulated fetch."""
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        for i in range(SOURCES):
+            await asyncio.sleep(FETCH_SECONDS)
+            sources_accumulator.append(
+                ctx.session.state,
+                {"source_id": f"s{i}", "title": f"Source {i}", "summary": "text"},
+            )
+            TIMELINE.append(f"saved s{i}")
+            yield Event(author=self.name, invocation_id=ctx.invocation_id)
+
+
+class TimedExtractionModel(BaseLlm):
+    """Fake model whose latency scales with the sources it must extract from."""
+
+    model: str = "timed-extraction"
+    extracted: list[str] = []
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        instruction = str(llm_request.config.system_instruction)
+        if "Claim Reconciler" in instruction:
+            await asyncio.sleep(RECONCILE_SECONDS)
+            text = "Saved 0 cross-source claims."
+        else:
+            source_ids = re.findall(r'\["(s\d+)"', instruction)
+            TIMELINE.append(f"extract {','.join(source_ids)}")
+            await asyncio.sleep(EXTRACT_SECONDS * len(source_ids))
+            self.extracted.extend(source_ids)
+            text = f"Saved claims for {', '.join(source_ids)}"
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=text)])
+        )
+
+
+async def run_pipeline(streaming: bool) -> tuple[float, list[str]]:
+    """Wall-clock seconds and source IDs claims were extracted from."""
+    TIMELINE.clear()
+    model = TimedExtractionModel(extracted=[])
+    producer = SimulatedSourceFinder(name="source_finder")
+    extractor = LlmAgent(
+        name="claim_extractor",
+        model=model,
+        include_contents="none",
+        instruction=projected_instruction(TEMPLATE, "claim_extractor"),
+        output_key="extracted_claims",
+    )
+    if streaming:
+        steps: list[BaseAgent] = [
+            StreamingHandoffAgent(
+                name="streaming_handoff",
+                producer=producer,
+                extractor=extractor,
+                template=TEMPLATE,
+                reconcile_template=CLAIM_RECONCILER_INSTRUCTION,
+            )
+        ]
+    else:
+        steps = [producer, extractor]
+
+    service = InMemorySessionService()
+    session = await service.create_session(
+        app_name="bench",
+        user_id="u",
+        state={"investigation_config": {}, "claims_accumulated": []},
+    )
+    started = time.perf_counter()
+    for step in steps:
+        ctx = InvocationContext(
+            session_service=service,
+            invocation_id="bench",
+            agent=step,
+            session=session,
+            run_config=RunConfig(),
+        )
+        async for _ in step.run_async(ctx):
+            pass
+    return time.perf_counter() - started, model.extracted
+
+
+class TestStreamingHandoffBenchmark:
+    """Regression guard for the streaming hand-off's overlap."""
+
+    def test_every_source_extracted_once(self) -> None:
+        """Test that micro-batches cover each saved source exactly once."""
+        _, sequential = asyncio.run(run_pipeline(streaming=False))
+        _, streaming = asyncio.run(run_pipeline(streaming=True))
+
+        assert sorted(streaming, key=lambda s: int(s[1:])) == sequential
+
+    def test_extraction_overlaps_source_finding(self) -> None:
+        """Test that the first batch starts before the last source is saved."""
+        asyncio.run(run_pipeline(streaming=True))
+
+        assert TIMELINE.index("extract s0,s1,s2") < TIMELINE.index(
+            f"saved s{SOURCES - 1}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(run_pipeline(streaming=False))  # warm-up
+    sequential, _ = asyncio.run(run_pipeline(streaming=False))
+    streaming, _ = asyncio.run(run_pipeline(streaming=True))
+    print(f"{'pipeline':<12}{'seconds':>10}")
+    print(f"{'sequential':<12}{sequential:>10.3f}")
+    print(f"{'streaming':<12}{streaming:>10.3f}")
+    print(f"reduction: {1 - streaming / sequential:.0%}")
@@ -0,0 +1,191 @@
+"""
+Tests for bulk persistence of structured claim and fact-check outputs.
+"""
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from vicaran_agent import persistence
+from vicaran_agent.accumulators import claims_accumulator, sources_accumulator
+from vicaran_agent.callbacks import (
+    batch_save_claims,
+    batch_save_fact_checks,
+    save_quick_analysis,
+)
+from vicaran_agent.checkpoints import CheckpointStore, item_key
+from vicaran_agent.persistence import CallbackApiBackend
+from vicaran_agent.tools import callback_api
+from vicaran_agent.transport import CallbackDeliveryError
+
+
+@pytest.fixture
+def bulk_writes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> list[tuple[str, list[dict]]]:
+    writes: list[tuple[str, list[dict]]] = []
+
+    async def save_many(
+        investigation_id: str, callback_type: str, items: list[dict]
+    ) -> list[dict]:
+        writes.append((callback_type, items))
+        id_field = {
+            "CLAIM_EXTRACTED": "claim_id",
+            "FACT_CHECKED": "fact_check_id",
+        }.get(callback_type, "bias_id")
+        return [{"success": True, id_field: f"id{n}"} for n in range(len(items))]
+
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    monkeypatch.setattr(callback_api, "stage_checkpoints", store)
+    monkeypatch.setattr(callback_api.persistence_backend, "save_many", save_many)
+    return writes
+
+
+class TestBatchSaveClaims:
+    """Tests for the claim extractor's after-agent hook."""
+
+    def test_validated_claims_saved_in_one_write(
+        self, bulk_writes: list[tuple[str, list[dict]]]
+    ) -> None:
+        """Test that claims are deduplicated, cleaned and written in one call."""
+        state: dict = {
+            "investigation_id": "inv",
+            "extracted_claims": [
+                {"claim_text": "Costs doubled", "source_ids": ["s1", "made-up"]},
+                {"claim_text": "costs  doubled", "source_ids": ["s2"]},
+                {"claim_text": "Opened in 2020", "importance_score": 0.9},
+                {"source_ids": ["s1"]},
+            ],
+        }
+        for source_id in ("s1", "s2"):
+            sources_accumulator.append(state, {"source_id": source_id})
+
+        asyncio.run(batch_save_claims(SimpleNamespace(state=state)))
+
+        assert len(bulk_writes) == 1
+        callback_type, items = bulk_writes[0]
+        assert callback_type == "CLAIM_EXTRACTED"
+        assert [item["source_ids"] for item in items] == [["s1", "s2"], []]
+        assert [c["claim_id"] for c in claims_accumulator.items(state)] == [
+            "id0",
+            "id1",
+        ]
+        assert state["claim_id_map"][1] == {
+            "claim_id": "id1",
+            "claim_text": "Opened in 2020",
+        }
+        assert "| 2 | Opened in 2020 | HIGH | id1 |" in state["extracted_claims"]
+
+
+class TestBatchSaveFactChecks:
+    """Tests for the fact checker's after-agent hook."""
+
+    def test_every_claim_gets_one_fact_check(
+        self, bulk_writes: list[tuple[str, list[dict]]]
+    ) -> None:
+        """Test that skipped claims are reported UNVERIFIED but not saved."""
+        state: dict = {
+            "investigation_id": "inv",
+            "fact_check_results": [
+                {"claim_id": "c1", "verdict": "FALSE", "evidence_summary": "No."},
+                {"claim_id": "c9", "verdict": "VERIFIED", "evidence_summary": "?"},
+                {"claim_id": "c3", "verdict": "VERIFIED", "evidence_summary": "Yes"},
+            ],
+        }
+        for claim_id, source_ids in (("c1", ["s1"]), ("c2", ["s1"]), ("c3", [])):
+            claims_accumulator.append(
+                state,
+                {
+                    "claim_id": claim_id,
+                    "claim_text": claim_id,
+                    "source_ids": source_ids,
+                },
+            )
+
+        asyncio.run(batch_save_fact_checks(SimpleNamespace(state=state)))
+
+        callback_type, items = bulk_writes[0]
+        assert callback_type == "FACT_CHECKED"
+        assert items == [
+            {
+                "claim_id": "c1",
+                "evidence_text": "No.",
+                "evidence_type": "contradicting",
+                "source_id": "s1",
+            },
+            {"claim_id": "c3", "evidence_text": "Yes", "evidence_type": "supporting"},
+        ]
+        report = state["fact_check_results"]
+        assert report.startswith("**Fact-Checking Complete**\n\nVerified 3 claims:")
+        assert '2. ❓ **UNVERIFIED** - "c2"' in report
+        assert "🆔 Saved as fact_check_id: id1" in report
+
+
+class TestSaveItems:
+    """Tests for bulk writes through the callback API."""
+
+    def test_rejected_item_keeps_the_rest_of_the_batch(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that items written before a rejection are recorded and kept."""
+
+        async def send(investigation_id: str, callback_type: str, data: dict) -> dict:
+            if data["claim_text"] == "bad":
+                raise CallbackDeliveryError(400, "Validation failed")
+            return {"success": True, "claim_id": f"id-{data['claim_text']}"}
+
+        store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+        monkeypatch.setattr(callback_api, "stage_checkpoints", store)
+        monkeypatch.setattr(callback_api, "persistence_backend", CallbackApiBackend())
+        monkeypatch.setattr(persistence.callback_transport, "send", send)
+        state: dict = {}
+        items = [{"claim_text": text} for text in ("a", "bad", "b")]
+
+        results = asyncio.run(
+            callback_api.save_items(state, "inv", "CLAIM_EXTRACTED", items)
+        )
+
+        assert [r["success"] for r in results] == [True, False, True]
+        assert [c["claim_id"] for c in claims_accumulator.items(state)] == [
+            "id-a",
+            "id-b",
+        ]
+        recorded = [
+            store.persisted("inv", item_key("CLAIM_EXTRACTED", item)) for item in items
+        ]
+        assert [r and r["claim_id"] for r in recorded] == ["id-a", None, "id-b"]
+
+
+class TestSaveQuickAnalysis:
+    """Tests for the quick-mode fast path's after-agent hook."""
+
+    def test_results_saved_with_full_pipeline_callback_types(
+        self, bulk_writes: list[tuple[str, list[dict]]]
+    ) -> None:
+        """Test that claims, verdicts, bias and summary land where stages put them."""
+        verdict = {"verdict": "VERIFIED", "evidence_summary": "Both agree."}
+        state: dict = {
+            "investigation_id": "inv",
+            "quick_analysis": {
+                "claims": [
+                    {"claim_text": "Costs doubled", "source_ids": ["s1"], **verdict},
+                    {"claim_text": "Opened in 2020", "source_ids": ["s1"], **verdict},
+                ],
+                "source_biases": [
+                    {"source_id": "s1", "bias_score": 4},
+                    {"source_id": "unknown", "bias_score": 9},
+                ],
+                "summary": "# 🔍 Investigation Summary\n**4/10** 🟡 Moderate",
+            },
+        }
+        sources_accumulator.append(state, {"source_id": "s1", "title": "Council"})
+
+        asyncio.run(save_quick_analysis(SimpleNamespace(state=state)))
+
+        writes = dict(bulk_writes)
+        assert sorted(writes) == ["BIAS_ANALYZED", "CLAIM_EXTRACTED", "FACT_CHECKED"]
+        assert [i["claim_id"] for i in writes["FACT_CHECKED"]] == ["id0", "id1"]
+        assert writes["BIAS_ANALYZED"] == [{"source_id": "s1", "bias_score": 4}]
+        assert "Council" in state["bias_analysis"]
+        assert state["investigation_summary"].endswith("\n\n[INVESTIGATION_COMPLETE]")
@@ -0,0 +1,192 @@
+"""
+Tests for the callback transports against a local stub receiver.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from vicaran_agent.transport import (
+    CallbackDeliveryError,
+    HttpCallbackTransport,
+    StreamCallbackTransport,
+)
+
+
+class StubReceiver(BaseHTTPRequestHandler):
+    """Minimal stand-in for the Next.js agent-callback routes."""
+
+    stream_enabled = True
+    ack_delay = 0.0
+    requests: list[tuple[str, list[dict]]] = []
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _result(self, event: dict) -> tuple[int, dict]:
+        if event["type"] == "SOURCE_FOUND":
+            return 200, {"success": True, "source_id": str(uuid.uuid4())}
+        if event["type"] == "CLAIM_EXTRACTED" and not event["data"].get("claim_text"):
+            return 400, {"error": "Validation failed"}
+        return 200, {"success": True}
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        if self.path.endswith("/stream"):
+            if not self.stream_enabled:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            events = [json.loads(line) for line in body.splitlines() if line]
+            self.requests.append((self.path, events))
+            time.sleep(self.ack_delay)
+            acks = ""
+            for event in events:
+                status, result = self._result(event)
+                acks += json.dumps(
+                    {"seq": event["seq"], "status": status, "body": result}
+                )
+                acks += "\n"
+            payload = acks.encode()
+        else:
+            event = json.loads(body)
+            self.requests.append((self.path, [event]))
+            status, result = self._result(event)
+            payload = json.dumps(result).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def receiver_url() -> Iterator[str]:
+    StubReceiver.requests = []
+    StubReceiver.stream_enabled = True
+    StubReceiver.ack_delay = 0.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubReceiver)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/api/agent-callback"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def make_stream_transport(api_url: str) -> StreamCallbackTransport:
+    return StreamCallbackTransport(
+        stream_url=f"{api_url}/stream",
+        api_secret="secret",
+        fallback=HttpCallbackTransport(api_url, "secret"),
+        linger_seconds=0.01,
+    )
+
+
+class TestStreamCallbackTransport:
+    """Tests for StreamCallbackTransport."""
+
+    def test_multiplexes_events_into_one_frame(self, receiver_url: str) -> None:
+        """Test that concurrent events share a frame and each gets its ack."""
+        transport = make_stream_transport(receiver_url)
+
+        async def run() -> list[dict]:
+            try:
+                return await asyncio.gather(
+                    transport.send("inv-1", "SOURCE_FOUND", {"url": "https://a.com"}),
+                    transport.send("inv-1", "SOURCE_FOUND", {"url": "https://b.com"}),
+                    transport.send("inv-1", "BIAS_ANALYZED", {"bias_score": 3}),
+                )
+            finally:
+                await transport.close()
+
+        results = asyncio.run(run())
+
+        assert results[0]["source_id"] != results[1]["source_id"]
+        assert results[2] == {"success": True}
+        assert len(StubReceiver.requests) == 1
+        path, events = StubReceiver.requests[0]
+        assert path.endswith("/stream")
+        assert [e["seq"] for e in events] == [1, 2, 3]
+
+    def test_rejected_event_raises_delivery_error(self, receiver_url: str) -> None:
+        """Test that a negative ack fails only the rejected event."""
+        transport = make_stream_transport(receiver_url)
+
+        async def run() -> list:
+            try:
+                return await asyncio.gather(
+                    transport.send("inv-1", "CLAIM_EXTRACTED", {"claim_text": ""}),
+                    transport.send("inv-1", "SOURCE_FOUND", {"url": "https://a.com"}),
+                    return_exceptions=True,
+                )
+            finally:
+                await transport.close()
+
+        rejected, accepted = asyncio.run(run())
+
+        assert isinstance(rejected, CallbackDeliveryError)
+        assert rejected.status_code == 400
+        assert "source_id" in accepted
+
+    def test_cancelled_caller_leaves_other_acks(self, receiver_url: str) -> None:
+        """Test that acks still reach the other callers in a frame."""
+        StubReceiver.ack_delay = 0.2
+        transport = make_stream_transport(receiver_url)
+
+        async def run() -> list:
+            sends = [
+                asyncio.create_task(
+                    transport.send("inv-1", "SOURCE_FOUND", {"url": f"https://{n}.com"})
+                )
+                for n in "abc"
+            ]
+            await asyncio.sleep(0.05)
+            sends[0].cancel()
+            try:
+                return await asyncio.wait_for(
+                    asyncio.gather(*sends, return_exceptions=True), timeout=5
+                )
+            finally:
+                await transport.close()
+
+        cancelled, *delivered = asyncio.run(run())
+
+        assert isinstance(cancelled, asyncio.CancelledError)
+        assert all("source_id" in result for result in delivered)
+
+    def test_falls_back_to_http_when_stream_missing(self, receiver_url: str) -> None:
+        """Test that a 404 stream endpoint switches to per-request callbacks."""
+        StubReceiver.stream_enabled = False
+        transport = make_stream_transport(receiver_url)
+
+        async def run() -> dict:
+            try:
+                await transport.send("inv-1", "INVESTIGATION_STARTED", {})
+                return await transport.send(
+                    "inv-1", "SOURCE_FOUND", {"url": "https://a.com"}
+                )
+            finally:
+                await transport.close()
+
+        result = asyncio.run(run())
+
+        assert "source_id" in result
+        assert transport.stream_available is False
+        assert [path for path, _ in StubReceiver.requests] == [
+            "/api/agent-callback",
+            "/api/agent-callback",
+        ]
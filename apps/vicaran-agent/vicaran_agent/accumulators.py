@@ -0,0 +1,149 @@
+"""
+Append-only, ID-keyed accumulators for structured data in session state.
+
+Each accumulated item is persisted under its own state key
+(``<state_key>#<item_id>``), so saving a new source or claim writes a state
+delta containing only that item instead of the whole list. The list under
+``<state_key>`` (e.g. ``sources_accumulated``) is maintained in place for
+prompt rendering and never re-serialized per item. Overlapping tool calls
+write disjoint keys, so their deltas merge without losing items.
+
+Because the list is not re-serialized, its persisted copy goes stale. A
+``temp:`` flag (never persisted by ADK) marks it as current for this
+invocation; after a session reload the list is rebuilt from the item keys
+on first read.
+"""
+
+from collections.abc import Mapping, MutableMapping
+from typing import Any
+
+
+def merge_items(existing: dict[str, Any], incoming: dict[str, Any]) -> dict[str, Any]:
+    """Merge two versions of the same item deterministically.
+
+    Lists are unioned (order preserved), other fields take the incoming
+    value unless it is empty.
+    """
+    merged = dict(existing)
+    for field, value in incoming.items():
+        current = merged.get(field)
+        if isinstance(current, list) and isinstance(value, list):
+            merged[field] = current + [v for v in value if v not in current]
+        elif value not in (None, "", [], {}):
+            merged[field] = value
+        else:
+            merged.setdefault(field, value)
+    return merged
+
+
+def _state_items(state: Mapping[str, Any]) -> dict[str, Any]:
+    """Snapshot of a plain dict or an ADK State (value merged with delta)."""
+    to_dict = getattr(state, "to_dict", None)
+    return to_dict() if callable(to_dict) else dict(state)
+
+
+class StateAccumulator:
+    """Append-only collection of dicts keyed by an ID field."""
+
+    def __init__(self, state_key: str, id_field: str) -> None:
+        self.state_key = state_key
+        self.id_field = id_field
+
+    @property
+    def current_key(self) -> str:
+        """Invocation-scoped flag set while the rendered list is current."""
+        return f"temp:{self.state_key}_current"
+
+    def item_key(self, item_id: str) -> str:
+        """State key holding a single item."""
+        return f"{self.state_key}#{item_id}"
+
+    def _rendered(self, state: MutableMapping[str, Any]) -> list[dict[str, Any]]:
+        items = state.get(self.state_key)
+        if not state.get(self.current_key) or not isinstance(items, list):
+            items = self.rehydrate(state)
+        return items
+
+    def _persisted_items(self, state: Mapping[str, Any]) -> list[dict[str, Any]]:
+        prefix = f"{self.state_key}#"
+        entries = [
+            value
+            for key, value in _state_items(state).items()
+            if key.startswith(prefix) and isinstance(value, dict)
+        ]
+        return [entry["item"] for entry in sorted(entries, key=lambda e: e["seq"])]
+
+    def append(
+        self, state: MutableMapping[str, Any], item: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Add an item, or merge it into the item with the same ID.
+
+        Returns:
+            The stored (possibly merged) item
+        """
+        item_id = str(item[self.id_field])
+        items = self._rendered(state)
+        key = self.item_key(item_id)
+        entry = state.get(key)
+
+        if entry is None:
+            entry = {"seq": len(items), "item": dict(item)}
+            items.append(entry["item"])
+        else:
+            entry = {"seq": entry["seq"], "item": merge_items(entry["item"], item)}
+            # Keep the rendered list in sync (same position, new contents)
+            for index, rendered in enumerate(items):
+                if str(rendered.get(self.id_field)) == item_id:
+                    items[index] = entry["item"]
+                    break
+            else:
+                items.append(entry["item"])
+
+        # Only this item goes into the state delta
+        state[key] = entry
+        return entry["item"]
+
+    def get(
+        self, state: MutableMapping[str, Any], item_id: str
+    ) -> dict[str, Any] | None:
+        """Look up an item by ID without scanning the list."""
+        entry = state.get(self.item_key(str(item_id)))
+        return entry["item"] if entry else None
+
+    def items(self, state: Mapping[str, Any]) -> list[dict[str, Any]]:
+        """Items in insertion order, in the shape prompts expect.
+
+        Never writes, so read-only states (a ReadonlyContext) work too; a
+        stale list is rebuilt from the item keys until the next append.
+        """
+        items = state.get(self.state_key)
+        if state.get(self.current_key) and isinstance(items, list):
+            return items
+        return self._persisted_items(state)
+
+    def rehydrate(self, state: MutableMapping[str, Any]) -> list[dict[str, Any]]:
+        """Rebuild the rendered list from persisted item keys.
+
+        Used when a session is reloaded from storage, where only the
+        per-item keys are authoritative.
+        """
+        items = self._persisted_items(state)
+        state[self.state_key] = items
+        state[self.current_key] = True
+        return items
+
+    def clear(self, state: MutableMapping[str, Any]) -> None:
+        """Drop all items (used when a new investigation starts)."""
+        prefix = f"{self.state_key}#"
+        for key in [k for k in _state_items(state) if k.startswith(prefix)]:
+            state[key] = None
+        state[self.state_key] = []
+        state[self.current_key] = True
+
+
+# Accumulators shared by the tools and downstream agents
+sources_accumulator = StateAccumulator("sources_accumulated", "source_id")
+claims_accumulator = StateAccumulator("claims_accumulated", "claim_id")
+ACCUMULATORS_BY_KEY = {
+    a.state_key: a for a in (sources_accumulator, claims_accumulator)
+}
@@ -2,38 +2,42 @@
 Root agent for the Vicaran investigation system.
 """
 
-from google.adk.agents import LlmAgent, SequentialAgent
+from google.adk.agents import LlmAgent
 
-from .callbacks import initialize_investigation_state, pipeline_started_callback
-from .config import config
-from .prompts import ORCHESTRATOR_INSTRUCTION
-from .sub_agents import (
-    bias_analyzer,
-    claim_extractor,
-    fact_checker,
-    source_finder,
-    summary_writer,
-    timeline_builder,
+from .callbacks import (
+    cancel_model_call,
+    cancel_tool_call,
+    enforce_prompt_budget,
+    handle_model_error,
+    initialize_investigation_state,
+    pipeline_started_callback,
+    record_model_usage,
+    resume_pipeline,
+    throttle_model_call,
+    track_tool_call,
 )
+from .model_routing import model_settings, resolve_model_policy
+from .pipelines import MODES, ModeRouterAgent, build_pipeline
+from .prompts import ORCHESTRATOR_INSTRUCTION
 from .tools import analyze_source_tool, callback_api_tool
 
 # =============================================================================
 # INVESTIGATION PIPELINE
 # =============================================================================
 
-# The investigation pipeline executes sub-agents in sequence
-# Each agent reads from session state and writes to its output_key
-investigation_pipeline = SequentialAgent(
+# One pipeline per mode, built once from the declarative stage list in
+# pipelines.py. Each agent reads from session state and writes to its
+# output_key:
+#   source_finder → claim_extractor → [fact_checker | bias_analyzer
+#   | timeline_builder (detailed only)] → summary_writer
+# Quick mode's fast path is source_finder → quick_analyzer (one call).
+pipelines = {mode: build_pipeline(mode) for mode in MODES}
+
+# Delegates to the pipeline matching investigation_mode
+investigation_pipeline = ModeRouterAgent(
     name="investigation_pipeline",
-    sub_agents=[
-        source_finder,  # Discovers sources → discovered_sources
-        claim_extractor,  # Extracts claims → extracted_claims
-        fact_checker,  # Verifies claims → fact_check_results
-        bias_analyzer,  # Analyzes bias → bias_analysis
-        timeline_builder,  # Builds timeline → timeline_events (skipped in Quick mode)
-        summary_writer,  # Generates summary → investigation_summary
-    ],
-    description="Sequential pipeline executing the investigation workflow stages",
+    sub_agents=list(pipelines.values()),
+    description="Runs the quick or detailed investigation pipeline for the session's mode",
     # Deterministic status update - fires when pipeline starts (not LLM-dependent)
     before_agent_callback=pipeline_started_callback,
 )
@@ -44,11 +48,21 @@ investigation_pipeline = SequentialAgent(
 
 investigation_orchestrator = LlmAgent(
     name="investigation_orchestrator",
-    model=config.default_model,
+    **model_settings(resolve_model_policy("investigation_orchestrator")),
     instruction=ORCHESTRATOR_INSTRUCTION,
     sub_agents=[investigation_pipeline],
     tools=[analyze_source_tool, callback_api_tool],
     before_agent_callback=initialize_investigation_state,
+    # Resumed runs go straight to the pipeline (no re-planning)
+    before_model_callback=[
+        cancel_model_call,
+        resume_pipeline,
+        enforce_prompt_budget,
+        throttle_model_call,
+    ],
+    after_model_callback=record_model_usage,
+    on_model_error_callback=handle_model_error,
+    before_tool_callback=[cancel_tool_call, track_tool_call],
     output_key="investigation_plan",
     description="Vicaran investigation orchestrator - analyzes sources, generates plans, and delegates to pipeline",
 )
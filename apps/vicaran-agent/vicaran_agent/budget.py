@@ -0,0 +1,155 @@
+"""
+Per-investigation deadline and budget controller with graceful degradation.
+
+Callbacks around every agent, model call and tool call feed the controller,
+which compares elapsed wall-clock time, tokens, model calls and tool calls
+with the budget of the investigation's mode (``config.investigation_budgets``).
+The largest fraction used picks a degradation step, entered once its
+threshold in ``config.budget_step_thresholds`` is crossed and never left:
+
+    fewer_sources → skip_timeline → top_claims → summary_only
+
+``summary_only`` skips every remaining stage except the summary, which is
+then delivered as INVESTIGATION_PARTIAL instead of INVESTIGATION_COMPLETE.
+"""
+
+import logging
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+DEGRADATION_STEPS = ("fewer_sources", "skip_timeline", "top_claims", "summary_only")
+
+
+@dataclass
+class BudgetUsage:
+    """What one investigation has spent so far."""
+
+    mode: str
+    started: float
+    tokens: int = 0
+    model_calls: int = 0
+    tool_calls: int = 0
+    # Index into DEGRADATION_STEPS of the deepest step entered (-1 = none)
+    step: int = -1
+    # Budget that pushed the investigation into its current step
+    exhausted_by: str = ""
+
+
+class InvestigationBudgetController:
+    """Tracks spending per investigation and decides how far to degrade."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._usage: dict[str, BudgetUsage] = {}
+
+    def start(self, investigation_id: str, mode: str) -> None:
+        """Start the clock (a no-op if the investigation is already tracked)."""
+        if config.budget_enabled and investigation_id:
+            self._usage.setdefault(investigation_id, BudgetUsage(mode, self._clock()))
+
+    def finish(self, investigation_id: str) -> None:
+        """Stop tracking a finished investigation."""
+        self._usage.pop(investigation_id, None)
+
+    def record_model_call(self, investigation_id: str, usage_metadata: Any) -> None:
+        """Count one final model response and its tokens."""
+        usage = self._usage.get(investigation_id)
+        if usage is None:
+            return
+        usage.model_calls += 1
+        usage.tokens += getattr(usage_metadata, "total_token_count", None) or 0
+
+    def record_tool_call(self, investigation_id: str) -> None:
+        """Count one tool call (or code-driven search / page fetch)."""
+        usage = self._usage.get(investigation_id)
+        if usage is not None:
+            usage.tool_calls += 1
+
+    def _fractions(self, usage: BudgetUsage) -> dict[str, float]:
+        budget = config.investigation_budgets.get(usage.mode)
+        if budget is None:
+            return {}
+        spent = {
+            "wall-clock": (self._clock() - usage.started, budget.wall_clock_seconds),
+            "token": (usage.tokens, budget.max_tokens),
+            "model call": (usage.model_calls, budget.max_model_calls),
+            "tool call": (usage.tool_calls, budget.max_tool_calls),
+        }
+        return {name: used / limit for name, (used, limit) in spent.items() if limit}
+
+    def step(self, investigation_id: str) -> str | None:
+        """Current degradation step, entering deeper steps as budgets run out."""
+        usage = self._usage.get(investigation_id)
+        if usage is None:
+            return None
+        fractions = self._fractions(usage)
+        if fractions:
+            budget, used = max(fractions.items(), key=lambda item: item[1])
+            for index, name in enumerate(DEGRADATION_STEPS):
+                threshold = config.budget_step_thresholds.get(name)
+                if index > usage.step and threshold is not None and used >= threshold:
+                    usage.step, usage.exhausted_by = index, budget
+                    logger.info(
+                        "[Budget] %s: %s (%.0f%% of %s budget)",
+                        investigation_id,
+                        name,
+                        used * 100,
+                        budget,
+                    )
+                    if config.debug_mode:
+                        print(
+                            f"\n⏳ BUDGET {investigation_id}: {name} "
+                            f"({used:.0%} of {budget} budget used)"
+                        )
+        return DEGRADATION_STEPS[usage.step] if usage.step >= 0 else None
+
+    def reached(self, investigation_id: str, step: str) -> bool:
+        """Whether the investigation has degraded to ``step`` (or further)."""
+        current = self.step(investigation_id)
+        return current is not None and DEGRADATION_STEPS.index(
+            current
+        ) >= DEGRADATION_STEPS.index(step)
+
+    def source_limit(self, investigation_id: str, limit: int) -> int:
+        """Sources to gather, reduced once ``fewer_sources`` is reached."""
+        if not self.reached(investigation_id, "fewer_sources"):
+            return limit
+        return max(1, math.ceil(limit * config.budget_reduced_source_fraction))
+
+    def claim_limit(self, investigation_id: str) -> int | None:
+        """Claims to fact-check once ``top_claims`` is reached (None = all)."""
+        if self.reached(investigation_id, "top_claims"):
+            return config.budget_top_claims
+        return None
+
+    def partial_reason(self, investigation_id: str) -> str | None:
+        """Why the summary is partial, if the budget ran out."""
+        if not self.reached(investigation_id, "summary_only"):
+            return None
+        usage = self._usage[investigation_id]
+        return f"The {usage.mode} mode {usage.exhausted_by} budget ran out"
+
+    def report(self, investigation_id: str) -> dict[str, Any]:
+        """Spending so far and the current step."""
+        usage = self._usage.get(investigation_id)
+        if usage is None:
+            return {}
+        return {
+            "mode": usage.mode,
+            "elapsed_seconds": round(self._clock() - usage.started, 1),
+            "tokens": usage.tokens,
+            "model_calls": usage.model_calls,
+            "tool_calls": usage.tool_calls,
+            "step": self.step(investigation_id),
+        }
+
+
+# Global investigation budget controller
+investigation_budget = InvestigationBudgetController()
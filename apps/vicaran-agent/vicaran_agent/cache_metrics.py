@@ -0,0 +1,79 @@
+"""
+Per-agent prompt cache instrumentation.
+
+Reads ``cached_content_token_count`` / ``prompt_token_count`` from each model
+response's usage metadata, so the effect of prefix-stable prompts (implicit
+caching) and explicit context caches can be confirmed per agent.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheUsage:
+    """Cumulative prompt and cached token counts for one agent."""
+
+    calls: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def cached_ratio(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+
+class CacheUsageTracker:
+    """Accumulates cache usage per agent."""
+
+    def __init__(self) -> None:
+        self._usage: dict[str, CacheUsage] = {}
+
+    def record(self, agent_name: str, usage_metadata: Any) -> float | None:
+        """Record one response's usage metadata.
+
+        Returns:
+            The cached-token ratio of this call, or None without usage data
+        """
+        prompt_tokens = getattr(usage_metadata, "prompt_token_count", None) or 0
+        if not prompt_tokens:
+            return None
+        cached_tokens = getattr(usage_metadata, "cached_content_token_count", None) or 0
+
+        usage = self._usage.setdefault(agent_name, CacheUsage())
+        usage.calls += 1
+        usage.prompt_tokens += prompt_tokens
+        usage.cached_tokens += cached_tokens
+
+        ratio = cached_tokens / prompt_tokens
+        logger.info(
+            "[CacheUsage] %s: %d/%d prompt tokens cached (%.0f%%, cumulative %.0f%%)",
+            agent_name,
+            cached_tokens,
+            prompt_tokens,
+            ratio * 100,
+            usage.cached_ratio * 100,
+        )
+        return ratio
+
+    def report(self) -> dict[str, dict[str, float]]:
+        """Cumulative usage per agent (calls, tokens and cached ratio)."""
+        return {
+            agent_name: {
+                "calls": usage.calls,
+                "prompt_tokens": usage.prompt_tokens,
+                "cached_tokens": usage.cached_tokens,
+                "cached_ratio": round(usage.cached_ratio, 4),
+            }
+            for agent_name, usage in self._usage.items()
+        }
+
+    def reset(self) -> None:
+        self._usage.clear()
+
+
+# Global cache usage tracker
+cache_usage = CacheUsageTracker()
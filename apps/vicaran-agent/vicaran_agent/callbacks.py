@@ -5,12 +5,51 @@ All callbacks follow ADK CallbackContext patterns.
 
 import asyncio
 import re
+import time
+from collections.abc import Callable
 from typing import Any
 from urllib.parse import urlparse, urlunparse
 
 from google.adk.agents.callback_context import CallbackContext
-
+from google.adk.agents.run_config import StreamingMode
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.tools import BaseTool, ToolContext
+from google.genai import types
+from pydantic import ValidationError
+
+from .accumulators import claims_accumulator, sources_accumulator
+from .budget import investigation_budget
+from .cache_metrics import cache_usage
+from .cancellation import investigation_cancellations
+from .checkpoints import checkpoint_state, restore_state, stage_checkpoints
 from .config import config
+from .context_cache import context_cache
+from .history_compaction import compact_tool_outputs
+from .model_metrics import model_call_metrics
+from .model_routing import is_overload_error, resend_model_call, resolve_model_policy
+from .models import Claim, FactCheck, QuickAnalysis
+from .outbox import callback_outbox
+from .projections import CACHED_CORPUS_FLAG
+from .prompt_budget import estimate_request_tokens, prompt_budget
+from .rate_limiter import (
+    is_rate_limit_error,
+    model_rate_limiter,
+    retry_after_seconds,
+)
+from .structured_outputs import (
+    claim_payloads,
+    complete_fact_checks,
+    fact_check_payload,
+    parse_items,
+    persisted_fact_checks,
+    quick_fact_checks,
+    render_claims,
+    render_fact_checks,
+    render_source_biases,
+)
+from .tools.callback_api import save_items
+from .transport import callback_transport
 
 # =============================================================================
 # URL NORMALIZATION HELPER
@@ -64,6 +103,9 @@ def initialize_investigation_state(callback_context: CallbackContext) -> None:
     session = callback_context._invocation_context.session
     session_state = session.state
 
+    # Resume delivery of any outbox events left over from a previous process
+    callback_outbox.start()
+
     # Extract user messages from session events (ADK stores messages here, not in user_prompt)
     user_prompt = ""
     for event in reversed(session.events or []):
@@ -110,6 +152,11 @@ def initialize_investigation_state(callback_context: CallbackContext) -> None:
             print(f"   user_prompt was: '{user_prompt[:200]}...'")
         session_state["investigation_id"] = ""
 
+    # "RESUME Investigation ID: ..." continues from the last stage checkpoint
+    resuming = bool(
+        re.search(r"^\s*RESUME\b", user_prompt, re.IGNORECASE | re.MULTILINE)
+    ) or bool(session_state.get("resume_investigation"))
+
     # Extract mode from prompt or state
     mode = session_state.get("investigation_mode", "quick")
     if "detailed" in user_prompt.lower():
@@ -155,8 +202,27 @@ def initialize_investigation_state(callback_context: CallbackContext) -> None:
     session_state["source_id_map"] = []
     session_state["claim_id_map"] = []
     # Accumulated structured data for downstream agents
-    session_state["sources_accumulated"] = []
-    session_state["claims_accumulated"] = []
+    sources_accumulator.clear(session_state)
+    claims_accumulator.clear(session_state)
+    session_state[CACHED_CORPUS_FLAG] = False
+    session_state[PIPELINE_TERMINATION_KEY] = ""
+    session_state["resuming"] = False
+    session_state["completed_stages"] = []
+
+    if resuming and investigation_id and config.checkpoints_enabled:
+        snapshot = stage_checkpoints.latest_state(investigation_id)
+        if snapshot:
+            restore_state(session_state, snapshot)
+            mode = session_state.get("investigation_mode", mode)
+        session_state["resuming"] = True
+        session_state["completed_stages"] = stage_checkpoints.completed_stages(
+            investigation_id
+        )
+        if config.debug_mode:
+            print(
+                "\n\u267b\ufe0f RESUMING: completed stages "
+                f"{session_state['completed_stages'] or 'none'}"
+            )
 
     if config.debug_mode:
         print("\n\U0001f680 INVESTIGATION INITIALIZED")
@@ -180,7 +246,8 @@ def pipeline_started_callback(callback_context: CallbackContext) -> None:
 
     This is called as before_agent_callback on investigation_pipeline.
     It deterministically updates the investigation status to 'in_progress'
-    without relying on LLM to call the callback tool.
+    without relying on LLM to call the callback tool. The event goes through
+    the durable outbox, so a slow or unavailable API never blocks the loop.
     """
     investigation_id = callback_context.state.get("investigation_id")
     if not investigation_id:
@@ -188,36 +255,17 @@ def pipeline_started_callback(callback_context: CallbackContext) -> None:
             print("\u26a0\ufe0f PIPELINE START: No investigation_id, skipping callback")
         return
 
-    # The callback_api_tool expects a ToolContext, but we have CallbackContext
-    # Make direct HTTP call instead (same logic as the tool)
-    import httpx
-
-    api_url = config.callback_api_url
-    api_secret = config.agent_secret
-
-    payload = {
-        "type": "INVESTIGATION_STARTED",
-        "investigation_id": investigation_id,
-        "data": {},
-    }
-
-    headers = {
-        "Content-Type": "application/json",
-        "X-Agent-Secret": api_secret,
-    }
-
     if config.debug_mode:
         print("\n\U0001f680 PIPELINE STARTED CALLBACK FIRED")
         print(f"\U0001f194 Investigation ID: {investigation_id}")
 
-    try:
-        response = httpx.post(api_url, json=payload, headers=headers, timeout=30)
-        response.raise_for_status()
-        if config.debug_mode:
-            print("\u2705 Status updated to 'in_progress'")
-    except Exception as e:
-        if config.debug_mode:
-            print(f"\u274c CALLBACK ERROR: {str(e)}")
+    # Deadline and budgets run from here until the router's run ends
+    investigation_budget.start(
+        investigation_id, callback_context.state.get("investigation_mode", "quick")
+    )
+
+    # Durable, non-blocking delivery - the outbox sender posts in the background
+    callback_outbox.enqueue(investigation_id, "INVESTIGATION_STARTED", {})
 
 
 # =============================================================================
@@ -225,29 +273,13 @@ def pipeline_started_callback(callback_context: CallbackContext) -> None:
 # =============================================================================
 
 
-def _parse_sources_from_output(output: str) -> list[dict[str, Any]]:
-    """Parse source data from agent output text.
-
-    This is a simplified parser - the agent should output structured data
-    that we can extract. For MVP, we rely on the agent calling callback_api_tool
-    for each source individually.
-    """
-    # For MVP, sources are saved via direct callback_api_tool calls in agent
-    # This callback is primarily for post-processing and ID storage
-    return []
-
-
 def debug_claim_extractor_input(callback_context: CallbackContext) -> None:
     """Debug callback to verify sources_accumulated reaches claim_extractor.
-    Also adds a rate-limit delay to prevent 429 errors."""
-    # Rate-limit delay: prevent Vertex AI 429 errors between sub-agents
-    import time
-    if config.debug_mode:
-        print("\n⏳ Rate-limit delay: waiting 5 seconds before claim extraction...")
-    time.sleep(5)
 
+    Rate limiting is handled per model call by throttle_model_call.
+    """
     if config.debug_mode:
-        sources = callback_context.state.get("sources_accumulated", [])
+        sources = sources_accumulator.items(callback_context.state)
         print(f"\n🔍 DEBUG CLAIM_EXTRACTOR: Received {len(sources)} sources")
         if sources:
             for i, src in enumerate(sources[:3]):  # Show first 3
@@ -256,51 +288,162 @@ def debug_claim_extractor_input(callback_context: CallbackContext) -> None:
             print("   ⚠️ sources_accumulated is EMPTY!")
 
 
-def rate_limit_delay(callback_context: CallbackContext) -> None:
-    """Add a small delay before each sub-agent to prevent Vertex AI 429 rate limits."""
-    import time
-    agent_name = getattr(callback_context, 'agent_name', 'unknown')
+def batch_save_sources(callback_context: CallbackContext) -> None:
+    """After source_finder completes, store source IDs for downstream agents.
+
+    Sources are saved while the stage runs (callback_api_tool or code-driven
+    discovery); this records the saved IDs in source_id_map.
+    """
+    sources = sources_accumulator.items(callback_context.state)
+    callback_context.state["source_id_map"] = [
+        {"source_id": source["source_id"], "url": source.get("url", "")}
+        for source in sources
+    ]
+
     if config.debug_mode:
-        print(f"\n⏳ Rate-limit delay: waiting 5 seconds before {agent_name}...")
-    time.sleep(5)
+        print(f"\n\U0001f4e6 BATCH SAVE SOURCES: {len(sources)} sources accumulated")
 
 
+async def _save_claims(
+    state: Any, investigation_id: str | None, claims: list[Claim]
+) -> None:
+    """Persist claims in one bulk write; fill claim_id_map and extracted_claims."""
+    known_sources = {s["source_id"] for s in sources_accumulator.items(state)}
+    payloads = claim_payloads(claims, known_sources)
+    if payloads and investigation_id:
+        try:
+            await save_items(state, investigation_id, "CLAIM_EXTRACTED", payloads)
+        except Exception as e:
+            # Nothing accumulated: terminate_without_outputs ends the pipeline
+            if config.debug_mode:
+                print(f"\u274c BATCH SAVE CLAIMS FAILED: {e}")
 
-def batch_save_sources(callback_context: CallbackContext) -> None:
-    """After source_finder completes, store source IDs for downstream agents.
+    saved = claims_accumulator.items(state)
+    state["claim_id_map"] = [
+        {"claim_id": claim["claim_id"], "claim_text": claim["claim_text"]}
+        for claim in saved
+    ]
+    state["extracted_claims"] = render_claims(saved)
 
-    Note: Sources are saved via direct callback_api_tool calls during agent execution.
-    This callback captures the results and stores source_id_map.
-    """
-    # Source IDs are accumulated during agent execution via callback_api_tool
-    # Just ensure the map is available
-    if "source_id_map" not in callback_context.state:
-        callback_context.state["source_id_map"] = []
+    if config.debug_mode:
+        print(
+            f"\n\U0001f4e6 BATCH SAVE CLAIMS: {len(claims)} returned, "
+            f"{len(saved)} claims accumulated"
+        )
+
+
+async def _save_fact_checks(
+    state: Any, investigation_id: str | None, returned: list[FactCheck]
+) -> None:
+    """Persist one verdict per accumulated claim; fill fact_check_results."""
+    claims = claims_accumulator.items(state)
+    checks = complete_fact_checks(returned, claims)
+    by_id = {claim["claim_id"]: claim for claim in claims}
+    evidence = persisted_fact_checks(checks)
+    if evidence and investigation_id:
+        payloads = [fact_check_payload(c, by_id[c.claim_id]) for c in evidence]
+        try:
+            results = await save_items(
+                state, investigation_id, "FACT_CHECKED", payloads
+            )
+        except Exception as e:
+            results = []
+            if config.debug_mode:
+                print(f"\u274c BATCH SAVE FACT CHECKS FAILED: {e}")
+        for check, result in zip(evidence, results, strict=False):
+            check.fact_check_id = result.get("fact_check_id")
+    state["fact_check_results"] = render_fact_checks(checks, by_id)
 
     if config.debug_mode:
-        source_count = len(callback_context.state.get("sources_accumulated", []))
-        print(f"\n\U0001f4e6 BATCH SAVE SOURCES: {source_count} sources accumulated")
+        print(
+            f"\n\U0001f4e6 BATCH SAVE FACT CHECKS: {len(returned)} returned, "
+            f"{len(evidence)} saved"
+        )
 
 
-def batch_save_claims(callback_context: CallbackContext) -> None:
-    """After claim_extractor completes, store claim IDs for fact_checker.
+async def batch_save_claims(callback_context: CallbackContext) -> None:
+    """After claim_extractor completes, persist its claims in one bulk write.
 
-    Note: Claims are saved via direct callback_api_tool calls during agent execution.
-    This callback ensures claim_id_map is available for fact_checker.
+    The stage's structured output (a list of Claim records) is validated,
+    deduplicated and saved with a single save_many call; the saved claims
+    fill claims_accumulated and claim_id_map for fact_checker, and the
+    output is replaced by a readable report.
     """
-    if "claim_id_map" not in callback_context.state:
-        callback_context.state["claim_id_map"] = []
+    state = callback_context.state
+    claims = parse_items(state.get("extracted_claims"), Claim)
+    await _save_claims(state, state.get("investigation_id"), claims)
+
+
+async def batch_save_fact_checks(callback_context: CallbackContext) -> None:
+    """After fact_checker completes, persist its verdicts in one bulk write.
+
+    Every accumulated claim gets exactly one verdict in the report; claims
+    the model skipped are reported as UNVERIFIED, and only verdicts with
+    evidence are saved as FACT_CHECKED items.
+    """
+    state = callback_context.state
+    if not claims_accumulator.items(state):
+        return
+    returned = parse_items(state.get("fact_check_results"), FactCheck)
+    await _save_fact_checks(state, state.get("investigation_id"), returned)
 
-    if config.debug_mode:
-        claim_count = len(callback_context.state.get("claims_accumulated", []))
-        print(f"\n\U0001f4e6 BATCH SAVE CLAIMS: {claim_count} claims accumulated")
 
+async def save_quick_analysis(callback_context: CallbackContext) -> None:
+    """After quick_analyzer completes, persist its results like the full stages.
 
-def save_final_summary(callback_context: CallbackContext) -> None:
+    Claims (then their verdicts) and bias scores are saved concurrently with
+    the usual callback types, one bulk write each. The reports and the
+    summary go to the state keys the full pipeline fills, so
+    save_final_summary completes the investigation as usual.
+    """
+    state = callback_context.state
+    try:
+        analysis = QuickAnalysis.model_validate(state.get("quick_analysis") or {})
+    except ValidationError:
+        # investigation_summary stays empty: the pipeline ends as partial
+        if config.debug_mode:
+            print("\n\u26a0\ufe0f QUICK ANALYSIS: unusable model output")
+        return
+    investigation_id = state.get("investigation_id")
+
+    async def save_claims_and_verdicts() -> None:
+        claims = [Claim.model_validate(claim.model_dump()) for claim in analysis.claims]
+        await _save_claims(state, investigation_id, claims)
+        verdicts = quick_fact_checks(analysis.claims, claims_accumulator.items(state))
+        if verdicts:
+            await _save_fact_checks(state, investigation_id, verdicts)
+
+    async def save_bias_scores() -> None:
+        sources = {s["source_id"]: s for s in sources_accumulator.items(state)}
+        biases = {
+            b.source_id: b for b in analysis.source_biases if b.source_id in sources
+        }
+        if biases and investigation_id:
+            payloads = [
+                {"source_id": b.source_id, "bias_score": b.bias_score}
+                for b in biases.values()
+            ]
+            try:
+                await save_items(state, investigation_id, "BIAS_ANALYZED", payloads)
+            except Exception as e:
+                if config.debug_mode:
+                    print(f"\u274c BATCH SAVE BIAS FAILED: {e}")
+        state["bias_analysis"] = render_source_biases(list(biases.values()), sources)
+
+    await asyncio.gather(save_claims_and_verdicts(), save_bias_scores())
+
+    summary = analysis.summary.strip()
+    if summary and "[INVESTIGATION_COMPLETE]" not in summary:
+        summary += "\n\n[INVESTIGATION_COMPLETE]"
+    state["investigation_summary"] = summary
+
+
+async def save_final_summary(callback_context: CallbackContext) -> None:
     """After summary_writer completes, save the investigation summary.
 
-    This makes a direct HTTP call to trigger INVESTIGATION_COMPLETE,
-    following the same pattern as pipeline_started_callback.
+    This enqueues INVESTIGATION_COMPLETE (INVESTIGATION_PARTIAL once the
+    investigation budget ran out) in the durable outbox, following the same
+    pattern as pipeline_started_callback.
     The summary is read from session state (via output_key), avoiding
     JSON parsing issues with large strings.
     """
@@ -317,9 +460,7 @@ def save_final_summary(callback_context: CallbackContext) -> None:
     # Extract overall bias score from summary
     # Matches formats: "**4/10**", "4/10", "4.5/10", "Overall bias score: 4/10"
     overall_bias_score = None
-    bias_match = re.search(
-        r"\*?\*?(\d+(?:\.\d+)?)/10\*?\*?", investigation_summary
-    )
+    bias_match = re.search(r"\*?\*?(\d+(?:\.\d+)?)/10\*?\*?", investigation_summary)
     if bias_match:
         try:
             # Convert from 0-10 scale to 0-5 scale (as expected by API schema)
@@ -328,64 +469,596 @@ def save_final_summary(callback_context: CallbackContext) -> None:
         except ValueError:
             pass
 
+    # A summary written after the budget ran out is delivered as partial
+    partial_reason = investigation_budget.partial_reason(investigation_id)
+    callback_type = (
+        "INVESTIGATION_PARTIAL" if partial_reason else "INVESTIGATION_COMPLETE"
+    )
+
     if config.debug_mode:
-        print("\n🎉 INVESTIGATION COMPLETE: Saving summary")
+        print(f"\n🎉 {callback_type}: Saving summary")
         print(f"   📊 Extracted bias score: {overall_bias_score} (0-5 scale)")
 
-    # Make direct HTTP call (same pattern as pipeline_started_callback)
-    import httpx
-
-    api_url = config.callback_api_url
-    api_secret = config.agent_secret
-
     # Build data dict, excluding None values to avoid JSON null (Zod rejects null)
     data: dict = {"summary": investigation_summary}
     if overall_bias_score is not None:
         data["overall_bias_score"] = overall_bias_score
+    if partial_reason:
+        data["partial_reason"] = partial_reason
 
-    payload = {
-        "type": "INVESTIGATION_COMPLETE",
-        "investigation_id": investigation_id,
-        "data": data,
-    }
+    # Durable, non-blocking delivery (same pattern as pipeline_started_callback)
+    callback_outbox.enqueue(investigation_id, callback_type, data)
+    investigation_budget.finish(investigation_id)
+    # Nothing left to resume
+    stage_checkpoints.clear(investigation_id)
+
+    await close_callback_stream(investigation_id)
+
+
+async def close_callback_stream(investigation_id: str) -> None:
+    """Release the investigation's progress stream (no-op for HTTP callbacks).
 
-    headers = {
-        "Content-Type": "application/json",
-        "X-Agent-Secret": api_secret,
+    Closing drains events still in flight; a failure here must not fail the
+    investigation, whose final callback is already in the outbox.
+    """
+    try:
+        await callback_transport.close_investigation(investigation_id)
+    except Exception as e:
+        if config.debug_mode:
+            print(f"\u274c CLOSING CALLBACK STREAM FAILED: {e}")
+
+
+def compact_source_history(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> None:
+    """Before each source_finder model call, stub out saved sources' page text."""
+    saved_sources = {
+        normalize_url(source.get("url", "")): source["source_id"]
+        for source in sources_accumulator.items(callback_context.state)
+        if source.get("url")
     }
+    before, after = compact_tool_outputs(llm_request, saved_sources, normalize_url)
+
+    if config.debug_mode and before != after:
+        print(
+            f"\n🗜️ HISTORY COMPACTION: prompt history {before:,} → {after:,} chars "
+            f"({len(saved_sources)} saved sources)"
+        )
+
+
+# =============================================================================
+# CONTEXT CACHE CALLBACKS
+# =============================================================================
+
 
+def prepare_context_cache(callback_context: CallbackContext) -> None:
+    """After claim_extractor completes, snapshot the corpus for caching."""
+    context_cache.prepare_corpus(callback_context)
+
+
+async def use_context_cache(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> None:
+    """Before each downstream model call, attach the cached corpus."""
+    await context_cache.apply(callback_context, llm_request)
+
+
+async def release_context_cache(callback_context: CallbackContext) -> None:
+    """After the summary is written, delete the investigation's caches."""
+    await context_cache.release(callback_context)
+
+
+def enforce_prompt_budget(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> None:
+    """Before each model call, trim the request to the agent's prompt budget."""
+    before, after = prompt_budget.enforce(
+        callback_context.agent_name, llm_request, _model_call_key(callback_context)
+    )
+    if config.debug_mode and before != after:
+        print(
+            f"\n✂️ PROMPT BUDGET {callback_context.agent_name}: "
+            f"{before:,} → {after:,} estimated tokens"
+        )
+
+
+async def throttle_model_call(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> None:
+    """Before each model call, wait only if the shared quota requires it.
+
+    The call's latency is measured from here, once it has cleared the quota.
+    Model activity counts as progress for the cancellation watchdog, before
+    and after a possibly long wait for quota.
+    """
+    investigation_id = callback_context.state.get("investigation_id", "")
+    investigation_cancellations.progress(investigation_id)
+    waited = await model_rate_limiter.acquire(estimate_request_tokens(llm_request))
+    investigation_cancellations.progress(investigation_id)
+    if config.debug_mode and waited:
+        print(
+            f"\n⏳ RATE LIMIT {callback_context.agent_name}: waited {waited:.1f}s "
+            f"({model_rate_limiter.stats()})"
+        )
+    model_call_metrics.start(_model_call_key(callback_context))
+
+
+def _model_call_key(callback_context: CallbackContext) -> tuple[str, str, str]:
+    """Identifies a model call across concurrently running shards/batches."""
+    return (
+        callback_context.invocation_id,
+        callback_context._invocation_context.branch or "",
+        callback_context.agent_name,
+    )
+
+
+async def handle_model_error(
+    callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+) -> LlmResponse | None:
+    """On a 429, back off and retry once; on overload, use the fallback model.
+
+    A recovered response goes through record_model_usage like any other; a
+    call that still fails is dropped from the per-call bookkeeping here.
+    """
     try:
-        response = httpx.post(api_url, json=payload, headers=headers, timeout=30)
-        response.raise_for_status()
+        response = await _recover_model_call(callback_context, llm_request, error)
+    except BaseException:
+        _record_failed_model_call(callback_context, llm_request)
+        raise
+    if response is None:
+        _record_failed_model_call(callback_context, llm_request)
+    return response
+
+
+def _record_failed_model_call(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> None:
+    """Drop a call that got no response and count it as an errored sample."""
+    call_key = _model_call_key(callback_context)
+    prompt_budget.discard(call_key)
+    model_call_metrics.record_error(
+        callback_context.agent_name, llm_request.model or "", call_key
+    )
+
+
+async def _recover_model_call(
+    callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+) -> LlmResponse | None:
+    if is_rate_limit_error(error):
+        blocked = model_rate_limiter.record_rate_limit(retry_after_seconds(error))
         if config.debug_mode:
-            print("\u2705 Summary saved to database")
-    except Exception as e:
+            print(
+                f"\n🚦 RATE LIMITED {callback_context.agent_name}: "
+                f"blocking model calls for {blocked:.1f}s"
+            )
+        if not llm_request.model:
+            return None
+        # Waits out the block with every other caller
+        await model_rate_limiter.acquire(estimate_request_tokens(llm_request))
+        try:
+            return await resend_model_call(llm_request, llm_request.model)
+        except Exception as retry_error:
+            if not is_rate_limit_error(retry_error):
+                raise
+            model_rate_limiter.record_rate_limit(retry_after_seconds(retry_error))
+            # Let the original error propagate
+            return None
+
+    if is_overload_error(error):
+        policy = resolve_model_policy(
+            callback_context.agent_name,
+            callback_context.state.get("investigation_mode"),
+        )
+        fallback = policy.fallback_model
+        if fallback and fallback != llm_request.model:
+            if config.debug_mode:
+                print(
+                    f"\n🛟 MODEL OVERLOADED {callback_context.agent_name}: "
+                    f"{llm_request.model} → retrying on {fallback}"
+                )
+            request = llm_request
+            if llm_request.config.cached_content:
+                # The cache entry only works with the primary model
+                request = context_cache.inline_request(
+                    callback_context.state.get("investigation_id", ""), llm_request
+                )
+                if request is None:
+                    return None
+            model_call_metrics.record_fallback(callback_context.agent_name, fallback)
+            # The retry counts against the shared quota like any other call
+            await model_rate_limiter.acquire(estimate_request_tokens(request))
+            return await resend_model_call(request, fallback)
+    # Let the error propagate as before
+    return None
+
+
+def record_model_usage(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> None:
+    """After each model call, record latency, tokens, cache and estimate accuracy."""
+    # Streamed chunks carry running totals; only count the final response
+    if llm_response.partial or not llm_response.usage_metadata:
+        return None
+
+    model_rate_limiter.record_success()
+    investigation_id = callback_context.state.get("investigation_id", "")
+    investigation_cancellations.progress(investigation_id)
+    investigation_budget.record_model_call(
+        investigation_id, llm_response.usage_metadata
+    )
+    model = llm_response.model_version or getattr(
+        callback_context._invocation_context.agent, "model", ""
+    )
+    model_call_metrics.record(
+        callback_context.agent_name,
+        getattr(model, "model", model),
+        llm_response.usage_metadata,
+        _model_call_key(callback_context),
+    )
+    ratio = cache_usage.record(callback_context.agent_name, llm_response.usage_metadata)
+    prompt_budget.record_actual(
+        callback_context.agent_name,
+        llm_response.usage_metadata,
+        _model_call_key(callback_context),
+    )
+    if config.debug_mode and ratio is not None:
+        print(
+            f"\n📈 CACHE USAGE {callback_context.agent_name}: "
+            f"{ratio:.0%} of prompt tokens cached"
+        )
+    return None
+
+
+# =============================================================================
+# SUMMARY STREAMING CALLBACKS
+# =============================================================================
+
+# Per-invocation streaming state: buffered text, published length, last publish
+_summary_streams: dict[str, dict[str, Any]] = {}
+
+
+def start_summary_streaming(callback_context: CallbackContext) -> None:
+    """Before summary_writer runs, switch the model call to SSE streaming.
+
+    The web app triggers runs through the non-streaming /run endpoint, so
+    partial model responses only exist if we turn streaming on here. Partial
+    events are never persisted to the session, so the chat is unaffected.
+    """
+    if not config.stream_summary_updates:
+        return
+
+    invocation_context = callback_context._invocation_context
+    _summary_streams[callback_context.invocation_id] = {
+        "text": "",
+        "published": 0,
+        "published_at": 0.0,
+        "previous_mode": invocation_context.run_config.streaming_mode,
+    }
+    invocation_context.run_config.streaming_mode = StreamingMode.SSE
+
+
+def stream_summary_sections(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> LlmResponse | None:
+    """After each streamed chunk, publish completed summary sections.
+
+    A section is complete once the next "## " heading starts. Updates are
+    throttled and coalesced in the outbox (only the newest pending partial
+    summary is sent); the first section is published immediately so users
+    see content as early as possible. save_final_summary still sends the
+    authoritative INVESTIGATION_COMPLETE.
+    """
+    stream = _summary_streams.get(callback_context.invocation_id)
+    investigation_id = callback_context.state.get("investigation_id")
+    if stream is None or not investigation_id or not llm_response.partial:
+        return None
+    if not (llm_response.content and llm_response.content.parts):
+        return None
+
+    stream["text"] += "".join(
+        part.text
+        for part in llm_response.content.parts
+        if part.text and not part.thought
+    )
+
+    # Publish up to the start of the section still being written, once at
+    # least one full section (not just the title) is available
+    boundary = stream["text"].rfind("\n## ")
+    if boundary <= max(stream["published"], stream["text"].find("## ")):
+        return None
+    now = time.monotonic()
+    if (
+        stream["published"]
+        and now - stream["published_at"] < config.summary_stream_interval_seconds
+    ):
+        return None
+
+    partial_summary = stream["text"][:boundary].replace("[INVESTIGATION_COMPLETE]", "")
+    callback_outbox.enqueue(
+        investigation_id,
+        "SUMMARY_UPDATED",
+        {"summary": partial_summary.strip()},
+        coalesce_key=f"summary:{investigation_id}",
+    )
+    stream["published"] = boundary
+    stream["published_at"] = now
+
+    if config.debug_mode:
+        print(f"\n📝 SUMMARY STREAM: published {boundary} chars")
+    return None
+
+
+def finish_summary_streaming(callback_context: CallbackContext) -> None:
+    """After summary_writer completes, restore the run's streaming mode."""
+    stream = _summary_streams.pop(callback_context.invocation_id, None)
+    if stream is not None:
+        run_config = callback_context._invocation_context.run_config
+        run_config.streaming_mode = stream["previous_mode"]
+
+
+# =============================================================================
+# STAGE SHORT-CIRCUITS AND EARLY TERMINATION
+# =============================================================================
+
+# Set (to the partial reason) when the pipeline stops early
+PIPELINE_TERMINATION_KEY = "pipeline_termination"
+
+
+def skip_without_inputs(
+    required: tuple[str, ...], marker: str
+) -> Callable[[CallbackContext], types.Content | None]:
+    """Build a before_agent callback that skips a stage with empty inputs.
+
+    When any ``required`` state list is empty, the stage answers ``marker``
+    (also written to its output_key) without making a model call.
+    """
+
+    def skip_stage(callback_context: CallbackContext) -> types.Content | None:
+        empty = [key for key in required if not callback_context.state.get(key)]
+        if not empty:
+            return None
+
+        output_key = getattr(
+            callback_context._invocation_context.agent, "output_key", None
+        )
+        if output_key:
+            callback_context.state[output_key] = marker
+
+        if config.debug_mode:
+            print(
+                f"\n\u23ed\ufe0f SKIPPED {callback_context.agent_name}: "
+                f"{', '.join(empty)} empty"
+            )
+        return types.Content(role="model", parts=[types.Part(text=marker)])
+
+    return skip_stage
+
+
+def terminate_without_outputs(
+    required: str, reason: str
+) -> Callable[[CallbackContext], None]:
+    """Build an after_agent callback that ends the pipeline on empty output.
+
+    When the stage leaves ``required`` empty, INVESTIGATION_PARTIAL is sent
+    right away and PIPELINE_TERMINATION_KEY tells the router to stop.
+    """
+
+    async def terminate_pipeline(callback_context: CallbackContext) -> None:
+        state = callback_context.state
+        if state.get(required) or state.get(PIPELINE_TERMINATION_KEY):
+            return
+
+        state[PIPELINE_TERMINATION_KEY] = reason
+        investigation_id = state.get("investigation_id")
+
         if config.debug_mode:
-            print(f"\u274c Failed to save summary: {e}")
+            print(f"\n\u26a0\ufe0f PIPELINE PARTIAL: {reason}")
+
+        if not investigation_id:
+            return
+
+        summary = (
+            f"The investigation stopped after {callback_context.agent_name}: {reason}. "
+            f"{len(sources_accumulator.items(state))} sources and "
+            f"{len(claims_accumulator.items(state))} claims were collected."
+        )
+        callback_outbox.enqueue(
+            investigation_id,
+            "INVESTIGATION_PARTIAL",
+            {"summary": summary, "partial_reason": reason},
+        )
+        investigation_budget.finish(investigation_id)
+        # summary_writer will not run, so its cleanup happens here
+        finish_summary_streaming(callback_context)
+        await context_cache.release_investigation(investigation_id)
+        await close_callback_stream(investigation_id)
+
+    return terminate_pipeline
 
 
 # =============================================================================
-# PIPELINE STATUS CHECK
+# INVESTIGATION BUDGET CALLBACKS
 # =============================================================================
 
+# Stages that still run once only the summary is left
+BUDGET_EXEMPT_STAGES = ("summary_writer", "quick_analyzer")
+# Tools that gather more sources
+BUDGET_SOURCE_TOOLS = ("tavily_search_tool", "jina_reader_tool")
 
-def check_pipeline_status(callback_context: CallbackContext) -> None:
-    """Check if pipeline should terminate due to no data.
+BUDGET_SKIPPED_MARKER = "[BUDGET_SKIPPED] Investigation budget exhausted."
+
+
+def _skip_stage(callback_context: CallbackContext, marker: str) -> types.Content:
+    output_key = getattr(callback_context._invocation_context.agent, "output_key", None)
+    if output_key:
+        callback_context.state[output_key] = marker
+    if config.debug_mode:
+        print(f"\n\u23ed\ufe0f SKIPPED {callback_context.agent_name}: {marker}")
+    return types.Content(role="model", parts=[types.Part(text=marker)])
 
-    Detects early termination markers and sends INVESTIGATION_PARTIAL.
+
+def skip_over_budget(callback_context: CallbackContext) -> types.Content | None:
+    """Skip stages the investigation can no longer afford.
+
+    Once ``summary_only`` is reached every stage but the summary is skipped;
+    from ``skip_timeline`` on, the timeline builder is.
     """
-    output = str(callback_context.output) if callback_context.output else ""
-
-    # Detect early termination markers
-    if any(
-        marker in output
-        for marker in [
-            "[NO_SOURCES_FOUND]",
-            "[NO_CLAIMS_EXTRACTED]",
-        ]
+    investigation_id = callback_context.state.get("investigation_id", "")
+    agent_name = callback_context.agent_name
+    if agent_name in BUDGET_EXEMPT_STAGES:
+        return None
+    if investigation_budget.reached(investigation_id, "summary_only"):
+        return _skip_stage(callback_context, BUDGET_SKIPPED_MARKER)
+    if agent_name == "timeline_builder" and investigation_budget.reached(
+        investigation_id, "skip_timeline"
     ):
-        investigation_id = callback_context.state.get("investigation_id")
-        if investigation_id:
-            # This would be called via the tool, but we log it here
-            if config.debug_mode:
-                print("\n\u26a0\ufe0f PIPELINE PARTIAL: Insufficient data")
+        return _skip_stage(
+            callback_context, "[TIMELINE_SKIPPED] Investigation budget running out."
+        )
+    return None
+
+
+def stop_over_budget(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> LlmResponse | None:
+    """End a running stage's tool loop once only the summary is left.
+
+    Structured-output stages keep their call: a marker would not parse.
+    """
+    if (
+        callback_context.agent_name in BUDGET_EXEMPT_STAGES
+        or llm_request.config.response_schema is not None
+        or not investigation_budget.reached(
+            callback_context.state.get("investigation_id", ""), "summary_only"
+        )
+    ):
+        return None
+    return LlmResponse(
+        content=types.Content(
+            role="model", parts=[types.Part(text=BUDGET_SKIPPED_MARKER)]
+        )
+    )
+
+
+def track_tool_call(
+    tool: BaseTool, args: dict[str, Any], tool_context: ToolContext
+) -> dict | None:
+    """Count a tool call against the budget, refusing the ones it can't afford."""
+    state = tool_context.state
+    investigation_id = state.get("investigation_id", "")
+    investigation_cancellations.progress(investigation_id)
+    if investigation_budget.reached(investigation_id, "summary_only"):
+        return {"success": False, "error": "Investigation budget exhausted"}
+
+    if tool.name in BUDGET_SOURCE_TOOLS and investigation_budget.reached(
+        investigation_id, "fewer_sources"
+    ):
+        investigation_config = state.get("investigation_config") or {}
+        limit = investigation_budget.source_limit(
+            investigation_id,
+            investigation_config.get("source_limit") or config.quick_mode_source_limit,
+        )
+        if len(sources_accumulator.items(state)) >= limit:
+            return {
+                "success": False,
+                "error": f"Source limit of {limit} reached for this budget",
+            }
+
+    investigation_budget.record_tool_call(investigation_id)
+    return None
+
+
+# =============================================================================
+# CANCELLATION CALLBACKS
+# =============================================================================
+
+
+def cancel_model_call(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> None:
+    """Before each model call, end the run if its investigation was cancelled."""
+    investigation_cancellations.check(
+        callback_context.state.get("investigation_id", "")
+    )
+
+
+def cancel_tool_call(
+    tool: BaseTool, args: dict[str, Any], tool_context: ToolContext
+) -> None:
+    """Before each tool call, end the run if its investigation was cancelled."""
+    investigation_cancellations.check(tool_context.state.get("investigation_id", ""))
+
+
+async def end_cancelled_investigation(
+    investigation_id: str, reason: str, notify: bool
+) -> None:
+    """Release a cancelled investigation, reporting it as failed if asked.
+
+    Stage checkpoints are kept, so a stalled investigation can be resumed.
+    """
+    if not investigation_id:
+        return
+    if notify:
+        callback_outbox.enqueue(
+            investigation_id, "INVESTIGATION_FAILED", {"error_message": reason}
+        )
+    investigation_budget.finish(investigation_id)
+    await close_callback_stream(investigation_id)
+
+
+# =============================================================================
+# STAGE CHECKPOINTS AND RESUME
+# =============================================================================
+
+
+def checkpoint_stage(callback_context: CallbackContext) -> None:
+    """After a pipeline stage completes, checkpoint its outputs and accumulators."""
+    investigation_id = callback_context.state.get("investigation_id")
+    if not investigation_id or not config.checkpoints_enabled:
+        return
+
+    stage_checkpoints.save_stage(
+        investigation_id,
+        callback_context.agent_name,
+        checkpoint_state(callback_context.state),
+    )
+    if config.debug_mode:
+        print(f"\n\U0001f4be CHECKPOINT: {callback_context.agent_name} completed")
+
+
+def skip_completed_stage(callback_context: CallbackContext) -> types.Content | None:
+    """On a resumed run, skip stages whose outputs were restored from a checkpoint."""
+    if callback_context.agent_name not in callback_context.state.get(
+        "completed_stages", []
+    ):
+        return None
+
+    if config.debug_mode:
+        print(f"\n\u23ed\ufe0f RESUME: {callback_context.agent_name} already completed")
+    return types.Content(
+        role="model",
+        parts=[types.Part(text=f"[RESUMED] {callback_context.agent_name} completed")],
+    )
+
+
+def resume_pipeline(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> LlmResponse | None:
+    """On a resumed run, hand over to the pipeline without re-planning."""
+    if not callback_context.state.get("resuming"):
+        return None
+
+    callback_context.state["resuming"] = False
+    return LlmResponse(
+        content=types.Content(
+            role="model",
+            parts=[
+                types.Part(
+                    function_call=types.FunctionCall(
+                        name="transfer_to_agent",
+                        args={"agent_name": "investigation_pipeline"},
+                    )
+                )
+            ],
+        )
+    )
@@ -0,0 +1,211 @@
+"""
+Cooperative cancellation of investigations, with a no-progress watchdog.
+
+``ModeRouterAgent`` registers each pipeline run by ``investigation_id`` and
+consumes it through ``guard``, which races the pipeline's events against
+the run's cancellation. Cancelling a run:
+
+- closes the pipeline at once: every task under it is cancelled, including
+  in-flight model calls and (async) HTTP requests, which frees their rate
+  limiter and concurrency slots for active investigations
+- makes the before-model and before-tool hooks raise
+  ``InvestigationCancelledError`` for anything still starting
+
+Runs are cancelled when the web app abandons the investigation (the
+server's cancel route, see server.py), when the backend reports it gone
+(HTTP 404 on a callback) and by the watchdog once a run has yielded no event
+and started or finished no model or tool call for
+``config.watchdog_stall_minutes``.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import AsyncGenerator, Callable
+from dataclasses import dataclass, field
+
+from google.adk.events import Event
+
+from .config import config
+from .event_merge import EventMerger
+
+logger = logging.getLogger(__name__)
+
+
+class InvestigationCancelledError(Exception):
+    """The investigation was cancelled; its pipeline should stop."""
+
+    def __init__(self, investigation_id: str, reason: str, notify: bool) -> None:
+        super().__init__(f"Investigation {investigation_id} cancelled: {reason}")
+        self.investigation_id = investigation_id
+        self.reason = reason
+        # Whether the backend should be told (it already knows of a deletion)
+        self.notify = notify
+
+
+@dataclass
+class _Run:
+    """Cancellation state of one running investigation."""
+
+    last_progress: float
+    cancelled: asyncio.Event = field(default_factory=asyncio.Event)
+    # Loop the run is consumed on; cancel() may be called from another thread
+    loop: asyncio.AbstractEventLoop | None = None
+    reason: str = ""
+    notify: bool = False
+
+
+class CancellationRegistry:
+    """Running investigations by ID, each cancellable from anywhere."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._runs: dict[str, _Run] = {}
+        self._watchdog: asyncio.Task[None] | None = None
+
+    def start(self, investigation_id: str) -> None:
+        """Register a run and make sure the watchdog is watching."""
+        if not investigation_id:
+            return
+        try:
+            loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        self._runs[investigation_id] = _Run(self._clock(), loop=loop)
+        self._start_watchdog()
+
+    def finish(self, investigation_id: str) -> None:
+        """Forget a run that has ended."""
+        self._runs.pop(investigation_id, None)
+
+    def progress(self, investigation_id: str) -> None:
+        """Record that a run is still making progress."""
+        run = self._runs.get(investigation_id)
+        if run is not None:
+            run.last_progress = self._clock()
+
+    def cancel(self, investigation_id: str, reason: str, notify: bool = False) -> bool:
+        """Cancel a running investigation.
+
+        Returns:
+            True if a run was cancelled by this call
+        """
+        run = self._runs.get(investigation_id)
+        if run is None or run.cancelled.is_set():
+            return False
+        run.reason, run.notify = reason, notify
+        try:
+            current: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        if run.loop is not None and run.loop is not current:
+            # The event must be set on the loop that waits on it
+            run.loop.call_soon_threadsafe(run.cancelled.set)
+        else:
+            run.cancelled.set()
+        logger.info("[Cancellation] %s: %s", investigation_id, reason)
+        if config.debug_mode:
+            print(f"\n🛑 CANCELLED {investigation_id}: {reason}")
+        return True
+
+    def is_cancelled(self, investigation_id: str) -> bool:
+        run = self._runs.get(investigation_id)
+        return run is not None and run.cancelled.is_set()
+
+    def check(self, investigation_id: str) -> None:
+        """Raise if the investigation was cancelled.
+
+        Raises:
+            InvestigationCancelledError: If it was
+        """
+        run = self._runs.get(investigation_id)
+        if run is not None and run.cancelled.is_set():
+            raise InvestigationCancelledError(investigation_id, run.reason, run.notify)
+
+    async def guard(
+        self, investigation_id: str, events: AsyncGenerator[Event, None]
+    ) -> AsyncGenerator[Event, None]:
+        """Yield a run's events until it ends or is cancelled.
+
+        Raises:
+            InvestigationCancelledError: Once the run is cancelled (the run
+                itself has been closed by then)
+        """
+        run = self._runs.get(investigation_id)
+        if run is None:
+            async for event in events:
+                yield event
+            return
+
+        # The run is consumed in its own task, so it can be closed mid-await
+        merger = EventMerger()
+        merger.add(events)
+        stream = merger.events()
+        cancelled = asyncio.ensure_future(run.cancelled.wait())
+        next_event: asyncio.Future[Event] | None = None
+        try:
+            while True:
+                next_event = asyncio.ensure_future(anext(stream))
+                await asyncio.wait(
+                    {next_event, cancelled}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not next_event.done():
+                    self.check(investigation_id)
+                try:
+                    event = next_event.result()
+                except StopAsyncIteration:
+                    return
+                self.progress(investigation_id)
+                yield event
+        finally:
+            cancelled.cancel()
+            if next_event is not None and not next_event.done():
+                next_event.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await next_event
+            await stream.aclose()
+
+    # -------------------------------------------------------------------------
+    # Watchdog
+    # -------------------------------------------------------------------------
+
+    def check_stalled(self) -> list[str]:
+        """Cancel runs without progress for ``watchdog_stall_minutes``.
+
+        Returns:
+            IDs of the investigations cancelled
+        """
+        minutes = config.watchdog_stall_minutes
+        if not minutes:
+            return []
+        now = self._clock()
+        stalled = [
+            investigation_id
+            for investigation_id, run in self._runs.items()
+            if not run.cancelled.is_set() and now - run.last_progress >= minutes * 60
+        ]
+        for investigation_id in stalled:
+            self.cancel(
+                investigation_id, f"No progress for {minutes:g} minutes", notify=True
+            )
+        return stalled
+
+    async def _watch(self) -> None:
+        while self._runs:
+            await asyncio.sleep(config.watchdog_check_interval_seconds)
+            self.check_stalled()
+
+    def _start_watchdog(self) -> None:
+        if not config.watchdog_stall_minutes:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._watchdog is None or self._watchdog.done():
+            self._watchdog = loop.create_task(self._watch())
+
+
+# Global investigation cancellation registry
+investigation_cancellations = CancellationRegistry()
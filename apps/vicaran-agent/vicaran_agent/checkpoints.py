@@ -0,0 +1,215 @@
+"""
+Per-stage checkpoints and a persisted-item ledger for resumable investigations.
+
+After every completed pipeline stage, the stage outputs and the accumulators'
+per-item state keys are written to a local SQLite database (WAL mode), keyed
+by ``investigation_id``. A resumed run restores the latest snapshot,
+rehydrates the accumulated lists and skips the stages that already finished.
+
+The ledger records every item written through ``callback_api_tool`` under a
+natural key (source URL, claim text, claim ID, ...), so a stage that crashed
+half-way and runs again returns the stored result instead of writing the
+same source, claim or fact check twice.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, MutableMapping
+from pathlib import Path
+from typing import Any
+
+from .accumulators import _state_items, claims_accumulator, sources_accumulator
+from .config import config
+from .projections import CACHED_CORPUS_FLAG
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stage_checkpoints (
+    investigation_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    state TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    PRIMARY KEY (investigation_id, stage)
+);
+CREATE TABLE IF NOT EXISTS persisted_items (
+    investigation_id TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (investigation_id, item_key)
+);
+"""
+
+# State restored on resume, besides the accumulators' per-item keys
+CHECKPOINT_KEYS = (
+    "investigation_mode",
+    "investigation_config",
+    "investigation_plan",
+    "discovered_sources",
+    "extracted_claims",
+    "fact_check_results",
+    "bias_analysis",
+    "timeline_events",
+    CACHED_CORPUS_FLAG,
+)
+ACCUMULATORS = (sources_accumulator, claims_accumulator)
+
+# Fields identifying an item across retries, per callback type
+_ITEM_IDENTITY: dict[str, tuple[str, ...]] = {
+    "SOURCE_FOUND": ("url",),
+    "CLAIM_EXTRACTED": ("claim_text",),
+    "FACT_CHECKED": ("claim_id",),
+    "BIAS_ANALYZED": ("source_id",),
+    "TIMELINE_EVENT": ("event_date", "event_text"),
+}
+
+
+def item_key(callback_type: str, data: dict[str, Any]) -> str | None:
+    """Natural key of a persisted item, or None for non-item callbacks."""
+    fields = _ITEM_IDENTITY.get(callback_type)
+    if not fields:
+        return None
+    values = [" ".join(str(data.get(name) or "").lower().split()) for name in fields]
+    if not any(values):
+        return None
+    return f"{callback_type}:" + "|".join(value.rstrip("/") for value in values)
+
+
+def checkpoint_state(state: MutableMapping[str, Any]) -> dict[str, Any]:
+    """Snapshot of the state a resumed run needs."""
+    snapshot = {key: state.get(key) for key in CHECKPOINT_KEYS if key in state}
+    prefixes = tuple(f"{accumulator.state_key}#" for accumulator in ACCUMULATORS)
+    for key, value in _state_items(state).items():
+        if key.startswith(prefixes) and value is not None:
+            snapshot[key] = value
+    return snapshot
+
+
+def restore_state(state: MutableMapping[str, Any], snapshot: dict[str, Any]) -> None:
+    """Apply a snapshot and rebuild the accumulated lists from item keys."""
+    for key, value in snapshot.items():
+        state[key] = value
+    for accumulator in ACCUMULATORS:
+        accumulator.rehydrate(state)
+
+
+class CheckpointStore:
+    """SQLite-backed stage checkpoints and persisted-item ledger."""
+
+    def __init__(self, db_path: str, clock: Callable[[], float] = time.time) -> None:
+        self.db_path = db_path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        """Open the checkpoint database lazily (no I/O at import time)."""
+        if self._conn is None:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    # -------------------------------------------------------------------------
+    # Stage checkpoints
+    # -------------------------------------------------------------------------
+
+    def save_stage(
+        self, investigation_id: str, stage: str, snapshot: dict[str, Any]
+    ) -> None:
+        """Record a completed stage with the state at completion."""
+        with self._lock:
+            self._db().execute(
+                "INSERT OR REPLACE INTO stage_checkpoints "
+                "(investigation_id, stage, state, completed_at) VALUES (?, ?, ?, ?)",
+                (investigation_id, stage, json.dumps(snapshot), self._clock()),
+            )
+
+    def completed_stages(self, investigation_id: str) -> list[str]:
+        """Stages that finished, in completion order."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT stage FROM stage_checkpoints WHERE investigation_id = ? "
+                "ORDER BY completed_at, rowid",
+                (investigation_id,),
+            )
+            return [row["stage"] for row in rows]
+
+    def latest_state(self, investigation_id: str) -> dict[str, Any] | None:
+        """Snapshot of the last completed stage.
+
+        State only grows during a run, so the last snapshot contains the
+        outputs of every stage that finished before it.
+        """
+        with self._lock:
+            row = (
+                self._db()
+                .execute(
+                    "SELECT state FROM stage_checkpoints WHERE investigation_id = ? "
+                    "ORDER BY completed_at DESC, rowid DESC LIMIT 1",
+                    (investigation_id,),
+                )
+                .fetchone()
+            )
+        return json.loads(row["state"]) if row else None
+
+    # -------------------------------------------------------------------------
+    # Persisted-item ledger
+    # -------------------------------------------------------------------------
+
+    def persisted(self, investigation_id: str, key: str) -> dict[str, Any] | None:
+        """Result of an earlier write of the same item, if any."""
+        with self._lock:
+            row = (
+                self._db()
+                .execute(
+                    "SELECT result FROM persisted_items "
+                    "WHERE investigation_id = ? AND item_key = ?",
+                    (investigation_id, key),
+                )
+                .fetchone()
+            )
+        return json.loads(row["result"]) if row else None
+
+    def record_persisted(
+        self, investigation_id: str, key: str, result: dict[str, Any]
+    ) -> None:
+        """Remember a successful write (and the IDs it returned)."""
+        with self._lock:
+            self._db().execute(
+                "INSERT OR IGNORE INTO persisted_items "
+                "(investigation_id, item_key, result) VALUES (?, ?, ?)",
+                (investigation_id, key, json.dumps(result)),
+            )
+
+    def clear(self, investigation_id: str) -> None:
+        """Drop checkpoints and ledger once an investigation is complete."""
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "DELETE FROM stage_checkpoints WHERE investigation_id = ?",
+                (investigation_id,),
+            )
+            db.execute(
+                "DELETE FROM persisted_items WHERE investigation_id = ?",
+                (investigation_id,),
+            )
+
+    def close(self) -> None:
+        """Release the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global checkpoint store
+stage_checkpoints = CheckpointStore(config.checkpoint_db_path)
@@ -2,9 +2,9 @@
 Configuration management for the Vicaran investigation agent.
 """
 
-from typing import TypedDict
+from typing import Literal, TypedDict
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -20,6 +20,30 @@ class ValidationResult(TypedDict):
     config: ValidationConfig
 
 
+class ModelPolicy(BaseModel):
+    """Model and generation settings for a stage; unset fields are inherited.
+
+    ``model`` and ``fallback_model`` may name a config field
+    ("default_model", "reasoning_model") instead of a model ID.
+    """
+
+    model: str | None = None
+    fallback_model: str | None = None
+    temperature: float | None = None
+    max_output_tokens: int | None = None
+    # Thinking tokens per call (0 disables thinking where the model allows it)
+    thinking_budget: int | None = None
+
+
+class InvestigationBudget(BaseModel):
+    """Per-investigation limits for one mode (0 = unlimited)."""
+
+    wall_clock_seconds: float = 0
+    max_tokens: int = 0
+    max_model_calls: int = 0
+    max_tool_calls: int = 0
+
+
 class VicearanConfig(BaseSettings):
     """Configuration for the Vicaran investigation agent system."""
 
@@ -43,6 +67,61 @@ class VicearanConfig(BaseSettings):
     )
     agent_secret: str = Field(default="", description="Secret for API authentication")
 
+    # Callback Transport (progress events: sources, claims, fact checks, ...)
+    callback_transport: Literal["http", "stream"] = Field(
+        default="http",
+        description="'http' posts each callback; 'stream' multiplexes per investigation",
+    )
+    callback_stream_url: str = Field(
+        default="",
+        description="Streaming callback endpoint (defaults to CALLBACK_API_URL/stream)",
+    )
+    callback_stream_linger_ms: int = Field(
+        default=25, description="How long a stream waits to group events into a frame"
+    )
+    callback_stream_max_frame_events: int = Field(
+        default=50, description="Max events sent in one stream frame"
+    )
+
+    # Persistence Backend (where sources, claims, fact checks, ... are written)
+    persistence_backend: Literal["callback_api", "database"] = Field(
+        default="callback_api",
+        description="'callback_api' posts to the web app; 'database' writes directly",
+    )
+    database_url: str = Field(
+        default="", description="Database URL used by the 'database' backend"
+    )
+    persistence_pool_size: int = Field(
+        default=5, description="Connection pool size for the 'database' backend"
+    )
+
+    # Callback Outbox (durable delivery of status/summary callbacks)
+    outbox_db_path: str = Field(
+        default=".vicaran/callback_outbox.db",
+        description="SQLite file backing the callback outbox",
+    )
+    outbox_batch_size: int = Field(
+        default=20, description="Max outbox events delivered per sender cycle"
+    )
+    outbox_max_attempts: int = Field(
+        default=8, description="Delivery attempts before an event is dead-lettered"
+    )
+    outbox_base_backoff_seconds: float = Field(
+        default=1.0, description="Base delay for jittered exponential backoff"
+    )
+    outbox_max_backoff_seconds: float = Field(
+        default=60.0, description="Upper bound for a single retry delay"
+    )
+
+    # Stage Checkpoints (resume failed investigations without redoing work)
+    checkpoints_enabled: bool = Field(
+        default=True, description="Checkpoint state after every completed stage"
+    )
+    checkpoint_db_path: str = Field(
+        default=".vicaran/checkpoints.db",
+        description="SQLite file holding stage checkpoints and persisted items",
+    )
+
     # Agent Configuration
     agent_name: str = Field(default="vicaran_agent", description="Agent name")
     default_model: str = Field(
@@ -52,6 +131,223 @@ class VicearanConfig(BaseSettings):
         default="gemini-3-pro-preview", description="Model for complex reasoning tasks"
     )
 
+    # Model Routing (per-stage model, generation settings and thinking budget)
+    fallback_model: str = Field(
+        default="gemini-2.5-pro",
+        description="Model a call is retried on once when its model is overloaded",
+    )
+    model_policies: dict[str, ModelPolicy] = Field(
+        default_factory=lambda: {
+            # Verdicts need the strongest reasoning available
+            "fact_checker": ModelPolicy(model="reasoning_model"),
+            # Bias scoring, page summaries and timeline extraction are
+            # structured extraction
+            "bias_analyzer": ModelPolicy(
+                model="gemini-2.5-flash",
+                fallback_model="gemini-2.5-flash-lite",
+                temperature=0.2,
+                thinking_budget=1024,
+            ),
+            "bias_analyzer:quick": ModelPolicy(thinking_budget=0),
+            "source_summarizer": ModelPolicy(
+                model="gemini-2.5-flash",
+                fallback_model="gemini-2.5-flash-lite",
+                temperature=0.2,
+                thinking_budget=512,
+            ),
+            "timeline_builder": ModelPolicy(
+                model="gemini-2.5-flash",
+                fallback_model="gemini-2.5-flash-lite",
+                temperature=0.1,
+                thinking_budget=1024,
+            ),
+            # One call does the whole quick analysis: keep it fast
+            "quick_analyzer": ModelPolicy(
+                model="gemini-2.5-flash", temperature=0.2, thinking_budget=2048
+            ),
+        },
+        description="Policy per stage ('stage') and per stage and mode ('stage:mode')",
+    )
+
+    # Model Rate Limiting (shared by all sessions in the process)
+    model_requests_per_minute: int = Field(
+        default=60, description="Model requests allowed per minute (0 = unlimited)"
+    )
+    model_tokens_per_minute: int = Field(
+        default=1000000,
+        description="Estimated input tokens allowed per minute (0 = unlimited)",
+    )
+    rate_limit_base_backoff_seconds: float = Field(
+        default=2.0, description="First backoff after a 429 without retry delay"
+    )
+    rate_limit_max_backoff_seconds: float = Field(
+        default=60.0, description="Upper bound for a single 429 backoff"
+    )
+
+    # Prompt Projections (token budgets for accumulated sources/claims per agent)
+    projection_token_budgets: dict[str, int] = Field(
+        default_factory=lambda: {
+            "claim_extractor": 6000,
+            "claim_reconciler": 6000,
+            "fact_checker": 6000,
+            "bias_analyzer": 4000,
+            "timeline_builder": 4000,
+            "summary_writer": 3000,
+            "quick_analyzer": 8000,
+        },
+        description="Estimated-token budget for state projections, per agent",
+    )
+    default_projection_token_budget: int = Field(
+        default=4000, description="Projection budget for agents not listed above"
+    )
+    quick_projection_budget_scale: float = Field(
+        default=0.5, description="Projection budget multiplier in quick mode"
+    )
+
+    # Prompt Budgets (estimated tokens per model request, enforced pre-call)
+    prompt_token_budgets: dict[str, int] = Field(
+        default_factory=lambda: {"summary_writer": 48000},
+        description="Per-agent prompt budget in estimated tokens",
+    )
+    default_prompt_token_budget: int = Field(
+        default=100000, description="Prompt budget for agents not listed above"
+    )
+    prompt_trim_policy: list[Literal["tool_outputs", "source_summaries"]] = Field(
+        default_factory=lambda: ["tool_outputs", "source_summaries"],
+        description="Trimming steps applied in order until a request fits",
+    )
+
+    # Context Caching (shared source/claim corpus for downstream agents)
+    context_cache_enabled: bool = Field(
+        default=True, description="Serve the corpus from a Gemini context cache"
+    )
+    context_cache_ttl_seconds: int = Field(
+        default=600, description="TTL of each cached-content entry"
+    )
+    context_cache_refresh_margin_seconds: int = Field(
+        default=120, description="Extend the TTL when less than this remains"
+    )
+    context_cache_min_tokens: int = Field(
+        default=2048, description="Smaller corpora are sent inline instead"
+    )
+
+    # Source Discovery (who drives search → fetch → summarize → save)
+    source_discovery: Literal["agent", "code"] = Field(
+        default="agent",
+        description="'agent' lets source_finder call the tools; 'code' searches, "
+        "fetches and saves in Python and only asks the model to summarize",
+    )
+    source_discovery_max_queries: int = Field(
+        default=4, description="Search queries derived from the title and plan"
+    )
+    source_discovery_results_per_query: int = Field(
+        default=10, description="Search results requested per query"
+    )
+    source_discovery_overfetch: float = Field(
+        default=1.5,
+        description="Pages fetched per source slot (blocked pages are replaced)",
+    )
+    source_discovery_fetch_concurrency: int = Field(
+        default=8, description="Pages fetched at the same time"
+    )
+    source_summary_batch_tokens: int = Field(
+        default=12000,
+        description="Estimated page tokens per batch summarization call "
+        "(capped by the summarizer's prompt budget)",
+    )
+    source_summary_batch_max_pages: int = Field(
+        default=6, description="Pages per batch summarization call (1 disables)"
+    )
+    source_discovery_summarize_concurrency: int = Field(
+        default=4, description="Upper bound on concurrent summarization calls"
+    )
+
+    # Streaming Hand-Off (claim extraction overlaps source finding)
+    streaming_handoff_enabled: bool = Field(
+        default=False,
+        description="Extract claims in micro-batches while sources are still found",
+    )
+    streaming_handoff_batch_size: int = Field(
+        default=3, description="Saved sources per claim-extraction micro-batch"
+    )
+    streaming_handoff_max_concurrency: int = Field(
+        default=2, description="Upper bound on concurrently running micro-batches"
+    )
+
+    # Fact-Check Fan-Out (claims split into shards checked concurrently)
+    fact_check_fanout_enabled: bool = Field(
+        default=True, description="Check claim shards in parallel sub-invocations"
+    )
+    fact_check_shard_size: int = Field(
+        default=5, description="Claims per fact-check shard"
+    )
+    fact_check_max_concurrency: int = Field(
+        default=3, description="Upper bound on concurrently running shards"
+    )
+
+    # Quick-Mode Fast Path (one structured call after source discovery)
+    quick_fast_path_enabled: bool = Field(
+        default=True,
+        description="Replace quick mode's claim, fact-check, bias and summary "
+        "stages with one quick_analyzer call",
+    )
+
+    # Summary Streaming (partial SUMMARY_UPDATED callbacks while writing)
+    stream_summary_updates: bool = Field(
+        default=True, description="Publish summary sections as they are generated"
+    )
+    summary_stream_interval_seconds: float = Field(
+        default=2.0, description="Minimum seconds between partial summary updates"
+    )
+
+    # Investigation Budgets (per-mode limits and graceful degradation)
+    budget_enabled: bool = Field(
+        default=True, description="Track and enforce per-investigation budgets"
+    )
+    investigation_budgets: dict[str, InvestigationBudget] = Field(
+        default_factory=lambda: {
+            # Matches the plan's "Estimated Time" (10-20 minutes)
+            "quick": InvestigationBudget(
+                wall_clock_seconds=600,
+                max_tokens=1500000,
+                max_model_calls=60,
+                max_tool_calls=100,
+            ),
+            "detailed": InvestigationBudget(
+                wall_clock_seconds=1200,
+                max_tokens=5000000,
+                max_model_calls=200,
+                max_tool_calls=300,
+            ),
+        },
+        description="Budget per investigation mode",
+    )
+    budget_step_thresholds: dict[str, float] = Field(
+        default_factory=lambda: {
+            "fewer_sources": 0.5,
+            "skip_timeline": 0.7,
+            "top_claims": 0.85,
+            "summary_only": 1.0,
+        },
+        description="Fraction of the budget used at which each step starts",
+    )
+    budget_reduced_source_fraction: float = Field(
+        default=0.5, description="Share of the source limit kept by fewer_sources"
+    )
+    budget_top_claims: int = Field(
+        default=5, description="Most important claims fact-checked by top_claims"
+    )
+
+    # Cancellation Watchdog (ends investigations that stop making progress)
+    watchdog_stall_minutes: float = Field(
+        default=10.0,
+        description="Cancel an investigation after this long without progress: "
+        "pipeline events, model calls or tool calls (0 disables the watchdog)",
+    )
+    watchdog_check_interval_seconds: float = Field(
+        default=15.0, description="How often the watchdog looks for stalled runs"
+    )
+
     # Investigation Limits
     quick_mode_source_limit: int = Field(
         default=15, description="Max sources in Quick mode"
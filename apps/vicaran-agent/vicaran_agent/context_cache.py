@@ -0,0 +1,309 @@
+"""
+Explicit Gemini context caching for the shared investigation corpus.
+
+Once source_finder and claim_extractor have finished, the accumulated
+sources and claims (the investigation "corpus") no longer change. Instead of
+re-sending them as fresh input tokens on every downstream model call, the
+corpus is placed in a Gemini cached-content entry and later requests point
+at it via ``cached_content``.
+
+Gemini rejects requests that combine ``cached_content`` with their own
+``system_instruction``/``tools``, so each downstream agent gets its own entry
+holding the corpus plus that agent's instruction and tool declarations.
+Entries are created lazily on the agent's first model call, their TTL is
+refreshed while the pipeline runs, and all of an investigation's entries
+are deleted when the summary is written, or when the run ends in any other
+way (``ModeRouterAgent`` releases them). Whenever caching is unavailable
+(disabled, corpus too small, API error) requests fall back to carrying the
+corpus inline.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from google import genai
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+
+from .accumulators import claims_accumulator, sources_accumulator
+from .config import config
+from .projections import CACHED_CORPUS_FLAG, encode_items, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Every field downstream agents may need (the union of their projections)
+CORPUS_SOURCE_FIELDS = (
+    "source_id",
+    "title",
+    "url",
+    "credibility_score",
+    "summary",
+    "key_claims",
+)
+CORPUS_CLAIM_FIELDS = ("claim_id", "claim_text", "source_ids", "importance_score")
+
+
+def build_corpus(state: Any) -> str:
+    """Render accumulated sources and claims as one corpus document."""
+    sources = encode_items(sources_accumulator.items(state), CORPUS_SOURCE_FIELDS)
+    claims = encode_items(claims_accumulator.items(state), CORPUS_CLAIM_FIELDS)
+    return (
+        "INVESTIGATION CORPUS\n\n"
+        f"Accumulated Sources:\n{sources}\n\n"
+        f"Accumulated Claims:\n{claims}"
+    )
+
+
+@dataclass
+class _CacheEntry:
+    name: str
+    fingerprint: str
+    expires_at: float
+    # What the entry holds besides the corpus, to rebuild an inline request
+    system_instruction: Any = None
+    tools: Any = None
+    tool_config: Any = None
+
+
+class ContextCacheManager:
+    """Creates, reuses, refreshes and deletes per-investigation caches."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        ttl_seconds: int = 600,
+        refresh_margin_seconds: int = 120,
+        min_tokens: int = 2048,
+        client_factory: Callable[[], Any] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.min_tokens = min_tokens
+        self._client_factory = client_factory or genai.Client
+        self._client: Any = None
+        self._clock = clock
+        self._corpora: dict[str, str] = {}
+        self._entries: dict[str, dict[str, _CacheEntry]] = {}
+        # Investigations where the cache API failed; they stay inline
+        self._unavailable: set[str] = set()
+        # (investigation_id, agent_name) → lock serializing entry creation
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+    def _caches(self) -> Any:
+        if self._client is None:
+            self._client = self._client_factory()
+        return self._client.aio.caches
+
+    # -------------------------------------------------------------------------
+    # Pipeline hooks
+    # -------------------------------------------------------------------------
+
+    def prepare_corpus(self, callback_context: CallbackContext) -> None:
+        """Snapshot the corpus once claim extraction has finished.
+
+        Sets the state flag that makes downstream instructions reference the
+        cached corpus instead of embedding their own projections.
+        """
+        state = callback_context.state
+        investigation_id = state.get("investigation_id", "")
+        state[CACHED_CORPUS_FLAG] = False
+        if not self.enabled or not investigation_id:
+            return
+
+        corpus = build_corpus(state)
+        tokens = estimate_tokens(corpus)
+        if tokens < self.min_tokens:
+            # Gemini refuses to cache small contents; projections are cheaper
+            if config.debug_mode:
+                print(
+                    f"\n🗄️ CONTEXT CACHE: corpus too small to cache ({tokens} tokens)"
+                )
+            return
+
+        self._corpora[investigation_id] = corpus
+        self._unavailable.discard(investigation_id)
+        state[CACHED_CORPUS_FLAG] = True
+        if config.debug_mode:
+            print(f"\n🗄️ CONTEXT CACHE: corpus ready ({tokens} tokens)")
+
+    async def apply(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> None:
+        """Point a downstream model request at the cached corpus.
+
+        Falls back to prepending the corpus to the request contents when the
+        cache cannot be used, so the model always sees it exactly once.
+        """
+        state = callback_context.state
+        if not state.get(CACHED_CORPUS_FLAG):
+            return
+
+        investigation_id = state.get("investigation_id", "")
+        corpus = self._corpora.get(investigation_id)
+        if corpus is None:
+            # Process restarted since the corpus was prepared
+            corpus = self._corpora[investigation_id] = build_corpus(state)
+
+        agent_name = callback_context.agent_name
+        if investigation_id not in self._unavailable:
+            try:
+                entry = await self._ensure_entry(
+                    investigation_id, agent_name, corpus, llm_request
+                )
+            except Exception as e:
+                self._unavailable.add(investigation_id)
+                logger.warning("[ContextCache] disabled for %s: %s", agent_name, e)
+                if config.debug_mode:
+                    print(f"\n⚠️ CONTEXT CACHE unavailable, sending inline: {e}")
+            else:
+                llm_request.config.cached_content = entry.name
+                # Both live in the cache entry; Gemini rejects duplicates
+                llm_request.config.system_instruction = None
+                llm_request.config.tools = None
+                llm_request.config.tool_config = None
+                return
+
+        llm_request.contents.insert(
+            0, types.Content(role="user", parts=[types.Part(text=corpus)])
+        )
+
+    def inline_request(
+        self, investigation_id: str, llm_request: LlmRequest
+    ) -> LlmRequest | None:
+        """Copy of a cached request carrying its instruction, tools and corpus.
+
+        Cache entries belong to the model they were created for, so a request
+        sent to another model (overload fallback) must not reference one.
+        Returns None if the entry is no longer known.
+        """
+        name = llm_request.config.cached_content
+        corpus = self._corpora.get(investigation_id)
+        entry = next(
+            (
+                entry
+                for entry in self._entries.get(investigation_id, {}).values()
+                if entry.name == name
+            ),
+            None,
+        )
+        if entry is None or corpus is None:
+            return None
+        request = llm_request.model_copy(deep=True)
+        request.config.cached_content = None
+        request.config.system_instruction = entry.system_instruction
+        request.config.tools = entry.tools
+        request.config.tool_config = entry.tool_config
+        request.contents.insert(
+            0, types.Content(role="user", parts=[types.Part(text=corpus)])
+        )
+        return request
+
+    async def release(self, callback_context: CallbackContext) -> None:
+        """Delete every cache entry of the investigation."""
+        await self.release_investigation(
+            callback_context.state.get("investigation_id", "")
+        )
+
+    async def release_investigation(self, investigation_id: str) -> None:
+        """Delete cache entries and forget the corpus of an investigation."""
+        self._corpora.pop(investigation_id, None)
+        self._unavailable.discard(investigation_id)
+        for key in [k for k in self._locks if k[0] == investigation_id]:
+            del self._locks[key]
+        for entry in self._entries.pop(investigation_id, {}).values():
+            await self._delete(entry.name)
+
+    # -------------------------------------------------------------------------
+    # Cache entries
+    # -------------------------------------------------------------------------
+
+    async def _ensure_entry(
+        self,
+        investigation_id: str,
+        agent_name: str,
+        corpus: str,
+        llm_request: LlmRequest,
+    ) -> _CacheEntry:
+        # Concurrent calls (shards, batches) must not create duplicate caches
+        lock = self._locks.setdefault((investigation_id, agent_name), asyncio.Lock())
+        async with lock:
+            request_config = llm_request.config
+            fingerprint = _fingerprint(llm_request)
+            entries = self._entries.setdefault(investigation_id, {})
+            entry = entries.get(agent_name)
+
+            if entry is not None and entry.fingerprint != fingerprint:
+                # Instruction or tools changed: the old entry is stale
+                await self._delete(entry.name)
+                entry = None
+
+            now = self._clock()
+            if entry is None:
+                cached = await self._caches().create(
+                    model=llm_request.model,
+                    config=types.CreateCachedContentConfig(
+                        display_name=f"vicaran-{investigation_id[:8]}-{agent_name}",
+                        contents=[
+                            types.Content(role="user", parts=[types.Part(text=corpus)])
+                        ],
+                        system_instruction=request_config.system_instruction,
+                        tools=request_config.tools,
+                        tool_config=request_config.tool_config,
+                        ttl=f"{self.ttl_seconds}s",
+                    ),
+                )
+                entry = _CacheEntry(
+                    cached.name,
+                    fingerprint,
+                    now + self.ttl_seconds,
+                    request_config.system_instruction,
+                    request_config.tools,
+                    request_config.tool_config,
+                )
+                entries[agent_name] = entry
+                logger.info("[ContextCache] created %s for %s", entry.name, agent_name)
+                if config.debug_mode:
+                    print(f"\n🗄️ CONTEXT CACHE: created {entry.name} for {agent_name}")
+            elif entry.expires_at - now < self.refresh_margin_seconds:
+                await self._caches().update(
+                    name=entry.name,
+                    config=types.UpdateCachedContentConfig(ttl=f"{self.ttl_seconds}s"),
+                )
+                entry.expires_at = now + self.ttl_seconds
+            return entry
+
+    async def _delete(self, name: str) -> None:
+        try:
+            await self._caches().delete(name=name)
+        except Exception as e:
+            # The TTL reclaims it anyway
+            logger.warning("[ContextCache] failed to delete %s: %s", name, e)
+
+
+def _fingerprint(llm_request: LlmRequest) -> str:
+    """Identify the model, instruction and tools an entry was created for."""
+    request_config = llm_request.config
+    digest = hashlib.sha256()
+    digest.update((llm_request.model or "").encode())
+    digest.update(str(request_config.system_instruction or "").encode())
+    for tool in request_config.tools or []:
+        dump = getattr(tool, "model_dump_json", None)
+        digest.update((dump() if callable(dump) else repr(tool)).encode())
+    return digest.hexdigest()
+
+
+# Global context cache manager
+context_cache = ContextCacheManager(
+    enabled=config.context_cache_enabled,
+    ttl_seconds=config.context_cache_ttl_seconds,
+    refresh_margin_seconds=config.context_cache_refresh_margin_seconds,
+    min_tokens=config.context_cache_min_tokens,
+)
@@ -0,0 +1,88 @@
+"""
+Interleave events from concurrently running agent runs.
+
+Each run hands over one event at a time and waits until the consumer asks
+for the next one, so the runner has applied every event (and its state
+delta) before the producing agent continues - the same handshake
+ParallelAgent uses. Unlike ParallelAgent, runs can be added while merging.
+"""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator, Callable
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+
+
+def branch_context(ctx: InvocationContext, name: str) -> InvocationContext:
+    """Copy of ``ctx`` on a child branch, isolating the run's conversation."""
+    branch = f"{ctx.branch}.{name}" if ctx.branch else name
+    return ctx.model_copy(update={"branch": branch})
+
+
+def final_text(event: Event) -> str:
+    """Concatenated text parts of an event."""
+    if not event.content:
+        return ""
+    return "".join(part.text or "" for part in event.content.parts or [])
+
+
+class EventMerger:
+    """Merges events from agent runs started now or while merging."""
+
+    def __init__(self) -> None:
+        # (event, resume signal) or (None, (on_finish, error)) when a run ends
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: list[asyncio.Task[None]] = []
+        self._running = 0
+
+    def add(
+        self,
+        events: AsyncGenerator[Event, None],
+        semaphore: asyncio.Semaphore | None = None,
+        on_finish: Callable[[], None] | None = None,
+    ) -> None:
+        """Start consuming a run; ``on_finish`` may add further runs."""
+        self._running += 1
+        self._tasks.append(
+            asyncio.create_task(self._pump(events, semaphore, on_finish))
+        )
+
+    async def _pump(
+        self,
+        events: AsyncGenerator[Event, None],
+        semaphore: asyncio.Semaphore | None,
+        on_finish: Callable[[], None] | None,
+    ) -> None:
+        error: Exception | None = None
+        try:
+            async with semaphore or contextlib.nullcontext():
+                async with contextlib.aclosing(events):
+                    async for event in events:
+                        resume = asyncio.Event()
+                        await self._queue.put((event, resume))
+                        await resume.wait()
+        except Exception as e:
+            error = e
+        finally:
+            await self._queue.put((None, (on_finish, error)))
+
+    async def events(self) -> AsyncGenerator[Event, None]:
+        """Yield events until every run (including added ones) has finished."""
+        try:
+            while self._running:
+                event, payload = await self._queue.get()
+                if event is None:
+                    self._running -= 1
+                    on_finish, error = payload
+                    if error is not None:
+                        raise error
+                    if on_finish is not None:
+                        on_finish()
+                    continue
+                yield event
+                payload.set()
+        finally:
+            for task in self._tasks:
+                task.cancel()
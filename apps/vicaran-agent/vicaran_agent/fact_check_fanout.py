@@ -0,0 +1,143 @@
+"""
+Fan-out fact checking across claim shards.
+
+Instead of one long serial conversation over every accumulated claim, the
+claims are split into shards of ``fact_check_shard_size``. Each shard is
+checked by its own clone of the fact checker, on its own branch, with only
+that shard's claims in the prompt. Shards run concurrently up to a cap
+derived from the model rate limiter's current headroom, and their verdict
+lists are concatenated into ``fact_check_results`` for the stage's
+after-agent hook to persist. Once the investigation budget reaches
+``top_claims``, only the most important claims are checked.
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from .accumulators import claims_accumulator
+from .budget import investigation_budget
+from .callbacks import use_context_cache
+from .config import config
+from .event_merge import EventMerger, branch_context, final_text
+from .models import FactCheck
+from .projections import CACHED_CORPUS_FLAG, projected_instruction
+from .rate_limiter import model_rate_limiter
+from .structured_outputs import merge_outputs
+
+
+def shard_items(items: list[dict[str, Any]], shard_size: int) -> list[list[dict]]:
+    """Split items into consecutive shards of at most ``shard_size``."""
+    size = max(1, shard_size)
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def top_claims(claims: list[dict[str, Any]], limit: int) -> list[dict[str, Any]]:
+    """The ``limit`` most important claims, in their original order."""
+    ranked = sorted(
+        range(len(claims)),
+        key=lambda index: claims[index].get("importance_score") or 0,
+        reverse=True,
+    )
+    return [claims[index] for index in sorted(ranked[:limit])]
+
+
+def merge_fact_check_outputs(outputs: list[str]) -> list[dict[str, Any]]:
+    """Concatenate the shards' verdict lists, dropping invalid records."""
+    return merge_outputs(outputs, FactCheck)
+
+
+class FactCheckFanOutAgent(BaseAgent):
+    """Runs the fact checker once per claim shard, with bounded concurrency."""
+
+    checker: LlmAgent
+    template: str
+    budget_scale: float = 1.0
+    output_key: str = "fact_check_results"
+    shard_size: int = 5
+    max_concurrency: int = 3
+
+    def _shard_agent(self, shard: list[dict[str, Any]]) -> LlmAgent:
+        overrides = {
+            claims_accumulator.state_key: shard,
+            claims_accumulator.current_key: True,
+            CACHED_CORPUS_FLAG: False,
+        }
+        # The cached corpus holds every claim, so shards send their own inline
+        before_model = [
+            callback
+            for callback in self.checker.canonical_before_model_callbacks
+            if callback is not use_context_cache
+        ]
+        return self.checker.clone(
+            update={
+                "instruction": projected_instruction(
+                    self.template, self.checker.name, self.budget_scale, overrides
+                ),
+                "before_model_callback": before_model,
+                # Shards report back to this agent, which writes the merged result
+                "output_key": None,
+            }
+        )
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        claims = claims_accumulator.items(state)
+        # Near the deadline only the most important claims are checked
+        claim_limit = investigation_budget.claim_limit(
+            state.get("investigation_id", "")
+        )
+        trimmed = claim_limit is not None and len(claims) > claim_limit
+        if trimmed:
+            if config.debug_mode:
+                print(
+                    f"\n⏳ FACT CHECK: top {claim_limit} of {len(claims)} claims "
+                    "(budget)"
+                )
+            claims = top_claims(claims, claim_limit)
+        shards = shard_items(claims, self.shard_size)
+        # A single shard runs the checker as is, unless claims were left out
+        if len(shards) <= 1 and not trimmed:
+            async for event in self.checker.run_async(ctx):
+                yield event
+            return
+
+        limit = model_rate_limiter.concurrency_limit(self.max_concurrency)
+        if config.debug_mode:
+            print(
+                f"\n🔀 FACT CHECK FAN-OUT: {len(claims)} claims in {len(shards)} "
+                f"shards, {limit} at a time"
+            )
+
+        merger = EventMerger()
+        semaphore = asyncio.Semaphore(limit)
+        branches: dict[str, int] = {}
+        for index, shard in enumerate(shards):
+            shard_ctx = branch_context(ctx, f"{self.name}.shard_{index}")
+            branches[shard_ctx.branch] = index
+            merger.add(self._shard_agent(shard).run_async(shard_ctx), semaphore)
+
+        outputs = [""] * len(shards)
+        async for event in merger.events():
+            if event.branch in branches and event.is_final_response():
+                outputs[branches[event.branch]] = final_text(event)
+            yield event
+
+        merged = merge_fact_check_outputs(outputs)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(
+                role="model", parts=[types.Part(text=json.dumps(merged))]
+            ),
+            actions=EventActions(state_delta={self.output_key: merged}),
+        )
@@ -0,0 +1,92 @@
+"""
+Compaction of already-processed tool outputs in the request history.
+
+The source finder fetches up to 5000 characters of page text per source with
+jina_reader_tool. Once a source has been saved, that text is never needed
+again, yet every later turn would re-send it. Before each model call the
+saved sources' tool responses are replaced with compact stubs (URL,
+reachability, saved source_id). Session events are left untouched; only the
+outgoing request is rewritten.
+"""
+
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+# Tools whose responses carry bulky page content keyed by URL
+COMPACTABLE_TOOLS = {"jina_reader_tool"}
+
+
+def _content_chars(contents: list[types.Content]) -> int:
+    return sum(len(content.model_dump_json(exclude_none=True)) for content in contents)
+
+
+def _stub(response: dict[str, Any], source_id: str) -> dict[str, Any]:
+    return {
+        "url": response.get("url", ""),
+        "is_reachable": response.get("is_reachable", False),
+        "source_id": source_id,
+        "compacted": True,
+    }
+
+
+def compact_tool_outputs(
+    llm_request: LlmRequest,
+    saved_sources: dict[str, str],
+    url_key: Callable[[str], str] = str,
+) -> tuple[int, int]:
+    """Replace tool responses for saved sources with compact stubs.
+
+    Args:
+        llm_request: Outgoing model request (its contents are rewritten)
+        saved_sources: Mapping of URL (as returned by url_key) → saved source_id
+        url_key: Normalizes tool response URLs before the lookup
+
+    Returns:
+        Request history size in characters before and after compaction
+    """
+    before = _content_chars(llm_request.contents)
+    if not saved_sources:
+        return before, before
+
+    for index, content in enumerate(llm_request.contents):
+        parts = content.parts or []
+        compacted_parts = []
+        changed = False
+        for part in parts:
+            function_response = part.function_response
+            response = function_response.response if function_response else None
+            source_id = (
+                saved_sources.get(url_key(response.get("url", "")))
+                if isinstance(response, dict)
+                and function_response.name in COMPACTABLE_TOOLS
+                and not response.get("compacted")
+                else None
+            )
+            if source_id is None:
+                compacted_parts.append(part)
+                continue
+            compacted_parts.append(
+                types.Part(
+                    function_response=types.FunctionResponse(
+                        id=function_response.id,
+                        name=function_response.name,
+                        response=_stub(response, source_id),
+                    )
+                )
+            )
+            changed = True
+        if changed:
+            # Copy instead of mutating the Content shared with session events
+            llm_request.contents[index] = content.model_copy(
+                update={"parts": compacted_parts}
+            )
+
+    after = _content_chars(llm_request.contents)
+    logger.info("[Compaction] request history: %d → %d chars", before, after)
+    return before, after
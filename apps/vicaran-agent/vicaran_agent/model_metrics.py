@@ -0,0 +1,124 @@
+"""
+Per-stage model latency and token usage.
+
+Times every model call from the moment it clears the rate limiter until its
+final response, and accumulates prompt, output and thinking tokens per stage
+and model, so the routing policies in ``config.model_policies`` can be tuned
+from data. Calls that fail without a response are counted as errors.
+"""
+
+import logging
+import time
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StageModelUsage:
+    """Cumulative latency and token counts for one stage on one model."""
+
+    calls: int = 0
+    errors: int = 0
+    fallbacks: int = 0
+    latency_seconds: float = 0.0
+    max_latency_seconds: float = 0.0
+    timed_calls: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    thinking_tokens: int = 0
+
+    @property
+    def avg_latency_seconds(self) -> float:
+        return self.latency_seconds / self.timed_calls if self.timed_calls else 0.0
+
+
+class ModelCallMetrics:
+    """Accumulates model call latency and token usage per stage and model."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._usage: dict[tuple[str, str], StageModelUsage] = {}
+        self._started: dict[Hashable, float] = {}
+
+    def start(self, call_key: Hashable) -> None:
+        """Mark the start of a model call (after rate limiting)."""
+        self._started[call_key] = self._clock()
+
+    def record(
+        self, stage: str, model: str, usage_metadata: Any, call_key: Hashable = None
+    ) -> float | None:
+        """Record one final response.
+
+        Returns:
+            The call's latency in seconds, or None if it was not started
+        """
+        started = self._started.pop(call_key, None)
+        latency = self._clock() - started if started is not None else None
+
+        usage = self._usage.setdefault((stage, model), StageModelUsage())
+        usage.calls += 1
+        usage.prompt_tokens += getattr(usage_metadata, "prompt_token_count", None) or 0
+        usage.output_tokens += (
+            getattr(usage_metadata, "candidates_token_count", None) or 0
+        )
+        usage.thinking_tokens += (
+            getattr(usage_metadata, "thoughts_token_count", None) or 0
+        )
+        if latency is not None:
+            usage.timed_calls += 1
+            usage.latency_seconds += latency
+            usage.max_latency_seconds = max(usage.max_latency_seconds, latency)
+
+        logger.info(
+            "[ModelCall] %s on %s: %s, cumulative %d prompt / %d output / "
+            "%d thinking tokens",
+            stage,
+            model,
+            f"{latency:.2f}s" if latency is not None else "untimed",
+            usage.prompt_tokens,
+            usage.output_tokens,
+            usage.thinking_tokens,
+        )
+        return latency
+
+    def record_error(self, stage: str, model: str, call_key: Hashable = None) -> None:
+        """Record a call that failed without a response."""
+        self._started.pop(call_key, None)
+        self._usage.setdefault((stage, model), StageModelUsage()).errors += 1
+        logger.info("[ModelCall] %s on %s: failed", stage, model)
+
+    def record_fallback(self, stage: str, model: str) -> None:
+        """Count a call retried on its fallback model."""
+        self._usage.setdefault((stage, model), StageModelUsage()).fallbacks += 1
+
+    def report(self) -> dict[str, dict[str, float]]:
+        """Cumulative usage per "stage/model" (calls, latency and tokens)."""
+        return {
+            f"{stage}/{model}": {
+                "calls": usage.calls,
+                "errors": usage.errors,
+                "error_rate": (
+                    round(usage.errors / (usage.calls + usage.errors), 3)
+                    if usage.calls + usage.errors
+                    else 0.0
+                ),
+                "fallbacks": usage.fallbacks,
+                "avg_latency_seconds": round(usage.avg_latency_seconds, 3),
+                "max_latency_seconds": round(usage.max_latency_seconds, 3),
+                "prompt_tokens": usage.prompt_tokens,
+                "output_tokens": usage.output_tokens,
+                "thinking_tokens": usage.thinking_tokens,
+            }
+            for (stage, model), usage in self._usage.items()
+        }
+
+    def reset(self) -> None:
+        self._usage.clear()
+        self._started.clear()
+
+
+# Global model call metrics
+model_call_metrics = ModelCallMetrics()
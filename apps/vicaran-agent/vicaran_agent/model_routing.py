@@ -0,0 +1,78 @@
+"""
+Per-stage model routing and overload fallback.
+
+Resolves the model, generation settings and thinking budget a stage runs
+with from ``config.model_policies``: the base policy (``default_model``,
+``fallback_model``) is overlaid with the ``"<stage>"`` entry, then with the
+``"<stage>:<mode>"`` entry. Pipelines apply the resolved settings once when
+they are built; a call that fails because its model is overloaded is sent
+once more to the policy's fallback model, with any context cache reference
+replaced by the inline instruction, tools and corpus.
+"""
+
+from typing import Any
+
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.adk.planners import BuiltInPlanner
+from google.genai import types
+
+from .config import ModelPolicy, config
+
+# Policy model names that refer to a config field instead of a model ID
+_MODEL_ALIASES = ("default_model", "reasoning_model")
+
+
+def resolve_model_policy(stage: str, mode: str | None = None) -> ModelPolicy:
+    """Effective policy for a stage, optionally specialised for a mode."""
+    merged: dict[str, Any] = {
+        "model": config.default_model,
+        "fallback_model": config.fallback_model,
+    }
+    keys = [stage, f"{stage}:{mode}"] if mode else [stage]
+    for key in keys:
+        policy = config.model_policies.get(key)
+        if policy is not None:
+            merged.update(policy.model_dump(exclude_none=True))
+    for name in ("model", "fallback_model"):
+        if merged[name] in _MODEL_ALIASES:
+            merged[name] = getattr(config, merged[name])
+    return ModelPolicy(**merged)
+
+
+def model_settings(
+    policy: ModelPolicy, base: types.GenerateContentConfig | None = None
+) -> dict[str, Any]:
+    """LlmAgent fields applying a policy (keeps other ``base`` settings)."""
+    settings: dict[str, Any] = {"model": policy.model}
+    generation = {
+        name: value
+        for name in ("temperature", "max_output_tokens")
+        if (value := getattr(policy, name)) is not None
+    }
+    if generation:
+        settings["generate_content_config"] = (
+            base or types.GenerateContentConfig()
+        ).model_copy(update=generation)
+    if policy.thinking_budget is not None:
+        settings["planner"] = BuiltInPlanner(
+            thinking_config=types.ThinkingConfig(thinking_budget=policy.thinking_budget)
+        )
+    return settings
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Whether a model error is a 503 / model-overloaded signal."""
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return code == 503 or "UNAVAILABLE" in str(error) or "overloaded" in str(error)
+
+
+async def resend_model_call(llm_request: LlmRequest, model: str) -> LlmResponse | None:
+    """Send a failed request once more, to ``model`` (non-streaming)."""
+    llm_request.model = model
+    llm = LLMRegistry.new_llm(model)
+    final = None
+    async for response in llm.generate_content_async(llm_request, stream=False):
+        final = response
+    return final
@@ -65,6 +65,26 @@ class Source(BaseModel):
     source_id: str | None = Field(default=None, description="Database ID after save")
 
 
+class SourceBatch(BaseModel):
+    """Several fetched pages assessed in one structured-output call."""
+
+    sources: list[Source] = Field(
+        default_factory=list, description="One record per page, in page order"
+    )
+
+
+class SourceAssessment(BaseModel):
+    """Model-written assessment of one fetched page (code-driven discovery)."""
+
+    summary: str = Field(..., description="2-3 sentence summary (max 500 chars)")
+    credibility_score: int = Field(
+        default=3, ge=1, le=5, description="Credibility score (1-5 stars)"
+    )
+    key_claims: list[str] = Field(
+        default_factory=list, description="1-3 verifiable claims from the page"
+    )
+
+
 # =============================================================================
 # CLAIM MODELS
 # =============================================================================
@@ -116,6 +136,50 @@ class BiasAnalysis(BaseModel):
     bias_id: str | None = Field(default=None, description="Database ID after save")
 
 
+class SourceBias(BaseModel):
+    """Bias score of one source (quick-mode fast path)."""
+
+    source_id: str = Field(..., description="ID of the scored source")
+    bias_score: int = Field(..., ge=0, le=10, description="Bias score (0-10)")
+    reason: str = Field(default="", description="Evidence for the score")
+
+
+# =============================================================================
+# QUICK ANALYSIS MODELS
+# =============================================================================
+
+
+class QuickClaim(BaseModel):
+    """Claim with its verdict (quick-mode fast path)."""
+
+    claim_text: str = Field(..., description="The claim text")
+    source_ids: list[str] = Field(
+        default_factory=list, description="Source IDs supporting this claim"
+    )
+    importance_score: float = Field(
+        default=0.5, ge=0.0, le=1.0, description="Importance score (0-1)"
+    )
+    verdict: Literal["VERIFIED", "PARTIALLY_TRUE", "FALSE", "UNVERIFIED"] = Field(
+        ..., description="Verification verdict"
+    )
+    evidence_summary: str = Field(..., description="Summary of supporting evidence")
+    confidence_score: float = Field(
+        default=0.5, ge=0.0, le=1.0, description="Confidence in verdict"
+    )
+
+
+class QuickAnalysis(BaseModel):
+    """Claims, verdicts, bias and summary from one quick-mode call."""
+
+    claims: list[QuickClaim] = Field(
+        default_factory=list, description="Top claims with verdicts"
+    )
+    source_biases: list[SourceBias] = Field(
+        default_factory=list, description="Bias scores of the scored sources"
+    )
+    summary: str = Field(..., description="Markdown investigation summary")
+
+
 # =============================================================================
 # TIMELINE MODELS
 # =============================================================================
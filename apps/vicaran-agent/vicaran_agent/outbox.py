@@ -0,0 +1,487 @@
+"""
+Durable callback outbox for the Vicaran investigation agent.
+
+Agent callbacks enqueue status/summary events into a local SQLite database
+(WAL mode) in microseconds. A background async sender delivers them to the
+Next.js callback API with retries, jittered backoff, idempotency keys and
+per-investigation ordering. Undelivered events survive process restarts
+and are delivered from startup on (see ``start_recovery``).
+"""
+
+import asyncio
+import json
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from .cancellation import investigation_cancellations
+from .config import config
+
+# Largest SQLite row ID: no limit on the events an outbox delivers
+_MAX_EVENT_ID = 2**63 - 1
+
+# HTTP statuses worth retrying; any other 4xx is a permanent rejection
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    investigation_id TEXT NOT NULL,
+    callback_type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    coalesce_key TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    lease_until REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_events_pending_idx
+    ON outbox_events (status, investigation_id, id);
+"""
+
+
+class CallbackOutbox:
+    """SQLite-backed outbox with a background async sender."""
+
+    def __init__(
+        self,
+        db_path: str,
+        api_url: str,
+        api_secret: str,
+        batch_size: int = 20,
+        max_attempts: int = 8,
+        base_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 60.0,
+        lease_seconds: float = 30.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+        clock: Callable[[], float] = time.time,
+        max_event_id: int | None = None,
+    ) -> None:
+        self.db_path = db_path
+        self.api_url = api_url
+        self.api_secret = api_secret
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.lease_seconds = lease_seconds
+        self._transport = transport
+        self._clock = clock
+        # Only events up to this ID are delivered (startup recovery)
+        self._max_event_id = _MAX_EVENT_ID if max_event_id is None else max_event_id
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._sender_task: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    # -------------------------------------------------------------------------
+    # Storage
+    # -------------------------------------------------------------------------
+
+    def _db(self) -> sqlite3.Connection:
+        """Open the outbox database lazily (no I/O at import time)."""
+        if self._conn is None:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def enqueue(
+        self,
+        investigation_id: str,
+        callback_type: str,
+        data: dict[str, Any],
+        coalesce_key: str | None = None,
+    ) -> str:
+        """Persist a callback event and wake the sender.
+
+        Args:
+            investigation_id: Investigation the event belongs to
+            callback_type: Callback API type (e.g. INVESTIGATION_COMPLETE)
+            data: Callback payload data
+            coalesce_key: If set, older pending events with the same key are
+                dropped so only the latest one is delivered
+
+        Returns:
+            The idempotency key assigned to the event
+        """
+        idempotency_key = uuid.uuid4().hex
+        payload = json.dumps(
+            {
+                "type": callback_type,
+                "investigation_id": investigation_id,
+                "data": data,
+            }
+        )
+        now = self._clock()
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                if coalesce_key:
+                    db.execute(
+                        "DELETE FROM outbox_events WHERE coalesce_key = ? "
+                        "AND status = 'pending' AND lease_until <= ?",
+                        (coalesce_key, now),
+                    )
+                db.execute(
+                    "INSERT INTO outbox_events (idempotency_key, investigation_id, "
+                    "callback_type, payload, coalesce_key, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        idempotency_key,
+                        investigation_id,
+                        callback_type,
+                        payload,
+                        coalesce_key,
+                        now,
+                    ),
+                )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+
+        if config.debug_mode:
+            print(f"\n📮 OUTBOX: queued {callback_type} for {investigation_id}")
+
+        self.start()
+        return idempotency_key
+
+    def pending_count(self, investigation_id: str | None = None) -> int:
+        """Number of events still waiting for delivery."""
+        query = (
+            "SELECT COUNT(*) FROM outbox_events WHERE status = 'pending' AND id <= ?"
+        )
+        params: tuple[Any, ...] = (self._max_event_id,)
+        if investigation_id:
+            query += " AND investigation_id = ?"
+            params += (investigation_id,)
+        with self._lock:
+            return int(self._db().execute(query, params).fetchone()[0])
+
+    def dead_letters(self) -> list[dict[str, Any]]:
+        """Events that were permanently rejected or ran out of attempts."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT idempotency_key, investigation_id, callback_type, attempts, "
+                "last_error FROM outbox_events WHERE status = 'dead' ORDER BY id"
+            )
+            return [dict(row) for row in rows]
+
+    def _claim_due(self) -> list[list[sqlite3.Row]]:
+        """Lease the next batch of deliverable events, grouped by investigation.
+
+        Only the head of each investigation's queue decides whether that
+        investigation is deliverable, so a backing-off event blocks its
+        successors and per-investigation order is preserved.
+        """
+        now = self._clock()
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = db.execute(
+                    "SELECT * FROM outbox_events WHERE status = 'pending' "
+                    "AND id <= ? ORDER BY id LIMIT ?",
+                    (self._max_event_id, self.batch_size * 5),
+                ).fetchall()
+
+                groups: dict[str, list[sqlite3.Row]] = {}
+                blocked: set[str] = set()
+                claimed = 0
+                for row in rows:
+                    investigation_id = row["investigation_id"]
+                    if investigation_id in blocked:
+                        continue
+                    if row["lease_until"] > now or row["next_attempt_at"] > now:
+                        blocked.add(investigation_id)
+                        continue
+                    if claimed >= self.batch_size:
+                        break
+                    groups.setdefault(investigation_id, []).append(row)
+                    claimed += 1
+
+                ids = [row["id"] for group in groups.values() for row in group]
+                if ids:
+                    placeholders = ",".join("?" * len(ids))
+                    db.execute(
+                        f"UPDATE outbox_events SET lease_until = ? "
+                        f"WHERE id IN ({placeholders})",
+                        (now + self.lease_seconds, *ids),
+                    )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+        return list(groups.values())
+
+    def _next_due_in(self) -> float | None:
+        """Seconds until the earliest pending event becomes due."""
+        with self._lock:
+            row = (
+                self._db()
+                .execute(
+                    "SELECT MIN(MAX(next_attempt_at, lease_until)) FROM outbox_events "
+                    "WHERE status = 'pending' AND id <= ?",
+                    (self._max_event_id,),
+                )
+                .fetchone()
+            )
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - self._clock())
+
+    def _mark_delivered(self, row_id: int) -> None:
+        with self._lock:
+            self._db().execute("DELETE FROM outbox_events WHERE id = ?", (row_id,))
+
+    def _mark_failed(
+        self, row: sqlite3.Row, error: str, permanent: bool, retry_after: float | None
+    ) -> None:
+        attempts = row["attempts"] + 1
+        if permanent or attempts >= self.max_attempts:
+            status, next_attempt_at = "dead", 0.0
+        else:
+            status = "pending"
+            # Exponential backoff with full jitter; Retry-After is a floor
+            ceiling = min(
+                self.max_backoff_seconds, self.base_backoff_seconds * 2**attempts
+            )
+            delay = random.uniform(0, ceiling)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            next_attempt_at = self._clock() + delay
+        with self._lock:
+            self._db().execute(
+                "UPDATE outbox_events SET status = ?, attempts = ?, "
+                "next_attempt_at = ?, lease_until = 0, last_error = ? WHERE id = ?",
+                (status, attempts, next_attempt_at, error[:500], row["id"]),
+            )
+
+    # -------------------------------------------------------------------------
+    # Delivery
+    # -------------------------------------------------------------------------
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=30,
+                transport=self._transport,
+                headers={
+                    "Content-Type": "application/json",
+                    "X-Agent-Secret": self.api_secret,
+                },
+            )
+        return self._client
+
+    async def _send(self, row: sqlite3.Row) -> bool:
+        """Deliver one event. Returns True when the event left the queue."""
+        try:
+            response = await self._http_client().post(
+                self.api_url,
+                content=row["payload"],
+                headers={"Idempotency-Key": row["idempotency_key"]},
+            )
+        except httpx.HTTPError as e:
+            self._mark_failed(row, str(e) or type(e).__name__, False, None)
+            return False
+
+        if response.is_success:
+            self._mark_delivered(row["id"])
+            if config.debug_mode:
+                print(f"✅ OUTBOX: delivered {row['callback_type']}")
+            return True
+
+        retry_after = None
+        if header := response.headers.get("Retry-After"):
+            try:
+                retry_after = float(header)
+            except ValueError:
+                pass
+        if response.status_code == 404:
+            # The investigation was deleted: stop working on it
+            investigation_cancellations.cancel(
+                row["investigation_id"], "Investigation no longer exists"
+            )
+        permanent = response.status_code not in RETRYABLE_STATUS_CODES
+        error = f"HTTP {response.status_code}: {response.text[:200]}"
+        self._mark_failed(row, error, permanent, retry_after)
+        if config.debug_mode:
+            print(f"❌ OUTBOX: {row['callback_type']} failed ({error})")
+        # A dead event no longer blocks the events queued behind it
+        return permanent
+
+    async def _deliver_group(self, rows: list[sqlite3.Row]) -> int:
+        delivered = 0
+        for row in rows:
+            if not await self._send(row):
+                # Release the remaining leases so ordering is kept on retry
+                remaining = [r["id"] for r in rows[rows.index(row) + 1 :]]
+                if remaining:
+                    placeholders = ",".join("?" * len(remaining))
+                    with self._lock:
+                        self._db().execute(
+                            f"UPDATE outbox_events SET lease_until = 0 "
+                            f"WHERE id IN ({placeholders})",
+                            remaining,
+                        )
+                break
+            delivered += 1
+        return delivered
+
+    async def deliver_due(self) -> int:
+        """Deliver one batch of due events. Returns the number delivered."""
+        groups = self._claim_due()
+        if not groups:
+            return 0
+        results = await asyncio.gather(
+            *(self._deliver_group(group) for group in groups)
+        )
+        return sum(results)
+
+    async def flush(self, timeout: float = 30.0) -> bool:
+        """Deliver until nothing is due. Returns True if the queue is empty."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if await self.deliver_due() == 0:
+                next_due = self._next_due_in()
+                if next_due is None:
+                    return True
+                await asyncio.sleep(min(next_due, deadline - time.monotonic(), 1.0))
+        return self.pending_count() == 0
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            try:
+                delivered = await self.deliver_due()
+            except Exception as e:
+                delivered = 0
+                print(f"❌ OUTBOX SENDER ERROR: {e}")
+            if delivered:
+                continue
+            next_due = self._next_due_in()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=5.0 if next_due is None else min(next_due, 5.0),
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Start (or wake) the background sender on the running event loop.
+
+        Outside an event loop this is a no-op; events stay queued until a
+        sender runs in this or a later process.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._sender_task is None or self._sender_task.done():
+            self._wakeup = asyncio.Event()
+            self._client = None  # Clients are bound to the loop that created them
+            self._sender_task = loop.create_task(self._run())
+        elif self._wakeup is not None:
+            self._wakeup.set()
+
+    def start_recovery(self) -> threading.Thread | None:
+        """Deliver the events a previous process left behind, from startup on.
+
+        Without this, they would wait for the next investigation to start the
+        sender. A second outbox, limited to the events queued so far, delivers
+        them on its own event loop in a daemon thread; leases keep it and the
+        regular sender from sending the same event twice.
+
+        Returns:
+            The recovery thread, or None if nothing is pending
+        """
+        with self._lock:
+            row = (
+                self._db()
+                .execute("SELECT MAX(id) FROM outbox_events WHERE status = 'pending'")
+                .fetchone()
+            )
+        if row[0] is None:
+            return None
+        recovery = CallbackOutbox(
+            db_path=self.db_path,
+            api_url=self.api_url,
+            api_secret=self.api_secret,
+            batch_size=self.batch_size,
+            max_attempts=self.max_attempts,
+            base_backoff_seconds=self.base_backoff_seconds,
+            max_backoff_seconds=self.max_backoff_seconds,
+            lease_seconds=self.lease_seconds,
+            transport=self._transport,
+            clock=self._clock,
+            max_event_id=row[0],
+        )
+        thread = threading.Thread(
+            target=asyncio.run,
+            args=(recovery._recover(),),
+            name="outbox-recovery",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    async def _recover(self) -> None:
+        try:
+            while not await self.flush(timeout=60.0):
+                pass
+        except Exception as e:
+            print(f"❌ OUTBOX RECOVERY ERROR: {e}")
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop the sender and release connections (queued events are kept)."""
+        if self._sender_task is not None:
+            self._sender_task.cancel()
+            try:
+                await self._sender_task
+            except asyncio.CancelledError:
+                pass
+            self._sender_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global outbox instance
+callback_outbox = CallbackOutbox(
+    db_path=config.outbox_db_path,
+    api_url=config.callback_api_url,
+    api_secret=config.agent_secret,
+    batch_size=config.outbox_batch_size,
+    max_attempts=config.outbox_max_attempts,
+    base_backoff_seconds=config.outbox_base_backoff_seconds,
+    max_backoff_seconds=config.outbox_max_backoff_seconds,
+)
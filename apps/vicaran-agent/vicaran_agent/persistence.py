@@ -0,0 +1,633 @@
+"""
+Persistence backends for investigation results.
+
+- CallbackApiBackend: sends every item through the Next.js callback API
+  (default, see transport.py)
+- DatabaseBackend: writes sources, claims, fact checks, bias scores and
+  timeline events straight to the database with pooled connections and
+  multi-row INSERTs. Mirrors the semantics of the agent-callback route,
+  including its payload validation.
+  Any SQLAlchemy URL works, so SQLite stands in for Postgres in local tests.
+"""
+
+import asyncio
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any, Literal, Protocol
+
+from pydantic import AnyUrl, BaseModel, Field, ValidationError, field_validator
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    Uuid,
+    bindparam,
+    create_engine,
+    event,
+    select,
+    update,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from .config import config
+from .transport import CallbackDeliveryError, callback_transport
+
+# Callback types the database backend writes directly
+BULK_CALLBACK_TYPES = {
+    "SOURCE_FOUND",
+    "CLAIM_EXTRACTED",
+    "FACT_CHECKED",
+    "BIAS_ANALYZED",
+    "TIMELINE_EVENT",
+}
+
+
+class PersistenceBackend(Protocol):
+    """Where investigation results are written."""
+
+    async def save(
+        self, investigation_id: str, callback_type: str, data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Persist one item and return the callback-style result."""
+        ...
+
+    async def save_many(
+        self, investigation_id: str, callback_type: str, items: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Persist several items of one type, results in input order.
+
+        Items rejected on their own come back as ``{"success": False,
+        "error": ...}``; a batch that fails as a whole raises.
+        """
+        ...
+
+
+# =============================================================================
+# CALLBACK API BACKEND (DEFAULT)
+# =============================================================================
+
+
+class CallbackApiBackend:
+    """Persists through the agent-callback API, one callback per item."""
+
+    async def save(
+        self, investigation_id: str, callback_type: str, data: dict[str, Any]
+    ) -> dict[str, Any]:
+        return await callback_transport.send(investigation_id, callback_type, data)
+
+    async def save_many(
+        self, investigation_id: str, callback_type: str, items: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        # One rejected item must not discard the ones already written
+        results = await asyncio.gather(
+            *(self.save(investigation_id, callback_type, item) for item in items),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        for error in errors:
+            if not isinstance(error, Exception):
+                raise error
+        if errors and len(errors) == len(results):
+            raise errors[0]
+        return [
+            {"success": False, "error": str(r)} if isinstance(r, Exception) else r
+            for r in results
+        ]
+
+
+# =============================================================================
+# DIRECT DATABASE BACKEND
+# =============================================================================
+
+metadata = MetaData()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# Column subsets of the Drizzle schema in apps/web/lib/drizzle/schema
+investigations_table = Table(
+    "investigations",
+    metadata,
+    Column("id", Uuid(as_uuid=False), primary_key=True),
+    Column("status", String, nullable=False, default="pending"),
+    Column("updated_at", DateTime(timezone=True), nullable=False, default=_now),
+)
+
+sources_table = Table(
+    "sources",
+    metadata,
+    Column("id", Uuid(as_uuid=False), primary_key=True),
+    Column(
+        "investigation_id",
+        Uuid(as_uuid=False),
+        ForeignKey("investigations.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    Column("url", Text, nullable=False),
+    Column("title", Text),
+    Column("content_snippet", Text),
+    Column("credibility_score", Integer),
+    Column("bias_score", Text),
+    Column("is_user_provided", Boolean, nullable=False, default=False),
+    Column("analyzed_at", DateTime(timezone=True)),
+    Column("created_at", DateTime(timezone=True), nullable=False, default=_now),
+)
+
+claims_table = Table(
+    "claims",
+    metadata,
+    Column("id", Uuid(as_uuid=False), primary_key=True),
+    Column(
+        "investigation_id",
+        Uuid(as_uuid=False),
+        ForeignKey("investigations.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    Column("claim_text", Text, nullable=False),
+    Column("status", String, nullable=False, default="unverified"),
+    Column("evidence_count", Integer, nullable=False, default=0),
+    Column("created_at", DateTime(timezone=True), nullable=False, default=_now),
+    Column("updated_at", DateTime(timezone=True), nullable=False, default=_now),
+)
+
+claim_sources_table = Table(
+    "claim_sources",
+    metadata,
+    Column(
+        "claim_id",
+        Uuid(as_uuid=False),
+        ForeignKey("claims.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "source_id",
+        Uuid(as_uuid=False),
+        ForeignKey("sources.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+)
+
+fact_checks_table = Table(
+    "fact_checks",
+    metadata,
+    Column("id", Uuid(as_uuid=False), primary_key=True),
+    Column(
+        "claim_id",
+        Uuid(as_uuid=False),
+        ForeignKey("claims.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    Column(
+        "source_id",
+        Uuid(as_uuid=False),
+        ForeignKey("sources.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    Column("evidence_type", String, nullable=False),
+    Column("evidence_text", Text, nullable=False),
+    Column("created_at", DateTime(timezone=True), nullable=False, default=_now),
+)
+
+timeline_events_table = Table(
+    "timeline_events",
+    metadata,
+    Column("id", Uuid(as_uuid=False), primary_key=True),
+    Column(
+        "investigation_id",
+        Uuid(as_uuid=False),
+        ForeignKey("investigations.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    Column("event_date", DateTime(timezone=True), nullable=False),
+    Column("event_text", Text, nullable=False),
+    Column(
+        "source_id",
+        Uuid(as_uuid=False),
+        ForeignKey("sources.id", ondelete="SET NULL"),
+    ),
+    Column("created_at", DateTime(timezone=True), nullable=False, default=_now),
+)
+
+
+# Item payloads, mirroring the Zod schemas of the agent-callback route
+class SourcePayload(BaseModel):
+    """A SOURCE_FOUND item."""
+
+    url: AnyUrl
+    title: str | None = None
+    content_snippet: str | None = None
+    summary: str | None = None
+    key_claims: list[str] | None = None
+    credibility_score: int | None = Field(default=None, ge=1, le=5)
+    is_user_provided: bool = False
+
+
+class ClaimPayload(BaseModel):
+    """A CLAIM_EXTRACTED item."""
+
+    claim_text: str
+    source_ids: list[uuid.UUID] | None = None
+
+
+class FactCheckPayload(BaseModel):
+    """A FACT_CHECKED item."""
+
+    claim_id: uuid.UUID
+    source_id: uuid.UUID | None = None
+    evidence_type: Literal["supporting", "contradicting"]
+    evidence_text: str
+
+
+class BiasPayload(BaseModel):
+    """A BIAS_ANALYZED item."""
+
+    source_id: uuid.UUID
+    bias_score: float = Field(ge=0, le=10)
+
+
+class TimelineEventPayload(BaseModel):
+    """A TIMELINE_EVENT item."""
+
+    event_date: str
+    event_text: str
+    source_id: uuid.UUID | None = None
+    source_ids: list[uuid.UUID] | None = None
+
+    @field_validator("event_date")
+    @classmethod
+    def _valid_date(cls, value: str) -> str:
+        _parse_event_date(value)
+        return value
+
+
+PAYLOAD_MODELS: dict[str, type[BaseModel]] = {
+    "SOURCE_FOUND": SourcePayload,
+    "CLAIM_EXTRACTED": ClaimPayload,
+    "FACT_CHECKED": FactCheckPayload,
+    "BIAS_ANALYZED": BiasPayload,
+    "TIMELINE_EVENT": TimelineEventPayload,
+}
+
+
+def _validation_error(error: ValidationError) -> str:
+    return "Validation failed: " + "; ".join(
+        f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in error.errors()
+    )
+
+
+def _sync_database_url(database_url: str) -> str:
+    """Use the sync driver for URLs configured for asyncpg (ADK sessions)."""
+    if database_url.startswith("postgresql+asyncpg://"):
+        return "postgresql+psycopg2://" + database_url.split("://", 1)[1]
+    if database_url.startswith("postgres://"):
+        return "postgresql://" + database_url.split("://", 1)[1]
+    return database_url
+
+
+def _enable_sqlite_savepoints(engine: Engine) -> None:
+    """Enforce foreign keys and let SQLAlchemy drive BEGIN/SAVEPOINT on SQLite."""
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection: Any, _record: Any) -> None:
+        dbapi_connection.isolation_level = None
+        dbapi_connection.execute("PRAGMA foreign_keys = ON")
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn: Connection) -> None:
+        conn.exec_driver_sql("BEGIN")
+
+
+def _parse_event_date(value: str) -> datetime:
+    """Parse date-only or full ISO datetimes (the API accepts both)."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class DatabaseBackend:
+    """Writes investigation results directly with bulk statements.
+
+    Statements run on a pooled SQLAlchemy engine in a worker thread so the
+    event loop never blocks. Each save_many call is one transaction; when
+    a bulk statement fails, the batch is retried row by row under
+    savepoints so one bad row (e.g. an unknown source_id) is reported on
+    its own instead of rolling back the rest.
+    Status callbacks (INVESTIGATION_*) still go through the callback API.
+    """
+
+    def __init__(self, database_url: str, pool_size: int = 5) -> None:
+        url = _sync_database_url(database_url)
+        engine_kwargs: dict[str, Any] = {"pool_pre_ping": True}
+        if not url.startswith("sqlite"):
+            engine_kwargs.update(pool_size=pool_size, max_overflow=pool_size)
+        self.engine: Engine = create_engine(url, **engine_kwargs)
+        if url.startswith("sqlite"):
+            _enable_sqlite_savepoints(self.engine)
+        self._fallback = CallbackApiBackend()
+
+    def create_tables(self) -> None:
+        """Create the tables (local SQLite stand-in only; Drizzle owns Postgres)."""
+        metadata.create_all(self.engine)
+
+    async def save(
+        self, investigation_id: str, callback_type: str, data: dict[str, Any]
+    ) -> dict[str, Any]:
+        results = await self.save_many(investigation_id, callback_type, [data])
+        return results[0]
+
+    async def save_many(
+        self, investigation_id: str, callback_type: str, items: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        if callback_type not in BULK_CALLBACK_TYPES:
+            return await self._fallback.save_many(
+                investigation_id, callback_type, items
+            )
+        if not items:
+            return []
+        try:
+            uuid.UUID(investigation_id)
+        except ValueError:
+            raise CallbackDeliveryError(
+                400, "Validation failed: investigation_id: Invalid uuid"
+            ) from None
+
+        # Rejected like the route would, without failing the rest of the batch
+        errors: list[str | None] = []
+        for item in items:
+            try:
+                PAYLOAD_MODELS[callback_type].model_validate(item)
+            except ValidationError as e:
+                errors.append(_validation_error(e))
+            else:
+                errors.append(None)
+        valid = [item for item, error in zip(items, errors, strict=True) if not error]
+        if not valid:
+            raise CallbackDeliveryError(400, errors[0] or "")
+
+        written = iter(
+            await asyncio.to_thread(self._write, investigation_id, callback_type, valid)
+        )
+        return [
+            {"success": False, "error": error} if error else next(written)
+            for error in errors
+        ]
+
+    def _write(
+        self, investigation_id: str, callback_type: str, items: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        writers = {
+            "SOURCE_FOUND": self._write_sources,
+            "CLAIM_EXTRACTED": self._write_claims,
+            "FACT_CHECKED": self._write_fact_checks,
+            "BIAS_ANALYZED": self._write_bias_scores,
+            "TIMELINE_EVENT": self._write_timeline_events,
+        }
+        writer = writers[callback_type]
+        try:
+            with self.engine.begin() as conn:
+                exists = conn.execute(
+                    select(investigations_table.c.id).where(
+                        investigations_table.c.id == investigation_id
+                    )
+                ).first()
+                if not exists:
+                    raise CallbackDeliveryError(404, "Investigation not found")
+                try:
+                    with conn.begin_nested():
+                        results = writer(conn, investigation_id, items)
+                except SQLAlchemyError:
+                    results = [
+                        self._write_row(conn, writer, investigation_id, item)
+                        for item in items
+                    ]
+        except SQLAlchemyError as e:
+            raise CallbackDeliveryError(500, f"Database error: {e}") from e
+
+        if config.debug_mode:
+            print(f"🗄️ DB BACKEND: wrote {len(items)} {callback_type} rows")
+        return results
+
+    def _write_row(
+        self,
+        conn: Connection,
+        writer: Callable[[Connection, str, list[dict[str, Any]]], list[dict[str, Any]]],
+        investigation_id: str,
+        item: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Write one item under its own savepoint, reporting DB errors per item."""
+        try:
+            with conn.begin_nested():
+                return writer(conn, investigation_id, [item])[0]
+        except SQLAlchemyError as e:
+            error = getattr(e, "orig", None) or e
+            return {"success": False, "error": f"Database error: {error}"}
+
+    def _write_sources(
+        self, conn: Connection, investigation_id: str, items: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        # Upsert on (investigation_id, url), same as the callback route
+        urls = list(dict.fromkeys(item["url"] for item in items))
+        source_ids: dict[str, str] = {
+            row.url: str(row.id)
+            for row in conn.execute(
+                select(sources_table.c.id, sources_table.c.url).where(
+                    sources_table.c.investigation_id == investigation_id,
+                    sources_table.c.url.in_(urls),
+                )
+            )
+        }
+
+        inserts: list[dict[str, Any]] = []
+        updates: list[dict[str, Any]] = []
+        for item in items:
+            row = {
+                "title": item.get("title"),
+                "content_snippet": item.get("content_snippet") or item.get("summary"),
+                "credibility_score": item.get("credibility_score"),
+            }
+            if item["url"] in source_ids:
+                updates.append({"b_id": source_ids[item["url"]], **row})
+            else:
+                source_ids[item["url"]] = str(uuid.uuid4())
+                inserts.append(
+                    {
+                        "id": source_ids[item["url"]],
+                        "investigation_id": investigation_id,
+                        "url": item["url"],
+                        "is_user_provided": bool(item.get("is_user_provided", False)),
+                        **row,
+                    }
+                )
+
+        if inserts:
+            conn.execute(sources_table.insert(), inserts)
+        if updates:
+            conn.execute(
+                update(sources_table)
+                .where(sources_table.c.id == bindparam("b_id"))
+                .values(
+                    title=bindparam("title"),
+                    content_snippet=bindparam("content_snippet"),
+                    credibility_score=bindparam("credibility_score"),
+                ),
+                updates,
+            )
+        return [{"success": True, "source_id": source_ids[i["url"]]} for i in items]
+
+    def _write_claims(
+        self, conn: Connection, investigation_id: str, items: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        claim_rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "investigation_id": investigation_id,
+                "claim_text": item["claim_text"],
+            }
+            for item in items
+        ]
+        links = {
+            (row["id"], source_id)
+            for row, item in zip(claim_rows, items, strict=True)
+            for source_id in item.get("source_ids") or []
+        }
+        conn.execute(claims_table.insert(), claim_rows)
+        if links:
+            conn.execute(
+                claim_sources_table.insert(),
+                [{"claim_id": c, "source_id": s} for c, s in sorted(links)],
+            )
+        return [{"success": True, "claim_id": row["id"]} for row in claim_rows]
+
+    def _write_fact_checks(
+        self, conn: Connection, investigation_id: str, items: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        claim_ids = list(dict.fromkeys(item["claim_id"] for item in items))
+
+        # Fall back to each claim's first linked source, like the callback route
+        first_source: dict[str, str] = {}
+        for row in conn.execute(
+            select(claim_sources_table).where(
+                claim_sources_table.c.claim_id.in_(claim_ids)
+            )
+        ):
+            first_source.setdefault(str(row.claim_id), str(row.source_id))
+
+        results: list[dict[str, Any]] = []
+        fact_check_rows: list[dict[str, Any]] = []
+        for item in items:
+            source_id = item.get("source_id") or first_source.get(item["claim_id"])
+            if not source_id:
+                results.append(
+                    {
+                        "success": True,
+                        "warning": "No source_id available for fact check — "
+                        "skipping DB insert",
+                    }
+                )
+                continue
+            row = {
+                "id": str(uuid.uuid4()),
+                "claim_id": item["claim_id"],
+                "source_id": source_id,
+                "evidence_type": item["evidence_type"],
+                "evidence_text": item["evidence_text"],
+            }
+            fact_check_rows.append(row)
+            results.append({"success": True, "fact_check_id": row["id"]})
+
+        if not fact_check_rows:
+            return results
+        conn.execute(fact_checks_table.insert(), fact_check_rows)
+
+        # Contradicting evidence wins; supporting promotes unverified → verified
+        claim_updates: list[dict[str, Any]] = []
+        for claim in conn.execute(
+            select(
+                claims_table.c.id, claims_table.c.status, claims_table.c.evidence_count
+            ).where(claims_table.c.id.in_({row["claim_id"] for row in fact_check_rows}))
+        ):
+            evidence = [r for r in fact_check_rows if r["claim_id"] == str(claim.id)]
+            status = claim.status
+            for row in evidence:
+                if row["evidence_type"] == "contradicting":
+                    status = "contradicted"
+                elif status == "unverified":
+                    status = "verified"
+            claim_updates.append(
+                {
+                    "b_id": str(claim.id),
+                    "status": status,
+                    "evidence_count": claim.evidence_count + len(evidence),
+                    "updated_at": _now(),
+                }
+            )
+        if claim_updates:
+            conn.execute(
+                update(claims_table)
+                .where(claims_table.c.id == bindparam("b_id"))
+                .values(
+                    status=bindparam("status"),
+                    evidence_count=bindparam("evidence_count"),
+                    updated_at=bindparam("updated_at"),
+                ),
+                claim_updates,
+            )
+        return results
+
+    def _write_bias_scores(
+        self, conn: Connection, investigation_id: str, items: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        analyzed_at = _now()
+        conn.execute(
+            update(sources_table)
+            .where(sources_table.c.id == bindparam("b_id"))
+            .values(bias_score=bindparam("bias_score"), analyzed_at=analyzed_at),
+            [
+                {
+                    "b_id": item["source_id"],
+                    # Stored as text with 2 decimal places
+                    "bias_score": f"{float(item['bias_score']):.2f}",
+                }
+                for item in items
+            ],
+        )
+        return [{"success": True} for _ in items]
+
+    def _write_timeline_events(
+        self, conn: Connection, investigation_id: str, items: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "investigation_id": investigation_id,
+                "event_date": _parse_event_date(item["event_date"]),
+                "event_text": item["event_text"],
+                "source_id": item.get("source_id")
+                or (item.get("source_ids") or [None])[0],
+            }
+            for item in items
+        ]
+        conn.execute(timeline_events_table.insert(), rows)
+        return [{"success": True, "event_id": row["id"]} for row in rows]
+
+
+def create_persistence_backend() -> CallbackApiBackend | DatabaseBackend:
+    """Build the backend selected by config.persistence_backend."""
+    if config.persistence_backend == "database":
+        if not config.database_url:
+            raise ValueError("PERSISTENCE_BACKEND=database requires DATABASE_URL")
+        return DatabaseBackend(config.database_url, config.persistence_pool_size)
+    return CallbackApiBackend()
+
+
+# Global persistence backend instance
+persistence_backend = create_persistence_backend()
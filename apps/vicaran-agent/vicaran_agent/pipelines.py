@@ -0,0 +1,414 @@
+"""
+Mode-specific investigation pipelines built from a declarative stage list.
+
+Each investigation mode gets its own pipeline, assembled once at import
+time from ``PIPELINE_STAGES``: stages not used in a mode are left out
+entirely (quick mode has no timeline stage), consecutive stages sharing a
+``parallel_group`` run concurrently, and per-mode settings (projection
+budget, instruction variant, model routing policy) are fixed on cloned
+agents. With ``quick_fast_path_enabled``, quick mode instead runs source
+discovery followed by one ``quick_analyzer`` call. At run time
+``ModeRouterAgent`` delegates to the pipeline matching ``investigation_mode``
+and stops it early when a stage produces nothing for the next one or the
+investigation is cancelled.
+
+Stage agents run with ``include_contents="none"``: everything a stage needs
+reaches it from session state through its instruction (see projections.py),
+so the inherited conversation (orchestrator plan, source fetches, earlier
+stages) would only add prompt tokens.
+"""
+
+import contextlib
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass, field
+from typing import Any
+
+from google.adk.agents import BaseAgent, LlmAgent, ParallelAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.genai import types
+
+from .budget import investigation_budget
+from .callbacks import (
+    PIPELINE_TERMINATION_KEY,
+    cancel_model_call,
+    cancel_tool_call,
+    checkpoint_stage,
+    end_cancelled_investigation,
+    skip_completed_stage,
+    skip_over_budget,
+    skip_without_inputs,
+    stop_over_budget,
+    terminate_without_outputs,
+    track_tool_call,
+)
+from .cancellation import InvestigationCancelledError, investigation_cancellations
+from .config import config
+from .context_cache import context_cache
+from .fact_check_fanout import FactCheckFanOutAgent
+from .model_routing import model_settings, resolve_model_policy
+from .models import SourceBatch
+from .projections import projected_instruction
+from .prompts import (
+    CLAIM_EXTRACTOR_INSTRUCTION,
+    CLAIM_RECONCILER_INSTRUCTION,
+    FACT_CHECKER_INSTRUCTION,
+    QUICK_ANALYZER_INSTRUCTION,
+    SOURCE_BATCH_SUMMARIZER_INSTRUCTION,
+    SUMMARY_WRITER_INSTRUCTION,
+    bias_analyzer_instruction,
+)
+from .source_discovery import SourceDiscoveryAgent
+from .streaming_handoff import StreamingHandoffAgent
+from .sub_agents import (
+    bias_analyzer,
+    claim_extractor,
+    fact_checker,
+    quick_analyzer,
+    source_finder,
+    source_summarizer,
+    summary_writer,
+    timeline_builder,
+)
+
+MODES = ("quick", "detailed")
+DEFAULT_MODE = "quick"
+
+
+@dataclass(frozen=True)
+class ModeSettings:
+    """Settings applied to every stage of one mode's pipeline."""
+
+    projection_budget_scale: float = 1.0
+
+
+MODE_SETTINGS: dict[str, ModeSettings] = {
+    "quick": ModeSettings(projection_budget_scale=config.quick_projection_budget_scale),
+    "detailed": ModeSettings(),
+}
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    """One pipeline stage and the modes it runs in."""
+
+    agent: LlmAgent
+    modes: tuple[str, ...] = MODES
+    # Consecutive stages with the same group run in a ParallelAgent
+    parallel_group: str | None = None
+    # Instruction template per mode, rendered with projections; stages
+    # without templates keep the agent's own instruction
+    instructions: dict[str, str] = field(default_factory=dict)
+    # State lists the stage needs; if any is empty it answers skip_marker
+    # without a model call
+    requires: tuple[str, ...] = ()
+    skip_marker: str = ""
+    # State list the stage must fill; if it stays empty the pipeline stops
+    # with INVESTIGATION_PARTIAL (terminate_reason)
+    produces: str | None = None
+    terminate_reason: str = ""
+    # Split claims_accumulated into shards checked concurrently
+    fan_out: bool = False
+    # Consume the previous stage's sources in micro-batches while it runs
+    streams_from_previous: bool = False
+    # Replaced by code-driven discovery when config.source_discovery == "code"
+    discovers_sources: bool = False
+
+
+def _same_for_all_modes(template: str) -> dict[str, str]:
+    return dict.fromkeys(MODES, template)
+
+
+PIPELINE_STAGES: tuple[StageSpec, ...] = (
+    StageSpec(
+        source_finder,
+        discovers_sources=True,
+        produces="sources_accumulated",
+        terminate_reason="No sources found",
+    ),
+    StageSpec(
+        claim_extractor,
+        instructions=_same_for_all_modes(CLAIM_EXTRACTOR_INSTRUCTION),
+        requires=("sources_accumulated",),
+        skip_marker="[NO_CLAIMS_EXTRACTED] No sources available.",
+        produces="claims_accumulated",
+        terminate_reason="No verifiable claims extracted",
+        streams_from_previous=True,
+    ),
+    # Independent analysis stages: read accumulated sources/claims only
+    StageSpec(
+        fact_checker,
+        parallel_group="analysis_stage",
+        instructions=_same_for_all_modes(FACT_CHECKER_INSTRUCTION),
+        requires=("claims_accumulated",),
+        fan_out=True,
+        skip_marker="[NO_CLAIMS_TO_VERIFY] No claims available for verification.",
+    ),
+    StageSpec(
+        bias_analyzer,
+        parallel_group="analysis_stage",
+        instructions={mode: bias_analyzer_instruction(mode) for mode in MODES},
+        requires=("sources_accumulated",),
+        skip_marker="[BIAS_SKIPPED]",
+    ),
+    # Timelines are only built for detailed investigations
+    StageSpec(
+        timeline_builder,
+        modes=("detailed",),
+        parallel_group="analysis_stage",
+        requires=("sources_accumulated",),
+        skip_marker="[TIMELINE_SKIPPED] No sources available.",
+    ),
+    StageSpec(
+        summary_writer,
+        instructions=_same_for_all_modes(SUMMARY_WRITER_INSTRUCTION),
+    ),
+)
+
+
+# Quick mode fast path: claims, verdicts, bias and summary in one call
+QUICK_FAST_PATH_STAGES: tuple[StageSpec, ...] = (
+    PIPELINE_STAGES[0],
+    StageSpec(
+        quick_analyzer,
+        modes=("quick",),
+        instructions={"quick": QUICK_ANALYZER_INSTRUCTION},
+        requires=("sources_accumulated",),
+        skip_marker="[NO_CLAIMS_EXTRACTED] No sources available.",
+        produces="investigation_summary",
+        terminate_reason="Quick analysis returned no usable result",
+    ),
+)
+
+
+def pipeline_stages(mode: str) -> tuple[StageSpec, ...]:
+    """Stage list a mode's pipeline is built from."""
+    if mode == "quick" and config.quick_fast_path_enabled:
+        return QUICK_FAST_PATH_STAGES
+    return PIPELINE_STAGES
+
+
+def _callbacks(callbacks: Any) -> list[Any]:
+    if callbacks is None:
+        return []
+    return list(callbacks) if isinstance(callbacks, list) else [callbacks]
+
+
+def _guarded_model_callbacks(agent: LlmAgent) -> list[Any]:
+    return [
+        cancel_model_call,
+        stop_over_budget,
+        *_callbacks(agent.before_model_callback),
+    ]
+
+
+def _build_stage(spec: StageSpec, mode: str) -> BaseAgent:
+    update: dict[str, Any] = {}
+    if isinstance(spec.agent, LlmAgent):
+        # Model, generation settings and thinking budget for this stage and mode
+        update.update(
+            model_settings(
+                resolve_model_policy(spec.agent.name, mode),
+                spec.agent.generate_content_config,
+            )
+        )
+        # Every model and tool call is checked for cancellation and against
+        # the investigation budget
+        update["before_model_callback"] = _guarded_model_callbacks(spec.agent)
+        if spec.agent.tools:
+            update["before_tool_callback"] = [
+                cancel_tool_call,
+                track_tool_call,
+                *_callbacks(spec.agent.before_tool_callback),
+            ]
+    budget_scale = MODE_SETTINGS[mode].projection_budget_scale
+    template = spec.instructions.get(mode)
+    if template is not None:
+        update["instruction"] = projected_instruction(
+            template, spec.agent.name, budget_scale
+        )
+
+    # Stages restored from a checkpoint or over budget are skipped; finished
+    # ones checkpointed
+    before_agent = [skip_completed_stage, skip_over_budget]
+    if spec.requires:
+        before_agent.append(skip_without_inputs(spec.requires, spec.skip_marker))
+    before_agent.extend(_callbacks(spec.agent.before_agent_callback))
+    after_agent = _callbacks(spec.agent.after_agent_callback)
+    if spec.produces:
+        after_agent.append(
+            terminate_without_outputs(spec.produces, spec.terminate_reason)
+        )
+    after_agent.append(checkpoint_stage)
+    stage_callbacks = {
+        "before_agent_callback": before_agent,
+        "after_agent_callback": after_agent,
+    }
+
+    if spec.discovers_sources and config.source_discovery == "code":
+        # Python searches, fetches and saves; the model only assesses pages
+        summarizer_settings = {
+            **model_settings(
+                resolve_model_policy(source_summarizer.name, mode),
+                source_summarizer.generate_content_config,
+            ),
+            "before_model_callback": _guarded_model_callbacks(source_summarizer),
+        }
+        return SourceDiscoveryAgent(
+            name=spec.agent.name,
+            description=spec.agent.description,
+            summarizer=source_summarizer.clone(update=summarizer_settings),
+            batch_summarizer=source_summarizer.clone(
+                update={
+                    **summarizer_settings,
+                    "instruction": SOURCE_BATCH_SUMMARIZER_INSTRUCTION,
+                    "output_schema": SourceBatch,
+                }
+            ),
+            batch_token_budget=config.source_summary_batch_tokens,
+            max_batch_pages=config.source_summary_batch_max_pages,
+            output_key=spec.agent.output_key,
+            max_queries=config.source_discovery_max_queries,
+            results_per_query=config.source_discovery_results_per_query,
+            overfetch=config.source_discovery_overfetch,
+            fetch_concurrency=config.source_discovery_fetch_concurrency,
+            summarize_concurrency=config.source_discovery_summarize_concurrency,
+            **stage_callbacks,
+        )
+    if spec.fan_out and template is not None and config.fact_check_fanout_enabled:
+        # Stage-level callbacks run once around all shards
+        return FactCheckFanOutAgent(
+            name=spec.agent.name,
+            description=spec.agent.description,
+            checker=spec.agent.clone(update={**update, "after_agent_callback": None}),
+            template=template,
+            budget_scale=budget_scale,
+            output_key=spec.agent.output_key,
+            shard_size=config.fact_check_shard_size,
+            max_concurrency=config.fact_check_max_concurrency,
+            **stage_callbacks,
+        )
+    # Clones keep the stage name (the web app keys progress on agent names)
+    return spec.agent.clone(update={**update, **stage_callbacks})
+
+
+def _streaming_handoff(
+    producer: BaseAgent, consumer: LlmAgent, spec: StageSpec, mode: str
+) -> StreamingHandoffAgent:
+    """Merge a producer stage and its consumer into one overlapping step."""
+    return StreamingHandoffAgent(
+        name=f"{mode}_streaming_handoff",
+        description=f"{producer.name} feeding {consumer.name} in micro-batches",
+        producer=producer,
+        extractor=consumer.clone(
+            update={"before_agent_callback": None, "after_agent_callback": None}
+        ),
+        template=spec.instructions[mode],
+        reconcile_template=CLAIM_RECONCILER_INSTRUCTION,
+        budget_scale=MODE_SETTINGS[mode].projection_budget_scale,
+        output_key=consumer.output_key,
+        batch_size=config.streaming_handoff_batch_size,
+        max_concurrency=config.streaming_handoff_max_concurrency,
+        # Run once around all batches and the reconciliation pass
+        before_agent_callback=skip_completed_stage,
+        after_agent_callback=consumer.after_agent_callback,
+    )
+
+
+def build_pipeline(
+    mode: str, stages: tuple[StageSpec, ...] | None = None
+) -> SequentialAgent:
+    """Assemble the sequential (with parallel groups) pipeline for a mode."""
+    if stages is None:
+        stages = pipeline_stages(mode)
+    steps: list[BaseAgent] = []
+    group_name: str | None = None
+    group: list[BaseAgent] = []
+
+    def flush_group() -> None:
+        if not group:
+            return
+        if len(group) == 1:
+            steps.append(group[0])
+        else:
+            steps.append(
+                ParallelAgent(
+                    name=f"{mode}_{group_name}",
+                    sub_agents=list(group),
+                    description="Independent analysis stages executed in parallel",
+                )
+            )
+        group.clear()
+
+    for spec in stages:
+        if mode not in spec.modes:
+            continue
+        agent = _build_stage(spec, mode)
+        if (
+            spec.streams_from_previous
+            and config.streaming_handoff_enabled
+            and not group
+            and steps
+        ):
+            agent = _streaming_handoff(steps.pop(), agent, spec, mode)
+        if spec.parallel_group and spec.parallel_group == group_name:
+            group.append(agent)
+            continue
+        flush_group()
+        group_name = spec.parallel_group
+        if group_name:
+            group.append(agent)
+        else:
+            steps.append(agent)
+    flush_group()
+
+    return SequentialAgent(
+        name=f"{mode}_pipeline",
+        sub_agents=steps,
+        description=f"Investigation pipeline for {mode} mode",
+    )
+
+
+class ModeRouterAgent(BaseAgent):
+    """Runs the pre-built pipeline matching the session's investigation_mode."""
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        mode = ctx.session.state.get("investigation_mode", DEFAULT_MODE)
+        pipeline = self.find_sub_agent(f"{mode}_pipeline") or self.find_sub_agent(
+            f"{DEFAULT_MODE}_pipeline"
+        )
+        if config.debug_mode:
+            print(f"\n🧭 PIPELINE: running {pipeline.name}")
+        # Cancelling the investigation closes the pipeline mid-stage
+        investigation_id = ctx.session.state.get("investigation_id", "")
+        investigation_cancellations.start(investigation_id)
+        try:
+            async with contextlib.aclosing(
+                investigation_cancellations.guard(
+                    investigation_id, pipeline.run_async(ctx)
+                )
+            ) as events:
+                async for event in events:
+                    yield event
+                    # A stage left its required output empty: skip the
+                    # remaining stages
+                    if event.actions.state_delta.get(PIPELINE_TERMINATION_KEY):
+                        return
+        except InvestigationCancelledError as e:
+            await end_cancelled_investigation(investigation_id, e.reason, e.notify)
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                content=types.Content(
+                    role="model",
+                    parts=[types.Part(text=f"[INVESTIGATION_CANCELLED] {e.reason}")],
+                ),
+            )
+        finally:
+            # However the run ended (error, early stop, client disconnect)
+            investigation_cancellations.finish(investigation_id)
+            investigation_budget.finish(investigation_id)
+            await context_cache.release_investigation(investigation_id)
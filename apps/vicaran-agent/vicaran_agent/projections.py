@@ -0,0 +1,314 @@
+"""
+Token-budgeted, per-agent projections of accumulated session state.
+
+Instead of serializing the full ``sources_accumulated`` / ``claims_accumulated``
+lists into every downstream prompt, each agent receives only the fields it
+needs, encoded compactly (a header row of field names followed by one JSON
+array per item) and trimmed to fit a per-agent token budget. Stage agents
+take their instruction from ``projected_instruction`` for this reason.
+"""
+
+import json
+import logging
+import math
+import re
+from collections import ChainMap
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from google.adk.agents.readonly_context import ReadonlyContext
+
+from .accumulators import ACCUMULATORS_BY_KEY
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio for Gemini on English prose/JSON
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local token estimate (no API call)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass(frozen=True)
+class Projection:
+    """Fields an agent needs from one accumulated list."""
+
+    state_key: str
+    fields: tuple[str, ...]
+    # Field used to keep the most important items when trimming
+    rank_by: str | None = None
+
+
+@dataclass(frozen=True)
+class AgentProjection:
+    """Everything one agent reads from accumulated state."""
+
+    agent_name: str
+    projections: tuple[Projection, ...] = field(default_factory=tuple)
+
+
+SOURCES = "sources_accumulated"
+CLAIMS = "claims_accumulated"
+
+# Set once the full corpus travels in a Gemini context cache (see context_cache)
+CACHED_CORPUS_FLAG = "corpus_in_context_cache"
+CACHED_CORPUS_REFERENCE = "(see the INVESTIGATION CORPUS message)"
+
+AGENT_PROJECTIONS: dict[str, AgentProjection] = {
+    "claim_extractor": AgentProjection(
+        "claim_extractor",
+        (
+            Projection(
+                SOURCES,
+                ("source_id", "title", "summary", "key_claims"),
+                "credibility_score",
+            ),
+        ),
+    ),
+    "claim_reconciler": AgentProjection(
+        "claim_reconciler",
+        (
+            Projection(
+                SOURCES,
+                ("source_id", "title", "summary", "key_claims"),
+                "credibility_score",
+            ),
+            Projection(
+                CLAIMS, ("claim_id", "claim_text", "source_ids"), "importance_score"
+            ),
+        ),
+    ),
+    "fact_checker": AgentProjection(
+        "fact_checker",
+        (
+            Projection(
+                CLAIMS, ("claim_id", "claim_text", "source_ids"), "importance_score"
+            ),
+            Projection(
+                SOURCES,
+                ("source_id", "credibility_score", "summary", "key_claims"),
+                "credibility_score",
+            ),
+        ),
+    ),
+    "bias_analyzer": AgentProjection(
+        "bias_analyzer",
+        (
+            # Quick mode scores the 5 most credible sources, so it needs the score
+            Projection(
+                SOURCES,
+                ("source_id", "title", "credibility_score", "summary", "key_claims"),
+                "credibility_score",
+            ),
+        ),
+    ),
+    "timeline_builder": AgentProjection(
+        "timeline_builder",
+        (
+            Projection(CLAIMS, ("claim_text", "source_ids"), "importance_score"),
+            Projection(SOURCES, ("source_id", "title", "summary"), "credibility_score"),
+        ),
+    ),
+    "quick_analyzer": AgentProjection(
+        "quick_analyzer",
+        (
+            Projection(
+                SOURCES,
+                (
+                    "source_id",
+                    "title",
+                    "url",
+                    "credibility_score",
+                    "summary",
+                    "key_claims",
+                ),
+                "credibility_score",
+            ),
+        ),
+    ),
+    "summary_writer": AgentProjection(
+        "summary_writer",
+        (
+            Projection(
+                SOURCES,
+                ("source_id", "title", "url", "credibility_score"),
+                "credibility_score",
+            ),
+            Projection(
+                CLAIMS,
+                ("claim_id", "claim_text", "importance_score"),
+                "importance_score",
+            ),
+        ),
+    ),
+}
+
+# Progressive trimming steps: (max chars per text field, max list entries)
+_TRIM_STEPS: tuple[tuple[int | None, int | None], ...] = (
+    (None, None),
+    (300, 3),
+    (160, 2),
+    (80, 1),
+)
+
+
+def _trim_value(value: Any, max_chars: int | None, max_list: int | None) -> Any:
+    if isinstance(value, str) and max_chars is not None and len(value) > max_chars:
+        return value[: max_chars - 1] + "…"
+    if isinstance(value, list):
+        kept = value if max_list is None else value[:max_list]
+        return [_trim_value(v, max_chars, None) for v in kept]
+    return value
+
+
+def encode_items(
+    items: list[dict[str, Any]],
+    fields: tuple[str, ...],
+    max_chars: int | None = None,
+    max_list: int | None = None,
+) -> str:
+    """Encode items as a field header plus one compact JSON row per item."""
+    if not items:
+        return "[]"
+    rows = [json.dumps(list(fields), ensure_ascii=False, separators=(",", ":"))]
+    for item in items:
+        row = [_trim_value(item.get(name), max_chars, max_list) for name in fields]
+        rows.append(json.dumps(row, ensure_ascii=False, separators=(",", ":")))
+    return "\n".join(rows)
+
+
+def project(
+    items: list[dict[str, Any]], projection: Projection, token_budget: int
+) -> str:
+    """Project items onto the agent's fields, trimmed to the token budget.
+
+    Text fields are shortened step by step first; if that is not enough,
+    the lowest-ranked items are dropped.
+    """
+    encoded = "[]"
+    for max_chars, max_list in _TRIM_STEPS:
+        encoded = encode_items(items, projection.fields, max_chars, max_list)
+        if estimate_tokens(encoded) <= token_budget:
+            return encoded
+
+    max_chars, max_list = _TRIM_STEPS[-1]
+    ranked = list(items)
+    if projection.rank_by:
+        ranked.sort(key=lambda item: item.get(projection.rank_by) or 0, reverse=True)
+    while len(ranked) > 1 and estimate_tokens(encoded) > token_budget:
+        ranked.pop()
+        # Keep the original (insertion) order among the retained items
+        kept = [item for item in items if any(item is r for r in ranked)]
+        encoded = encode_items(kept, projection.fields, max_chars, max_list)
+    return encoded
+
+
+def project_state(
+    agent_name: str, state: Any, budget_scale: float = 1.0
+) -> dict[str, str]:
+    """Render every projection for an agent, sharing its token budget.
+
+    ``budget_scale`` shrinks (or grows) the configured budget, e.g. for the
+    cheaper quick-mode pipeline.
+
+    Returns:
+        Mapping of state key → encoded projection text
+    """
+    spec = AGENT_PROJECTIONS[agent_name]
+    budget = config.projection_token_budgets.get(
+        agent_name, config.default_projection_token_budget
+    )
+    budget = int(budget * budget_scale)
+    per_projection = max(1, budget // max(1, len(spec.projections)))
+
+    rendered: dict[str, str] = {}
+    if state.get(CACHED_CORPUS_FLAG):
+        # The full corpus is already in the request via the context cache
+        return {p.state_key: CACHED_CORPUS_REFERENCE for p in spec.projections}
+
+    full_tokens = projected_tokens = 0
+    for projection in spec.projections:
+        accumulator = ACCUMULATORS_BY_KEY.get(projection.state_key)
+        items = (
+            accumulator.items(state)
+            if accumulator
+            else state.get(projection.state_key) or []
+        )
+        rendered[projection.state_key] = project(items, projection, per_projection)
+        # What ADK's default {placeholder} injection would have sent
+        full_tokens += estimate_tokens(str(items))
+        projected_tokens += estimate_tokens(rendered[projection.state_key])
+
+    logger.info(
+        "[Projection] %s: %d → %d estimated tokens (saved %d)",
+        agent_name,
+        full_tokens,
+        projected_tokens,
+        full_tokens - projected_tokens,
+    )
+    if config.debug_mode:
+        print(
+            f"\n🪶 PROJECTION {agent_name}: {full_tokens} → {projected_tokens} "
+            f"tokens (saved {full_tokens - projected_tokens})"
+        )
+    return rendered
+
+
+# =============================================================================
+# INSTRUCTION PROVIDER
+# =============================================================================
+
+_PLACEHOLDER = re.compile(r"{+[^{}]*}+")
+_STATE_PREFIXES = ("app:", "user:", "temp:")
+
+
+def render_template(template: str, state: Any, overrides: dict[str, str]) -> str:
+    """Single-pass {key} substitution matching ADK's state injection rules.
+
+    Keys in ``overrides`` win over raw state; injected values are never
+    re-scanned, so braces inside source text are left untouched.
+    """
+
+    def replace(match: re.Match[str]) -> str:
+        key = match.group().lstrip("{").rstrip("}").strip()
+        optional = key.endswith("?")
+        key = key.removesuffix("?")
+        name = key
+        for prefix in _STATE_PREFIXES:
+            name = name.removeprefix(prefix)
+        if not name.isidentifier():
+            return match.group()
+        if key in overrides:
+            return overrides[key]
+        if key in state:
+            return str(state[key])
+        if optional:
+            return ""
+        raise KeyError(f"Context variable not found: `{key}`.")
+
+    return _PLACEHOLDER.sub(replace, template)
+
+
+def projected_instruction(
+    template: str,
+    agent_name: str,
+    budget_scale: float = 1.0,
+    overrides: dict[str, Any] | None = None,
+) -> Callable[[ReadonlyContext], str]:
+    """Instruction provider injecting per-agent projections into a prompt.
+
+    ``overrides`` replace session state values, e.g. the claims of one
+    fact-check shard.
+    """
+
+    def provider(context: ReadonlyContext) -> str:
+        state = ChainMap(overrides, context.state) if overrides else context.state
+        projections = project_state(agent_name, state, budget_scale)
+        return render_template(template, state, projections)
+
+    provider.__name__ = f"{agent_name}_instruction"
+    return provider
@@ -0,0 +1,303 @@
+"""
+Pre-call prompt budget enforcement.
+
+Before each model call the request is measured with the local token
+estimator (see projections.estimate_tokens). If it exceeds the agent's
+budget, a configurable trimming policy is applied step by step:
+
+- ``tool_outputs``: oldest tool responses first are reduced to their short
+  scalar fields (ids, URLs, flags); the responses the model is about to
+  answer are never touched
+- ``source_summaries``: the ``summary`` column of encoded source rows
+  (projections or an inline corpus) is shortened, then emptied
+
+Estimated and actual (usage metadata) prompt tokens are recorded per agent
+so the estimator can be checked against reality.
+"""
+
+import json
+import logging
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+
+from .config import config
+from .projections import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Scalar tool response fields kept when a response is trimmed
+_KEEP_SCALAR_CHARS = 100
+
+# Successive caps for per-source summaries (chars); 0 drops them entirely
+_SUMMARY_CAPS = (200, 80, 0)
+
+
+def _part_tokens(part: types.Part) -> int:
+    if part.text:
+        return estimate_tokens(part.text)
+    if part.function_call:
+        return estimate_tokens(json.dumps(part.function_call.args or {}, default=str))
+    if part.function_response:
+        return estimate_tokens(
+            json.dumps(part.function_response.response or {}, default=str)
+        )
+    return 0
+
+
+def estimate_request_tokens(llm_request: LlmRequest) -> int:
+    """Estimate prompt tokens of a request (instruction, contents, tools)."""
+    request_config = llm_request.config
+    tokens = estimate_tokens(str(request_config.system_instruction or ""))
+    for tool in request_config.tools or []:
+        dump = getattr(tool, "model_dump_json", None)
+        tokens += estimate_tokens(dump(exclude_none=True) if callable(dump) else "")
+    for content in llm_request.contents:
+        tokens += sum(_part_tokens(part) for part in content.parts or [])
+    return tokens
+
+
+# =============================================================================
+# TRIMMING STEPS
+# =============================================================================
+
+
+def _trimmed_response(response: dict[str, Any]) -> dict[str, Any]:
+    kept = {
+        key: value
+        for key, value in response.items()
+        if isinstance(value, bool | int | float)
+        or (isinstance(value, str) and len(value) <= _KEEP_SCALAR_CHARS)
+    }
+    return {**kept, "trimmed": True}
+
+
+def trim_tool_outputs(llm_request: LlmRequest, budget: int) -> bool:
+    """Trim tool responses oldest first until the request fits the budget."""
+    changed = False
+    # The last content holds the responses the model must answer now
+    for index, content in enumerate(llm_request.contents[:-1]):
+        if estimate_request_tokens(llm_request) <= budget:
+            break
+        parts = []
+        for part in content.parts or []:
+            response = part.function_response
+            if (
+                response
+                and isinstance(response.response, dict)
+                and not response.response.get("trimmed")
+            ):
+                part = types.Part(
+                    function_response=types.FunctionResponse(
+                        id=response.id,
+                        name=response.name,
+                        response=_trimmed_response(response.response),
+                    )
+                )
+            parts.append(part)
+        if any(
+            new is not old for new, old in zip(parts, content.parts or [], strict=True)
+        ):
+            # Copy instead of mutating the Content shared with session events
+            llm_request.contents[index] = content.model_copy(update={"parts": parts})
+            changed = True
+    return changed
+
+
+def shorten_source_summaries(text: str, max_chars: int) -> str:
+    """Cap the ``summary`` column of encoded source rows in a text block."""
+    summary_index: int | None = None
+    width = 0
+    lines = text.split("\n")
+    for number, line in enumerate(lines):
+        # Header rows may follow a label ("Accumulated Sources: [...]")
+        start = line.find("[")
+        try:
+            row = json.loads(line[start:]) if start >= 0 else None
+        except ValueError:
+            row = None
+        if not isinstance(row, list):
+            summary_index = None
+            continue
+        if "source_id" in row and "summary" in row:
+            summary_index, width = row.index("summary"), len(row)
+        elif summary_index is not None and len(row) == width:
+            summary = row[summary_index]
+            if isinstance(summary, str) and len(summary) > max_chars:
+                row[summary_index] = summary[:max_chars]
+                lines[number] = line[:start] + json.dumps(
+                    row, ensure_ascii=False, separators=(",", ":")
+                )
+    return "\n".join(lines)
+
+
+def trim_source_summaries(llm_request: LlmRequest, budget: int) -> bool:
+    """Shorten per-source summaries in the instruction and text contents."""
+    changed = False
+    request_config = llm_request.config
+    for max_chars in _SUMMARY_CAPS:
+        if estimate_request_tokens(llm_request) <= budget:
+            break
+        if isinstance(request_config.system_instruction, str):
+            shortened = shorten_source_summaries(
+                request_config.system_instruction, max_chars
+            )
+            changed |= shortened != request_config.system_instruction
+            request_config.system_instruction = shortened
+        for index, content in enumerate(llm_request.contents):
+            parts = [
+                (
+                    types.Part(text=shorten_source_summaries(part.text, max_chars))
+                    if part.text and not part.thought
+                    else part
+                )
+                for part in content.parts or []
+            ]
+            if any(
+                new.text != old.text
+                for new, old in zip(parts, content.parts or [], strict=True)
+            ):
+                llm_request.contents[index] = content.model_copy(
+                    update={"parts": parts}
+                )
+                changed = True
+    return changed
+
+
+TRIM_STEPS: dict[str, Callable[[LlmRequest, int], bool]] = {
+    "tool_outputs": trim_tool_outputs,
+    "source_summaries": trim_source_summaries,
+}
+
+
+# =============================================================================
+# BUDGET ENFORCEMENT
+# =============================================================================
+
+
+@dataclass
+class PromptUsage:
+    """Estimated vs actual prompt tokens for one agent."""
+
+    calls: int = 0
+    estimated_tokens: int = 0
+    actual_tokens: int = 0
+    trimmed_calls: int = 0
+
+
+class PromptBudget:
+    """Enforces per-agent prompt budgets and tracks estimator accuracy."""
+
+    def __init__(
+        self,
+        budgets: dict[str, int],
+        default_budget: int,
+        policy: list[str],
+    ) -> None:
+        self.budgets = budgets
+        self.default_budget = default_budget
+        self.policy = policy
+        self._usage: dict[str, PromptUsage] = {}
+        # Model call key → (estimate, sent with cached_content) of the pending call
+        self._pending: dict[Hashable, tuple[int, bool]] = {}
+
+    def budget_for(self, agent_name: str) -> int:
+        return self.budgets.get(agent_name, self.default_budget)
+
+    def enforce(
+        self, agent_name: str, llm_request: LlmRequest, call_key: Hashable = None
+    ) -> tuple[int, int]:
+        """Trim the request to the agent's budget.
+
+        ``call_key`` pairs the estimate with ``record_actual``; it must tell
+        concurrent calls of the same agent (shards, batches) apart.
+
+        Returns:
+            Estimated prompt tokens before and after trimming
+        """
+        budget = self.budget_for(agent_name)
+        before = after = estimate_request_tokens(llm_request)
+        if before > budget:
+            for step in self.policy:
+                TRIM_STEPS[step](llm_request, budget)
+                after = estimate_request_tokens(llm_request)
+                if after <= budget:
+                    break
+            usage = self._usage.setdefault(agent_name, PromptUsage())
+            usage.trimmed_calls += 1
+            logger.info(
+                "[PromptBudget] %s: %d → %d estimated tokens (budget %d)",
+                agent_name,
+                before,
+                after,
+                budget,
+            )
+            if after > budget:
+                logger.warning(
+                    "[PromptBudget] %s still over budget after trimming", agent_name
+                )
+        self._pending[call_key] = (after, bool(llm_request.config.cached_content))
+        return before, after
+
+    def record_actual(
+        self, agent_name: str, usage_metadata: Any, call_key: Hashable = None
+    ) -> tuple[int, int] | None:
+        """Pair the pending estimate with the response's actual prompt tokens.
+
+        The estimate of a request sent with ``cached_content`` only covers
+        what is sent inline, so it is compared with the uncached tokens.
+
+        Returns:
+            (estimated, actual) tokens, or None without an estimate or usage
+        """
+        actual = getattr(usage_metadata, "prompt_token_count", None) or 0
+        pending = self._pending.pop(call_key, None)
+        if pending is None or not actual:
+            return None
+        estimated, cached = pending
+        if cached:
+            actual -= getattr(usage_metadata, "cached_content_token_count", None) or 0
+
+        usage = self._usage.setdefault(agent_name, PromptUsage())
+        usage.calls += 1
+        usage.estimated_tokens += estimated
+        usage.actual_tokens += actual
+        logger.info(
+            "[PromptBudget] %s: estimated %d vs actual %d prompt tokens",
+            agent_name,
+            estimated,
+            actual,
+        )
+        return estimated, actual
+
+    def discard(self, call_key: Hashable = None) -> None:
+        """Forget the pending estimate of a call that failed without a response."""
+        self._pending.pop(call_key, None)
+
+    def report(self) -> dict[str, dict[str, float]]:
+        """Per-agent totals and the estimated/actual ratio."""
+        return {
+            agent_name: {
+                "calls": usage.calls,
+                "trimmed_calls": usage.trimmed_calls,
+                "estimated_tokens": usage.estimated_tokens,
+                "actual_tokens": usage.actual_tokens,
+                "estimate_ratio": (
+                    round(usage.estimated_tokens / usage.actual_tokens, 3)
+                    if usage.actual_tokens
+                    else 0.0
+                ),
+            }
+            for agent_name, usage in self._usage.items()
+        }
+
+
+# Global prompt budget enforcer
+prompt_budget = PromptBudget(
+    budgets=config.prompt_token_budgets,
+    default_budget=config.default_prompt_token_budget,
+    policy=config.prompt_trim_policy,
+)
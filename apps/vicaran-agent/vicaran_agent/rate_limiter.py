@@ -0,0 +1,177 @@
+"""
+Shared async rate limiter for model calls.
+
+Replaces the fixed pre-stage sleeps. Every model request reserves capacity
+against sliding one-minute windows of requests and (estimated) tokens and
+only waits when a configured quota would be exceeded. A 429 / quota error
+blocks all callers until its retry delay (or an exponential backoff) has
+passed, and the failed call is retried once after it; the next successful
+call resets the backoff. Waiting uses
+``asyncio.sleep``, so other sessions keep running.
+"""
+
+import asyncio
+import logging
+import random
+import re
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 60.0
+
+_RETRY_DELAY = re.compile(r"retryDelay['\"]?\s*:\s*['\"]?(\d+(?:\.\d+)?)s")
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether a model error is a 429 / resource-exhausted signal."""
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return code == 429 or "RESOURCE_EXHAUSTED" in str(error)
+
+
+def retry_after_seconds(error: BaseException) -> float | None:
+    """Server-suggested retry delay from a Retry-After header or RetryInfo."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    retry_after = headers.get("retry-after") if hasattr(headers, "get") else None
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    match = _RETRY_DELAY.search(str(getattr(error, "details", "") or error))
+    return float(match.group(1)) if match else None
+
+
+class ModelRateLimiter:
+    """Sliding-window request/token limiter with 429 backoff."""
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        base_backoff_seconds: float = 2.0,
+        max_backoff_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._clock = clock
+        self._sleep = sleep
+        # (timestamp, estimated tokens) of admitted requests
+        self._window: deque[tuple[float, int]] = deque()
+        self._window_tokens = 0
+        self._blocked_until = 0.0
+        self._consecutive_limits = 0
+        self.throttled_calls = 0
+        self.blocked_seconds_total = 0.0
+
+    def _prune(self, now: float) -> None:
+        while self._window and self._window[0][0] <= now - WINDOW_SECONDS:
+            _, tokens = self._window.popleft()
+            self._window_tokens -= tokens
+
+    def current_wait(self, tokens: int = 0) -> float:
+        """Seconds a request of ``tokens`` would have to wait right now."""
+        now = self._clock()
+        self._prune(now)
+        wait = max(0.0, self._blocked_until - now)
+
+        if self.requests_per_minute and len(self._window) >= self.requests_per_minute:
+            oldest = self._window[len(self._window) - self.requests_per_minute][0]
+            wait = max(wait, oldest + WINDOW_SECONDS - now)
+
+        if self.tokens_per_minute and self._window:
+            # A request larger than the whole quota only waits for an empty window
+            excess = self._window_tokens + min(tokens, self.tokens_per_minute)
+            excess -= self.tokens_per_minute
+            for timestamp, reserved in self._window:
+                if excess <= 0:
+                    break
+                excess -= reserved
+                wait = max(wait, timestamp + WINDOW_SECONDS - now)
+        return wait
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """Wait until the request fits the quotas, then reserve it.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while (wait := self.current_wait(tokens)) > 0:
+            if waited == 0:
+                self.throttled_calls += 1
+                logger.info("[RateLimiter] waiting %.1fs for quota", wait)
+            await self._sleep(wait)
+            waited += wait
+
+        self.blocked_seconds_total += waited
+        self._window.append((self._clock(), tokens))
+        self._window_tokens += tokens
+        return waited
+
+    def concurrency_limit(self, ceiling: int) -> int:
+        """How many concurrent callers fit the current request headroom.
+
+        Returns:
+            Between 1 and ``ceiling``; 1 while calls are blocked by a 429
+        """
+        now = self._clock()
+        self._prune(now)
+        if self._blocked_until > now:
+            return 1
+        if not self.requests_per_minute:
+            return max(1, ceiling)
+        headroom = self.requests_per_minute - len(self._window)
+        return max(1, min(ceiling, headroom))
+
+    def record_rate_limit(self, retry_after: float | None = None) -> float:
+        """Block all callers after a 429.
+
+        Returns:
+            Seconds until calls are admitted again
+        """
+        self._consecutive_limits += 1
+        if retry_after is None:
+            backoff = self.base_backoff_seconds * 2 ** (self._consecutive_limits - 1)
+            retry_after = min(self.max_backoff_seconds, backoff) * (
+                0.5 + random.random() / 2
+            )
+        self._blocked_until = max(self._blocked_until, self._clock() + retry_after)
+        logger.warning("[RateLimiter] rate limited, blocking for %.1fs", retry_after)
+        return retry_after
+
+    def record_success(self) -> None:
+        """Reset the 429 backoff after a successful call."""
+        self._consecutive_limits = 0
+
+    def stats(self) -> dict[str, float]:
+        """Current load, current wait and cumulative blocked time."""
+        now = self._clock()
+        self._prune(now)
+        return {
+            "requests_last_minute": len(self._window),
+            "tokens_last_minute": self._window_tokens,
+            "current_wait_seconds": round(self.current_wait(), 3),
+            "blocked_until_seconds": round(max(0.0, self._blocked_until - now), 3),
+            "throttled_calls": self.throttled_calls,
+            "blocked_seconds_total": round(self.blocked_seconds_total, 3),
+        }
+
+
+# Global model rate limiter (shared by every session in this process)
+model_rate_limiter = ModelRateLimiter(
+    requests_per_minute=config.model_requests_per_minute,
+    tokens_per_minute=config.model_tokens_per_minute,
+    base_backoff_seconds=config.rate_limit_base_backoff_seconds,
+    max_backoff_seconds=config.rate_limit_max_backoff_seconds,
+)
@@ -0,0 +1,88 @@
+"""
+ADK API server app for local development (scripts/run_adk_api.py).
+
+Builds the same FastAPI app as ``adk api_server`` and adds:
+
+- a startup hook that starts the callback outbox sender on the server's
+  event loop, so callbacks left over from a previous process are delivered
+  right away instead of with the next investigation
+- ``POST /investigations/{investigation_id}/cancel``, which the web app
+  calls when an investigation is abandoned or its run request times out
+"""
+
+import argparse
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from fastapi import FastAPI
+from google.adk.cli.fast_api import get_fast_api_app
+from pydantic import BaseModel
+
+from .cancellation import investigation_cancellations
+from .outbox import callback_outbox
+
+# Directory holding the vicaran_agent package (what `adk api_server .` serves)
+AGENTS_DIR = str(Path(__file__).resolve().parent.parent)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start the callback outbox sender once the server loop is running."""
+    callback_outbox.start()
+    yield
+
+
+class CancelRequest(BaseModel):
+    """Body of the cancel route."""
+
+    reason: str = "Cancelled by the user"
+    # Report the run as failed (INVESTIGATION_FAILED); not needed for deletions
+    notify: bool = False
+
+
+def create_app(
+    session_service_uri: str | None = None,
+    allow_origins: list[str] | None = None,
+    agents_dir: str = AGENTS_DIR,
+) -> FastAPI:
+    """Create the ADK API app with Vicaran's startup hook and routes."""
+    app = get_fast_api_app(
+        agents_dir=agents_dir,
+        session_service_uri=session_service_uri,
+        allow_origins=allow_origins,
+        web=False,
+        lifespan=lifespan,
+    )
+
+    @app.post("/investigations/{investigation_id}/cancel")
+    async def cancel_investigation(
+        investigation_id: str, request: CancelRequest | None = None
+    ) -> dict[str, bool]:
+        """Stop the investigation's run on this server, if it has one."""
+        request = request or CancelRequest()
+        cancelled = investigation_cancellations.cancel(
+            investigation_id, request.reason, request.notify
+        )
+        return {"success": True, "cancelled": cancelled}
+
+    return app
+
+
+def main() -> None:
+    """Serve the app with uvicorn (flags mirror `adk api_server`)."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--session_service_uri")
+    parser.add_argument("--allow_origins", action="append")
+    args = parser.parse_args()
+
+    app = create_app(args.session_service_uri, args.allow_origins)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,471 @@
+"""
+Code-driven source discovery.
+
+An alternative to the tool-calling ``source_finder``: Python derives search
+queries from the investigation title and plan, runs the searches, ranks and
+de-duplicates the results, fetches pages concurrently and saves each source
+through the same path as ``callback_api_tool``. The model is only asked to
+summarize, score and extract key claims (``source_summarizer``), instead of
+driving search → fetch → summarize → save one sequential turn at a time.
+Fetched pages are assessed several per structured-output call, with batches
+sized to the token budget; pages a malformed batch leaves out are assessed
+one call per page. Saved sources land in ``sources_accumulated`` in the
+usual shape.
+"""
+
+import asyncio
+import math
+import re
+from collections import ChainMap, Counter
+from collections.abc import AsyncGenerator, MutableMapping
+from typing import Any
+from urllib.parse import urlparse
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.events import Event, EventActions
+from google.adk.sessions.state import State
+from google.genai import types
+from pydantic import ValidationError
+
+from .accumulators import sources_accumulator
+from .budget import investigation_budget
+from .callbacks import normalize_url
+from .cancellation import investigation_cancellations
+from .config import config
+from .event_merge import branch_context, final_text
+from .models import SourceAssessment, SourceBatch
+from .projections import estimate_tokens, render_template
+from .prompt_budget import prompt_budget
+from .rate_limiter import model_rate_limiter
+from .tools.callback_api import save_item
+from .tools.jina_reader import fetch_url
+from .tools.tavily_search import SearchResult, search_web
+
+_URL = re.compile(r"https?://[^\s<>()\[\]\"']+")
+# Bullets under "**What I'll Investigate:**" in the orchestrator's plan
+_PLAN_QUESTIONS = re.compile(r"\*\*What I'll Investigate:\*\*\s*\n((?:[ \t]*-.*\n?)+)")
+_FENCE = re.compile(r"^```\w*\s*|\s*```$")
+
+# Results returned by several queries rank this much higher per extra query
+_REPEAT_BONUS = 0.1
+
+
+def search_queries(
+    investigation_config: dict[str, Any], plan: str, max_queries: int
+) -> list[str]:
+    """Search queries from the title (or brief) and the plan's key questions."""
+    candidates = [
+        investigation_config.get("title")
+        or str(investigation_config.get("brief", ""))[:200]
+    ]
+    match = _PLAN_QUESTIONS.search(plan or "")
+    if match:
+        candidates.extend(
+            line.strip().removeprefix("-") for line in match.group(1).splitlines()
+        )
+
+    queries: list[str] = []
+    for candidate in candidates:
+        query = " ".join(str(candidate or "").split())
+        # Skip empty lines and unfilled template placeholders ("[key question 1]")
+        if not query or query.startswith("["):
+            continue
+        if query.lower() not in (existing.lower() for existing in queries):
+            queries.append(query)
+    return queries[:max_queries]
+
+
+def user_urls(state: MutableMapping[str, Any]) -> list[str]:
+    """Explicit URLs from ``user_sources`` and the investigation brief."""
+    urls: list[str] = []
+    for source in state.get("user_sources") or []:
+        url = source.get("url", "") if isinstance(source, dict) else str(source)
+        if url:
+            urls.append(url)
+    brief = (state.get("investigation_config") or {}).get("brief", "")
+    urls.extend(url.rstrip(".,;:") for url in _URL.findall(brief))
+    return urls
+
+
+def rank_candidates(
+    result_lists: list[list[SearchResult]],
+    first_urls: list[str] | None = None,
+    exclude: set[str] | None = None,
+    max_per_domain: int = 3,
+) -> list[SearchResult]:
+    """De-duplicated search results, best first.
+
+    ``first_urls`` (user-provided) lead; results returned by several queries
+    rank higher; results beyond ``max_per_domain`` from one domain go last.
+    URLs in ``exclude`` (normalized, e.g. already saved) are dropped.
+    """
+    exclude = set(exclude or ())
+    best: dict[str, SearchResult] = {}
+    hits: Counter[str] = Counter()
+    for results in result_lists:
+        for result in results:
+            key = normalize_url(result["url"])
+            if not key or key in exclude:
+                continue
+            hits[key] += 1
+            if key not in best or result["score"] > best[key]["score"]:
+                best[key] = result
+
+    leading: list[SearchResult] = []
+    for url in first_urls or []:
+        key = normalize_url(url)
+        if key and key not in exclude:
+            exclude.add(key)
+            leading.append(
+                best.pop(key, None)
+                or {"title": "", "url": url, "content": "", "score": 1.0}
+            )
+
+    ranked = sorted(
+        best,
+        key=lambda key: best[key]["score"] + _REPEAT_BONUS * (hits[key] - 1),
+        reverse=True,
+    )
+    per_domain: Counter[str] = Counter()
+    diverse: list[SearchResult] = []
+    repeated: list[SearchResult] = []
+    for key in ranked:
+        domain = urlparse(key).netloc
+        per_domain[domain] += 1
+        (diverse if per_domain[domain] <= max_per_domain else repeated).append(
+            best[key]
+        )
+    return leading + diverse + repeated
+
+
+def _source_line(number: int, total: int, source: dict[str, Any]) -> str:
+    """Per-source progress in the format the web app's source card parses."""
+    stars = source["credibility_score"]
+    finding = (source["key_claims"] or [source["summary"]])[0]
+    return (
+        f"📄 **Analyzing source {number}/{total}:** {source['title']}\n"
+        f"   {'⭐' * stars} {stars}/5 | {source['domain']}\n"
+        f'   💡 Key finding: "{finding[:200]}"\n'
+        f"   🆔 Saved as source_id: {source['source_id']}"
+    )
+
+
+def _completion_summary(sources: list[dict[str, Any]], skipped: int) -> str:
+    scores = [source["credibility_score"] for source in sources]
+    return (
+        f"✅ **All {len(sources)} sources analyzed!**\n"
+        f"   • {sum(s >= 4 for s in scores)} high-credibility sources (⭐⭐⭐⭐⭐)\n"
+        f"   • {sum(s == 3 for s in scores)} medium-credibility sources (⭐⭐⭐)\n"
+        f"   • {sum(s <= 2 for s in scores)} low-credibility sources (⭐⭐)\n"
+        f"   • {skipped} sources skipped (blocked/unavailable)"
+    )
+
+
+def _page_text(page: dict[str, Any]) -> str:
+    return (
+        f"URL: {page['url']}\nTitle: {page['title']}\nDomain: {page['domain']}\n\n"
+        f"{page['content']}"
+    )
+
+
+class SourceDiscoveryAgent(BaseAgent):
+    """Searches, fetches and saves sources in code; the model only summarizes."""
+
+    # Source summarizer (instruction template with {fetched_page})
+    summarizer: LlmAgent
+    # Summarizer for several pages per call (template with {fetched_pages},
+    # SourceBatch output); None assesses every page on its own
+    batch_summarizer: LlmAgent | None = None
+    output_key: str = "discovered_sources"
+    max_queries: int = 4
+    results_per_query: int = 10
+    overfetch: float = 1.5
+    fetch_concurrency: int = 8
+    summarize_concurrency: int = 4
+    batch_token_budget: int = 12000
+    max_batch_pages: int = 6
+
+    def _page_budget(self) -> int:
+        """Estimated page tokens per batch, within the summarizer's prompt budget."""
+        if self.batch_summarizer is None:
+            return 0
+        template_tokens = estimate_tokens(str(self.batch_summarizer.instruction))
+        prompt_tokens = prompt_budget.budget_for(self.batch_summarizer.name)
+        return min(self.batch_token_budget, prompt_tokens - template_tokens)
+
+    async def _final_text(
+        self,
+        agent: LlmAgent,
+        overrides: dict[str, str],
+        ctx: InvocationContext,
+        branch: str,
+    ) -> str:
+        template = agent.instruction
+
+        def provider(context: ReadonlyContext) -> str:
+            return render_template(template, ChainMap(overrides, context.state), {})
+
+        text = ""
+        # Assessments are folded into this stage's own progress output, so
+        # the summarizer's raw JSON is not added to the conversation
+        clone = agent.clone(update={"instruction": provider})
+        async for event in clone.run_async(branch_context(ctx, branch)):
+            if event.is_final_response():
+                text = final_text(event)
+        return _FENCE.sub("", text.strip())
+
+    async def _summarize(
+        self, ctx: InvocationContext, page: dict[str, Any], branch: str
+    ) -> SourceAssessment | None:
+        text = await self._final_text(
+            self.summarizer, {"fetched_page": _page_text(page)}, ctx, branch
+        )
+        try:
+            return SourceAssessment.model_validate_json(text)
+        except ValidationError:
+            if config.debug_mode:
+                print(f"⚠️ SKIPPED: {page['url']} (unusable page assessment)")
+            return None
+
+    async def _summarize_batch(
+        self, ctx: InvocationContext, pages: list[dict[str, Any]], branch: str
+    ) -> dict[str, SourceAssessment]:
+        """Assess several pages in one call, keyed by normalized URL."""
+        pages_text = "\n\n".join(
+            f"### Page {number}\n{_page_text(page)}"
+            for number, page in enumerate(pages, 1)
+        )
+        text = await self._final_text(
+            self.batch_summarizer, {"fetched_pages": pages_text}, ctx, branch
+        )
+        try:
+            batch = SourceBatch.model_validate_json(text)
+        except ValidationError:
+            return {}
+        return {
+            normalize_url(record.url): SourceAssessment(
+                summary=record.summary,
+                credibility_score=record.credibility_score,
+                key_claims=record.key_claims,
+            )
+            for record in batch.sources
+        }
+
+    async def _assess_pages(
+        self, ctx: InvocationContext, pages: list[dict[str, Any]], index: int
+    ) -> list[tuple[dict[str, Any], SourceAssessment | None]]:
+        """Assess a batch; pages a malformed batch left out are retried singly."""
+        branch = f"{self.name}.batch_{index}"
+        assessments: dict[str, SourceAssessment] = {}
+        if len(pages) > 1 and self.batch_summarizer is not None:
+            assessments = await self._summarize_batch(ctx, pages, branch)
+        missing = [p for p in pages if normalize_url(p["url"]) not in assessments]
+        if config.debug_mode and len(pages) > 1 and missing:
+            print(
+                f"\n⚠️ BATCH {index}: {len(missing)}/{len(pages)} pages unusable, "
+                "summarizing them one by one"
+            )
+        singles = await asyncio.gather(
+            *(
+                self._summarize(ctx, page, f"{branch}.page_{number}")
+                for number, page in enumerate(missing)
+            )
+        )
+        for page, assessment in zip(missing, singles, strict=True):
+            if assessment is not None:
+                assessments[normalize_url(page["url"])] = assessment
+        return [(page, assessments.get(normalize_url(page["url"]))) for page in pages]
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        investigation_config = state.get("investigation_config") or {}
+        investigation_id = state.get("investigation_id", "")
+        limit = (
+            investigation_config.get("source_limit") or config.quick_mode_source_limit
+        )
+        # Sources saved before a resume count toward the limit
+        already_saved = {
+            normalize_url(source.get("url", ""))
+            for source in sources_accumulator.items(state)
+        }
+        remaining = (
+            max(
+                0,
+                investigation_budget.source_limit(investigation_id, limit)
+                - len(already_saved),
+            )
+            if investigation_id
+            else 0
+        )
+
+        queries = search_queries(
+            investigation_config,
+            state.get("investigation_plan", ""),
+            self.max_queries,
+        )
+        investigation_cancellations.check(investigation_id)
+        for _ in queries:
+            investigation_budget.record_tool_call(investigation_id)
+        responses = await asyncio.gather(
+            *(search_web(query, self.results_per_query) for query in queries)
+        )
+        candidates = rank_candidates(
+            [response["results"] for response in responses if response["success"]],
+            user_urls(state),
+            already_saved,
+        )[: math.ceil(remaining * self.overfetch)]
+        if config.debug_mode:
+            print(
+                f"\n🧭 SOURCE DISCOVERY: {len(queries)} queries, "
+                f"{len(candidates)} candidates for {remaining} sources"
+            )
+
+        fetch_semaphore = asyncio.Semaphore(self.fetch_concurrency)
+        summarize_semaphore = asyncio.Semaphore(
+            model_rate_limiter.concurrency_limit(self.summarize_concurrency)
+        )
+        # ("fetched", page) or ("assessed", [(page, assessment), ...])
+        queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+
+        async def fetch(candidate: SearchResult) -> None:
+            async with fetch_semaphore:
+                investigation_cancellations.check(investigation_id)
+                investigation_budget.record_tool_call(investigation_id)
+                page = await fetch_url(candidate["url"])
+            await queue.put(
+                ("fetched", {**page, "title": candidate["title"] or page["domain"]})
+            )
+
+        async def assess(index: int, pages: list[dict[str, Any]]) -> None:
+            try:
+                async with summarize_semaphore:
+                    assessed = await self._assess_pages(ctx, pages, index)
+            except Exception as e:
+                if config.debug_mode:
+                    print(f"❌ BATCH {index} FAILED: {e}")
+                assessed = [(page, None) for page in pages]
+            await queue.put(("assessed", assessed))
+
+        tasks = [asyncio.create_task(fetch(candidate)) for candidate in candidates]
+        page_budget = self._page_budget()
+        pending_fetches, running = len(candidates), 0
+        # Reachable pages waiting for a source slot, and the batch being filled
+        spare: list[dict[str, Any]] = []
+        batch: list[dict[str, Any]] = []
+        batch_tokens = reserved = skipped = 0
+        sources: list[dict[str, Any]] = []
+        lines: list[str] = []
+
+        def start_batch() -> None:
+            nonlocal batch, batch_tokens, running
+            index = len(tasks) - len(candidates)
+            tasks.append(asyncio.create_task(assess(index, batch)))
+            batch, batch_tokens = [], 0
+            running += 1
+
+        try:
+            while pending_fetches or running:
+                # Settle for fewer sources once the budget starts running out
+                remaining = min(
+                    remaining,
+                    investigation_budget.source_limit(investigation_id, limit)
+                    - len(already_saved),
+                )
+                if len(sources) >= remaining:
+                    break
+                kind, payload = await queue.get()
+                if kind == "fetched":
+                    pending_fetches -= 1
+                    if payload["is_reachable"]:
+                        spare.append(payload)
+                    else:
+                        skipped += 1
+                else:
+                    running -= 1
+                    for page, assessment in payload:
+                        if assessment is None:
+                            # Free the slot for a spare page
+                            reserved -= 1
+                            continue
+                        if len(sources) >= remaining:
+                            continue
+                        data = {
+                            "url": page["url"],
+                            "title": page["title"],
+                            "summary": assessment.summary[:500],
+                            "credibility_score": assessment.credibility_score,
+                            "key_claims": assessment.key_claims,
+                        }
+                        # Writes go through a State so the event carries only
+                        # the new item
+                        delta: dict[str, Any] = {}
+                        try:
+                            result = await save_item(
+                                State(state, delta),
+                                investigation_id,
+                                "SOURCE_FOUND",
+                                data,
+                            )
+                        except Exception as e:
+                            if config.debug_mode:
+                                print(f"❌ SOURCE NOT SAVED: {page['url']} ({e})")
+                            reserved -= 1
+                            continue
+                        if not result.get("source_id"):
+                            reserved -= 1
+                            continue
+
+                        source = {**data, "domain": page["domain"], **result}
+                        sources.append(source)
+                        lines.append(_source_line(len(sources), limit, source))
+                        yield Event(
+                            invocation_id=ctx.invocation_id,
+                            author=self.name,
+                            branch=ctx.branch,
+                            content=types.Content(
+                                role="model", parts=[types.Part(text=lines[-1])]
+                            ),
+                            actions=EventActions(state_delta=delta),
+                        )
+                    if len(sources) >= remaining:
+                        break
+
+                # Give open source slots to waiting pages, batched so each
+                # call's pages fit the token budget
+                while spare and reserved < remaining:
+                    page = spare.pop(0)
+                    tokens = estimate_tokens(page["content"])
+                    if batch and (
+                        batch_tokens + tokens > page_budget
+                        or len(batch) >= self.max_batch_pages
+                    ):
+                        start_batch()
+                    batch.append(page)
+                    batch_tokens += tokens
+                    reserved += 1
+                # Send the batch once it is full or no more pages can join it
+                if batch and (
+                    len(batch) >= self.max_batch_pages
+                    or batch_tokens >= page_budget
+                    or reserved >= remaining
+                    or not pending_fetches
+                ):
+                    start_batch()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        summary = _completion_summary(sources, skipped)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=summary)]),
+            actions=EventActions(
+                state_delta={self.output_key: "\n\n".join([*lines, summary])}
+            ),
+        )
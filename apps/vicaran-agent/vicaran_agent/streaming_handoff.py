@@ -0,0 +1,142 @@
+"""
+Producer/consumer hand-off from source finding to claim extraction.
+
+Instead of waiting for the source finder to finish, claims are extracted
+from saved sources in micro-batches while later sources are still being
+searched and fetched. Every ``streaming_handoff_batch_size`` new entries in
+``sources_accumulated`` start a claim-extractor clone (on its own branch,
+seeing only that batch); the remainder is handed off when the source finder
+finishes. When more than one batch ran, a final reconciliation pass looks
+across all sources for claims no single batch could see. The batches' claim
+lists are concatenated into the output key for the stage's after-agent hook
+to persist in one bulk write.
+"""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+from .accumulators import sources_accumulator
+from .callbacks import PIPELINE_TERMINATION_KEY
+from .config import config
+from .event_merge import EventMerger, branch_context, final_text
+from .models import Claim
+from .projections import projected_instruction
+from .rate_limiter import model_rate_limiter
+from .structured_outputs import merge_outputs
+
+
+class StreamingHandoffAgent(BaseAgent):
+    """Runs the source finder and overlapping claim-extraction micro-batches."""
+
+    producer: BaseAgent
+    # Claim-extractor stage without agent-level callbacks (they run on this agent)
+    extractor: LlmAgent
+    template: str
+    reconcile_template: str
+    budget_scale: float = 1.0
+    output_key: str = "extracted_claims"
+    batch_size: int = 3
+    max_concurrency: int = 2
+
+    def _batch_agent(self, batch: list[dict[str, Any]]) -> LlmAgent:
+        return self.extractor.clone(
+            update={
+                "instruction": projected_instruction(
+                    self.template,
+                    self.extractor.name,
+                    self.budget_scale,
+                    {"sources_accumulated": batch},
+                ),
+                "output_key": None,
+            }
+        )
+
+    def _reconcile_agent(self, claims: list[dict[str, Any]]) -> LlmAgent:
+        # Batch claims are only saved after the stage, so pass them in directly
+        return self.extractor.clone(
+            update={
+                "instruction": projected_instruction(
+                    self.reconcile_template,
+                    "claim_reconciler",
+                    self.budget_scale,
+                    {"claims_accumulated": claims},
+                ),
+                "output_key": None,
+            }
+        )
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        merger = EventMerger()
+        semaphore = asyncio.Semaphore(
+            model_rate_limiter.concurrency_limit(self.max_concurrency)
+        )
+        handed_off = 0
+        batch_branches: dict[str, int] = {}
+        producer_done = False
+
+        def hand_off(final: bool = False) -> None:
+            nonlocal handed_off
+            sources = sources_accumulator.items(ctx.session.state)
+            while len(sources) - handed_off >= self.batch_size or (
+                final and len(sources) > handed_off
+            ):
+                batch = list(sources[handed_off : handed_off + self.batch_size])
+                handed_off += len(batch)
+                index = len(batch_branches)
+                batch_ctx = branch_context(ctx, f"{self.name}.batch_{index}")
+                batch_branches[batch_ctx.branch] = index
+                merger.add(self._batch_agent(batch).run_async(batch_ctx), semaphore)
+                if config.debug_mode:
+                    print(
+                        f"\n🔁 HAND-OFF: batch {index} with {len(batch)} sources "
+                        f"({'after' if producer_done else 'during'} source finding)"
+                    )
+
+        def producer_finished() -> None:
+            nonlocal producer_done
+            producer_done = True
+            hand_off(final=True)
+
+        merger.add(self.producer.run_async(ctx), on_finish=producer_finished)
+
+        outputs: dict[int, str] = {}
+        async with contextlib.aclosing(merger.events()) as events:
+            async for event in events:
+                if event.branch in batch_branches and event.is_final_response():
+                    outputs[batch_branches[event.branch]] = final_text(event)
+                yield event
+                # The source finder found nothing: the router stops the pipeline
+                if event.actions.state_delta.get(PIPELINE_TERMINATION_KEY):
+                    return
+                if not producer_done:
+                    hand_off()
+
+        if len(batch_branches) > 1:
+            reconcile_ctx = branch_context(ctx, f"{self.name}.reconcile")
+            claims = merge_outputs([outputs[index] for index in sorted(outputs)], Claim)
+            reconciler = self._reconcile_agent(claims)
+            async for event in reconciler.run_async(reconcile_ctx):
+                if event.is_final_response():
+                    outputs[len(batch_branches)] = final_text(event)
+                yield event
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(
+                state_delta={
+                    self.output_key: merge_outputs(
+                        [outputs[index] for index in sorted(outputs)], Claim
+                    )
+                }
+            ),
+        )
@@ -0,0 +1,217 @@
+"""
+Schema-constrained outputs of the claim extractor, fact checker and
+quick analyzer.
+
+These stages answer with JSON (``output_schema``) instead of saving items
+one tool call at a time: a list of ``Claim`` / ``FactCheck`` records, or one
+``QuickAnalysis``. Their after-agent hooks validate the output here, turn it
+into callback payloads for one bulk write per type, and replace the raw
+JSON in state with the readable reports downstream prompts expect.
+"""
+
+import json
+import re
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from .models import Claim, FactCheck, QuickClaim, SourceBias
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_FENCE = re.compile(r"^```\w*\s*$", re.MULTILINE)
+
+_VERDICT_LABELS = {
+    "VERIFIED": "✅ **VERIFIED**",
+    "PARTIALLY_TRUE": "⚠️ **PARTIALLY TRUE**",
+    "FALSE": "❌ **FALSE**",
+    "UNVERIFIED": "❓ **UNVERIFIED**",
+}
+
+# Callback route limit for evidence_text
+_EVIDENCE_CHARS = 500
+
+
+def parse_items(raw: Any, model: type[ModelT]) -> list[ModelT]:
+    """Validate a structured output item by item, skipping invalid records.
+
+    ``raw`` is the validated list ADK stored under the output key, or the
+    final response text of a clone (JSON, optionally in a code fence).
+    """
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(_FENCE.sub("", raw).strip() or "[]")
+        except json.JSONDecodeError:
+            return []
+    if isinstance(raw, dict):
+        # A wrapper object ({"claims": [...]}) instead of a bare list
+        raw = next((value for value in raw.values() if isinstance(value, list)), [raw])
+    if not isinstance(raw, list):
+        return []
+
+    items: list[ModelT] = []
+    for record in raw:
+        try:
+            items.append(model.model_validate(record))
+        except ValidationError:
+            continue
+    return items
+
+
+def merge_outputs(outputs: list[Any], model: type[BaseModel]) -> list[dict[str, Any]]:
+    """Concatenate the structured outputs of several clones (batches, shards)."""
+    return [
+        item.model_dump(exclude_none=True)
+        for output in outputs
+        for item in parse_items(output, model)
+    ]
+
+
+def _normalized(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def claim_payloads(claims: list[Claim], source_ids: set[str]) -> list[dict[str, Any]]:
+    """CLAIM_EXTRACTED payloads, deduplicated by claim text.
+
+    Source IDs the model made up are dropped; duplicates are merged into the
+    first occurrence (sources unioned, highest importance kept).
+    """
+    payloads: dict[str, dict[str, Any]] = {}
+    for claim in claims:
+        text = claim.claim_text.strip()
+        if not text:
+            continue
+        sources = [sid for sid in claim.source_ids if sid in source_ids]
+        payload = payloads.get(_normalized(text))
+        if payload is None:
+            payloads[_normalized(text)] = {
+                "claim_text": text,
+                "source_ids": list(dict.fromkeys(sources)),
+                "importance_score": claim.importance_score,
+            }
+            continue
+        payload["source_ids"] += [s for s in sources if s not in payload["source_ids"]]
+        payload["importance_score"] = max(
+            payload["importance_score"], claim.importance_score
+        )
+    return list(payloads.values())
+
+
+def complete_fact_checks(
+    checks: list[FactCheck], claims: list[dict[str, Any]]
+) -> list[FactCheck]:
+    """One fact check per accumulated claim, in claim order.
+
+    Checks for unknown claim IDs are dropped, repeated ones keep the first,
+    and claims the model skipped are reported as UNVERIFIED.
+    """
+    by_claim: dict[str, FactCheck] = {}
+    for check in checks:
+        by_claim.setdefault(check.claim_id, check)
+    return [
+        by_claim.get(claim["claim_id"])
+        or FactCheck(
+            claim_id=claim["claim_id"],
+            verdict="UNVERIFIED",
+            evidence_summary="No verdict was returned for this claim.",
+            confidence_score=0.0,
+        )
+        for claim in claims
+    ]
+
+
+def persisted_fact_checks(checks: list[FactCheck]) -> list[FactCheck]:
+    """Checks worth saving as evidence.
+
+    UNVERIFIED checks (including the placeholders for skipped claims) carry
+    no evidence, and the callback route would count them as supporting.
+    """
+    return [check for check in checks if check.verdict != "UNVERIFIED"]
+
+
+def fact_check_payload(check: FactCheck, claim: dict[str, Any]) -> dict[str, Any]:
+    """FACT_CHECKED payload (the callback route rejects verdict/confidence)."""
+    payload = {
+        "claim_id": check.claim_id,
+        "evidence_text": check.evidence_summary[:_EVIDENCE_CHARS],
+        "evidence_type": "contradicting" if check.verdict == "FALSE" else "supporting",
+    }
+    # Omitted rather than null (Zod rejects null)
+    source_ids = claim.get("source_ids") or []
+    if source_ids:
+        payload["source_id"] = source_ids[0]
+    return payload
+
+
+def quick_fact_checks(
+    claims: list[QuickClaim], saved: list[dict[str, Any]]
+) -> list[FactCheck]:
+    """Verdicts of quick-analysis claims, keyed by the IDs they were saved under."""
+    claim_ids = {_normalized(claim["claim_text"]): claim["claim_id"] for claim in saved}
+    return [
+        FactCheck(
+            claim_id=claim_ids[_normalized(claim.claim_text)],
+            verdict=claim.verdict,
+            evidence_summary=claim.evidence_summary,
+            confidence_score=claim.confidence_score,
+        )
+        for claim in claims
+        if _normalized(claim.claim_text) in claim_ids
+    ]
+
+
+def _importance_label(score: float) -> str:
+    if score >= 0.7:
+        return "HIGH"
+    return "MEDIUM" if score >= 0.4 else "LOW"
+
+
+def render_claims(claims: list[dict[str, Any]]) -> str:
+    """Claim extraction report for downstream prompts."""
+    rows = "\n".join(
+        f"| {n} | {claim['claim_text']} | "
+        f"{_importance_label(claim.get('importance_score') or 0)} | "
+        f"{claim.get('claim_id', '')} |"
+        for n, claim in enumerate(claims, 1)
+    )
+    return (
+        "**Claim Extraction Complete**\n\n"
+        f"Saved {len(claims)} claims to database:\n\n"
+        "| # | Claim | Importance | Claim ID |\n"
+        "|---|-------|------------|----------|\n"
+        f"{rows}"
+    )
+
+
+def render_fact_checks(
+    checks: list[FactCheck], claims: dict[str, dict[str, Any]]
+) -> str:
+    """Fact-checking report for downstream prompts."""
+    entries = "\n\n".join(
+        f"{n}. {_VERDICT_LABELS[check.verdict]} - "
+        f"\"{claims.get(check.claim_id, {}).get('claim_text', '')}\"\n"
+        f"   - Claim ID: {check.claim_id}\n"
+        f"   - Evidence: {check.evidence_summary}\n"
+        f"   - Confidence: {check.confidence_score:.0%}"
+        + (
+            f"\n   🆔 Saved as fact_check_id: {check.fact_check_id}"
+            if check.fact_check_id
+            else ""
+        )
+        for n, check in enumerate(checks, 1)
+    )
+    return f"**Fact-Checking Complete**\n\nVerified {len(checks)} claims:\n\n{entries}"
+
+
+def render_source_biases(
+    biases: list[SourceBias], sources: dict[str, dict[str, Any]]
+) -> str:
+    """Bias analysis report for downstream prompts."""
+    entries = "\n\n".join(
+        f"{n}. **{sources.get(bias.source_id, {}).get('title', bias.source_id)}**\n"
+        f"   - Score: {bias.bias_score}/10\n"
+        f"   - Reason: {bias.reason}"
+        for n, bias in enumerate(biases, 1)
+    )
+    return f"**Bias Analysis Complete**\n\n{entries}"
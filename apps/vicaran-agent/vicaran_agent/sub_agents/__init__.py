@@ -5,15 +5,19 @@ Sub-agents module for Vicaran investigation pipeline.
 from .bias_analyzer import bias_analyzer
 from .claim_extractor import claim_extractor
 from .fact_checker import fact_checker
+from .quick_analyzer import quick_analyzer
 from .source_finder import source_finder
+from .source_summarizer import source_summarizer
 from .summary_writer import summary_writer
 from .timeline_builder import timeline_builder
 
 __all__ = [
     "source_finder",
+    "source_summarizer",
     "claim_extractor",
     "fact_checker",
     "bias_analyzer",
     "timeline_builder",
     "summary_writer",
+    "quick_analyzer",
 ]
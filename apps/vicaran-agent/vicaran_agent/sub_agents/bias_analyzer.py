@@ -4,17 +4,31 @@ Bias Analyzer agent - analyzes bias indicators across sources.
 
 from google.adk.agents import LlmAgent
 
-from ..callbacks import rate_limit_delay
+from ..callbacks import (
+    enforce_prompt_budget,
+    handle_model_error,
+    record_model_usage,
+    throttle_model_call,
+    use_context_cache,
+)
 from ..config import config
+from ..projections import projected_instruction
 from ..prompts import BIAS_ANALYZER_INSTRUCTION
 from ..tools import callback_api_tool
 
 bias_analyzer = LlmAgent(
     name="bias_analyzer",
     model=config.default_model,
-    instruction=BIAS_ANALYZER_INSTRUCTION,
+    include_contents="none",
+    instruction=projected_instruction(BIAS_ANALYZER_INSTRUCTION, "bias_analyzer"),
     tools=[callback_api_tool],
-    before_agent_callback=rate_limit_delay,
+    before_model_callback=[
+        use_context_cache,
+        enforce_prompt_budget,
+        throttle_model_call,
+    ],
+    after_model_callback=record_model_usage,
+    on_model_error_callback=handle_model_error,
     output_key="bias_analysis",
     description="Analyzes bias indicators across sources",
 )
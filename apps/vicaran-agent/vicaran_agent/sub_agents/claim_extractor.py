@@ -4,18 +4,34 @@ Claim Extractor agent - extracts and ranks claims from sources.
 
 from google.adk.agents import LlmAgent
 
-from ..callbacks import batch_save_claims, debug_claim_extractor_input
+from ..callbacks import (
+    batch_save_claims,
+    debug_claim_extractor_input,
+    enforce_prompt_budget,
+    handle_model_error,
+    prepare_context_cache,
+    record_model_usage,
+    throttle_model_call,
+)
 from ..config import config
+from ..models import Claim
+from ..projections import projected_instruction
 from ..prompts import CLAIM_EXTRACTOR_INSTRUCTION
-from ..tools import callback_api_tool, jina_reader_tool
 
 claim_extractor = LlmAgent(
     name="claim_extractor",
     model=config.default_model,
-    instruction=CLAIM_EXTRACTOR_INSTRUCTION,
-    tools=[jina_reader_tool, callback_api_tool],
+    include_contents="none",
+    instruction=projected_instruction(CLAIM_EXTRACTOR_INSTRUCTION, "claim_extractor"),
+    # One structured answer (no tools); batch_save_claims persists it in one
+    # bulk write
+    output_schema=list[Claim],
     before_agent_callback=debug_claim_extractor_input,
-    after_agent_callback=batch_save_claims,
+    before_model_callback=[enforce_prompt_budget, throttle_model_call],
+    after_model_callback=record_model_usage,
+    on_model_error_callback=handle_model_error,
+    # Sources and claims are final here: snapshot them for the context cache
+    after_agent_callback=[batch_save_claims, prepare_context_cache],
     output_key="extracted_claims",
     description="Extracts and ranks claims from all sources",
 )
@@ -4,15 +4,35 @@ Fact Checker agent - verifies claims against source evidence.
 
 from google.adk.agents import LlmAgent
 
+from ..callbacks import (
+    batch_save_fact_checks,
+    enforce_prompt_budget,
+    handle_model_error,
+    record_model_usage,
+    throttle_model_call,
+    use_context_cache,
+)
 from ..config import config
+from ..models import FactCheck
+from ..projections import projected_instruction
 from ..prompts import FACT_CHECKER_INSTRUCTION
-from ..tools import callback_api_tool, tavily_search_tool
 
 fact_checker = LlmAgent(
     name="fact_checker",
     model=config.default_model,
-    instruction=FACT_CHECKER_INSTRUCTION,
-    tools=[tavily_search_tool, callback_api_tool],
+    include_contents="none",
+    instruction=projected_instruction(FACT_CHECKER_INSTRUCTION, "fact_checker"),
+    # Verdicts come from the accumulated sources alone, in one structured
+    # answer that batch_save_fact_checks persists in one bulk write
+    output_schema=list[FactCheck],
+    before_model_callback=[
+        use_context_cache,
+        enforce_prompt_budget,
+        throttle_model_call,
+    ],
+    after_model_callback=record_model_usage,
+    on_model_error_callback=handle_model_error,
+    after_agent_callback=batch_save_fact_checks,
     output_key="fact_check_results",
     description="Verifies claims against source evidence",
 )
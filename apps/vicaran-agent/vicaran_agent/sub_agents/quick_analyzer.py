@@ -0,0 +1,34 @@
+"""
+Quick Analyzer agent - claims, verdicts, bias and summary in one quick-mode call.
+"""
+
+from google.adk.agents import LlmAgent
+
+from ..callbacks import (
+    enforce_prompt_budget,
+    handle_model_error,
+    record_model_usage,
+    save_final_summary,
+    save_quick_analysis,
+    throttle_model_call,
+)
+from ..config import config
+from ..models import QuickAnalysis
+from ..projections import projected_instruction
+from ..prompts import QUICK_ANALYZER_INSTRUCTION
+
+quick_analyzer = LlmAgent(
+    name="quick_analyzer",
+    model=config.default_model,
+    include_contents="none",
+    instruction=projected_instruction(QUICK_ANALYZER_INSTRUCTION, "quick_analyzer"),
+    # One structured answer replaces the claim, fact-check, bias and summary
+    # stages; save_quick_analysis persists it with the same callback types
+    output_schema=QuickAnalysis,
+    before_model_callback=[enforce_prompt_budget, throttle_model_call],
+    after_model_callback=record_model_usage,
+    on_model_error_callback=handle_model_error,
+    after_agent_callback=[save_quick_analysis, save_final_summary],
+    output_key="quick_analysis",
+    description="Extracts, verifies and scores claims and writes the quick summary",
+)
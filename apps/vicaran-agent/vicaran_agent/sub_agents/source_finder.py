@@ -4,7 +4,14 @@ Source Finder agent - discovers additional sources via web search.
 
 from google.adk.agents import LlmAgent
 
-from ..callbacks import batch_save_sources
+from ..callbacks import (
+    batch_save_sources,
+    compact_source_history,
+    enforce_prompt_budget,
+    handle_model_error,
+    record_model_usage,
+    throttle_model_call,
+)
 from ..config import config
 from ..prompts import SOURCE_FINDER_INSTRUCTION
 from ..tools import callback_api_tool, jina_reader_tool, tavily_search_tool
@@ -14,6 +21,14 @@ source_finder = LlmAgent(
     model=config.default_model,
     instruction=SOURCE_FINDER_INSTRUCTION,
     tools=[tavily_search_tool, jina_reader_tool, callback_api_tool],
+    # Page text of already-saved sources is not re-sent on later turns
+    before_model_callback=[
+        compact_source_history,
+        enforce_prompt_budget,
+        throttle_model_call,
+    ],
+    after_model_callback=record_model_usage,
+    on_model_error_callback=handle_model_error,
     after_agent_callback=batch_save_sources,
     output_key="discovered_sources",
     description="Discovers additional sources via web search based on investigation brief",
@@ -0,0 +1,28 @@
+"""
+Source Summarizer agent - assesses pages fetched by code-driven source discovery.
+"""
+
+from google.adk.agents import LlmAgent
+
+from ..callbacks import (
+    enforce_prompt_budget,
+    handle_model_error,
+    record_model_usage,
+    throttle_model_call,
+)
+from ..config import config
+from ..models import SourceAssessment
+from ..prompts import SOURCE_SUMMARIZER_INSTRUCTION
+
+source_summarizer = LlmAgent(
+    name="source_summarizer",
+    model=config.default_model,
+    # Replaced per page by SourceDiscoveryAgent
+    instruction=SOURCE_SUMMARIZER_INSTRUCTION,
+    include_contents="none",
+    output_schema=SourceAssessment,
+    before_model_callback=[enforce_prompt_budget, throttle_model_call],
+    after_model_callback=record_model_usage,
+    on_model_error_callback=handle_model_error,
+    description="Summarizes, scores and extracts key claims from one fetched page",
+)
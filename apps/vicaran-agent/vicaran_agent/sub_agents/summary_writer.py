@@ -4,16 +4,42 @@ Summary Writer agent - generates final investigation summary.
 
 from google.adk.agents import LlmAgent
 
-from ..callbacks import save_final_summary
+from ..callbacks import (
+    enforce_prompt_budget,
+    finish_summary_streaming,
+    handle_model_error,
+    record_model_usage,
+    release_context_cache,
+    save_final_summary,
+    start_summary_streaming,
+    stream_summary_sections,
+    throttle_model_call,
+    use_context_cache,
+)
 from ..config import config
+from ..projections import projected_instruction
 from ..prompts import SUMMARY_WRITER_INSTRUCTION
 
 summary_writer = LlmAgent(
     name="summary_writer",
     model=config.default_model,
-    instruction=SUMMARY_WRITER_INSTRUCTION,
+    include_contents="none",
+    instruction=projected_instruction(SUMMARY_WRITER_INSTRUCTION, "summary_writer"),
     # No tools needed - callback handles persistence
-    after_agent_callback=save_final_summary,
+    before_agent_callback=start_summary_streaming,
+    before_model_callback=[
+        use_context_cache,
+        enforce_prompt_budget,
+        throttle_model_call,
+    ],
+    # Partial sections are streamed to the backend while the model writes
+    after_model_callback=[stream_summary_sections, record_model_usage],
+    on_model_error_callback=handle_model_error,
+    after_agent_callback=[
+        save_final_summary,
+        finish_summary_streaming,
+        release_context_cache,
+    ],
     output_key="investigation_summary",
     description="Generates final investigation summary with citations",
 )
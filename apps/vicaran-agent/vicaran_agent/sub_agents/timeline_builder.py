@@ -5,15 +5,31 @@ Skipped in Quick Search mode.
 
 from google.adk.agents import LlmAgent
 
+from ..callbacks import (
+    enforce_prompt_budget,
+    handle_model_error,
+    record_model_usage,
+    throttle_model_call,
+    use_context_cache,
+)
 from ..config import config
+from ..projections import projected_instruction
 from ..prompts import TIMELINE_BUILDER_INSTRUCTION
 from ..tools import callback_api_tool
 
 timeline_builder = LlmAgent(
     name="timeline_builder",
     model=config.default_model,
-    instruction=TIMELINE_BUILDER_INSTRUCTION,
+    include_contents="none",
+    instruction=projected_instruction(TIMELINE_BUILDER_INSTRUCTION, "timeline_builder"),
     tools=[callback_api_tool],
+    before_model_callback=[
+        use_context_cache,
+        enforce_prompt_budget,
+        throttle_model_call,
+    ],
+    after_model_callback=record_model_usage,
+    on_model_error_callback=handle_model_error,
     output_key="timeline_events",
     description="Constructs chronological timeline from sources (skipped in Quick mode)",
 )
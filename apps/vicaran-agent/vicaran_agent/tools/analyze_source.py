@@ -75,7 +75,7 @@ def get_credibility_score(domain: str) -> int:
     return 3
 
 
-def analyze_source_tool(
+async def analyze_source_tool(
     url: str,
     tool_context: ToolContext,
 ) -> dict[str, Any]:
@@ -101,7 +101,9 @@ def analyze_source_tool(
         print(f"\n🔎 ANALYZE SOURCE: {url}")
 
     try:
-        response = httpx.get(jina_url, timeout=30)
+        # Async, so cancelling the investigation aborts the request
+        async with httpx.AsyncClient(timeout=30) as client:
+            response = await client.get(jina_url)
         content = response.text[:5000]  # Limit for LLM
 
         # Check for blocked/error content
@@ -3,15 +3,21 @@ Callback API tool for communicating with the Next.js backend.
 Sends investigation data to the database via the agent-callback API endpoint.
 """
 
+import asyncio
+from collections.abc import MutableMapping
 from typing import Any
 
-import httpx
 from google.adk.tools import ToolContext
 
+from vicaran_agent.accumulators import claims_accumulator, sources_accumulator
+from vicaran_agent.cancellation import investigation_cancellations
+from vicaran_agent.checkpoints import item_key, stage_checkpoints
 from vicaran_agent.config import config
+from vicaran_agent.persistence import persistence_backend
+from vicaran_agent.transport import CallbackDeliveryError
 
 
-def callback_api_tool(
+async def callback_api_tool(
     callback_type: str,
     data: dict[str, Any],
     tool_context: ToolContext,
@@ -33,22 +39,6 @@ def callback_api_tool(
     if not investigation_id:
         return {"success": False, "error": "No investigation_id in session state"}
 
-    api_url = config.callback_api_url
-    api_secret = config.agent_secret
-
-    # API expects 'type' not 'callback_type'
-    payload = {
-        "type": callback_type,
-        "investigation_id": investigation_id,
-        "data": data,
-    }
-
-    # Use X-Agent-Secret header to match existing API
-    headers = {
-        "Content-Type": "application/json",
-        "X-Agent-Secret": api_secret,
-    }
-
     # DEBUG MODE - Enable with DEBUG_MODE=true in .env
     if config.debug_mode:
         print(f"\n🚀 CALLBACK FIRED: {callback_type}")
@@ -56,48 +46,14 @@ def callback_api_tool(
         print(f"📦 PAYLOAD: {str(data)[:200]}...")
 
     try:
-        response = httpx.post(api_url, json=payload, headers=headers, timeout=30)
-        response.raise_for_status()
-        result = response.json()
-
-        if config.debug_mode:
-            print(f"✅ RESPONSE: {result}")
-
-        # Accumulate data to session state for downstream agents
-        if callback_type == "SOURCE_FOUND" and result.get("source_id"):
-            sources_list = tool_context.state.get("sources_accumulated", [])
-            sources_list.append(
-                {
-                    "source_id": result["source_id"],
-                    "title": data.get("title", ""),
-                    "url": data.get("url", ""),
-                    "credibility_score": data.get("credibility_score", 0),
-                    "key_claims": data.get("key_claims", []),
-                    "summary": data.get("summary", ""),
-                }
-            )
-            tool_context.state["sources_accumulated"] = sources_list
-            if config.debug_mode:
-                print(f"📊 Accumulated {len(sources_list)} sources in session state")
-
-        elif callback_type == "CLAIM_EXTRACTED" and result.get("claim_id"):
-            claims_list = tool_context.state.get("claims_accumulated", [])
-            claims_list.append(
-                {
-                    "claim_id": result["claim_id"],
-                    "claim_text": data.get("claim_text", ""),
-                    "source_ids": data.get("source_ids", []),
-                    "importance_score": data.get("importance_score", 0),
-                }
-            )
-            tool_context.state["claims_accumulated"] = claims_list
-            if config.debug_mode:
-                print(f"📊 Accumulated {len(claims_list)} claims in session state")
+        result = await save_item(
+            tool_context.state, investigation_id, callback_type, data
+        )
 
         # API returns created IDs: source_id, claim_id, fact_check_id, event_id
         return {"success": True, **result}
-    except httpx.HTTPStatusError as e:
-        error_msg = f"HTTP {e.response.status_code}: {e.response.text[:200]}"
+    except CallbackDeliveryError as e:
+        error_msg = str(e)
         if config.debug_mode:
             print(f"❌ HTTP ERROR: {error_msg}")
         return {"success": False, "error": error_msg}
@@ -105,3 +61,168 @@ def callback_api_tool(
         if config.debug_mode:
             print(f"❌ ERROR: {str(e)}")
         return {"success": False, "error": str(e)}
+
+
+async def save_item(
+    state: MutableMapping[str, Any],
+    investigation_id: str,
+    callback_type: str,
+    data: dict[str, Any],
+) -> dict[str, Any]:
+    """Persist one item and accumulate it in session state for downstream agents.
+
+    Used by callback_api_tool and by stages that save items from code.
+
+    Raises:
+        CallbackDeliveryError: If the callback API rejects the item
+    """
+    # Callback API (HTTP or stream) or direct database, depending on config
+    # Items written before a crash are not written again on resume; the
+    # ledger is SQLite, so it is read and written off the event loop
+    key = item_key(callback_type, data) if config.checkpoints_enabled else None
+    result = (
+        await asyncio.to_thread(stage_checkpoints.persisted, investigation_id, key)
+        if key
+        else None
+    )
+    if result is None:
+        try:
+            result = await persistence_backend.save(
+                investigation_id, callback_type, data
+            )
+        except CallbackDeliveryError as e:
+            _cancel_if_gone(investigation_id, e)
+            raise
+        if key:
+            await asyncio.to_thread(
+                stage_checkpoints.record_persisted, investigation_id, key, result
+            )
+    elif config.debug_mode:
+        print(f"♻️ ALREADY PERSISTED: {key}")
+
+    if config.debug_mode:
+        print(f"✅ RESPONSE: {result}")
+
+    _accumulate(state, callback_type, data, result)
+    return result
+
+
+async def save_items(
+    state: MutableMapping[str, Any],
+    investigation_id: str,
+    callback_type: str,
+    items: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Persist several items of one type in one bulk write and accumulate them.
+
+    Used by the after-agent hooks of structured-output stages. Items already
+    in the checkpoint ledger are not written again.
+
+    Returns:
+        Results in input order; rejected items as ``{"success": False, ...}``
+
+    Raises:
+        CallbackDeliveryError: If the callback API rejects the whole batch
+    """
+    keys = [
+        item_key(callback_type, data) if config.checkpoints_enabled else None
+        for data in items
+    ]
+    results: list[dict[str, Any] | None] = (
+        await asyncio.to_thread(_persisted_results, investigation_id, keys)
+        if any(keys)
+        else [None] * len(items)
+    )
+    pending = [index for index, result in enumerate(results) if result is None]
+    if pending:
+        try:
+            saved = await persistence_backend.save_many(
+                investigation_id, callback_type, [items[index] for index in pending]
+            )
+        except CallbackDeliveryError as e:
+            _cancel_if_gone(investigation_id, e)
+            raise
+        recorded: list[tuple[str, dict[str, Any]]] = []
+        for index, result in zip(pending, saved, strict=True):
+            results[index] = result
+            # Rejected items are neither recorded nor accumulated
+            if keys[index] and result.get("success") is not False:
+                recorded.append((keys[index], result))
+        if recorded:
+            await asyncio.to_thread(_record_results, investigation_id, recorded)
+
+    if config.debug_mode:
+        reused = len(items) - len(pending)
+        print(
+            f"✅ BULK {callback_type}: wrote {len(pending)} items"
+            + (f", {reused} already persisted" if reused else "")
+        )
+
+    for data, result in zip(items, results, strict=True):
+        _accumulate(state, callback_type, data, result)
+    return results
+
+
+def _persisted_results(
+    investigation_id: str, keys: list[str | None]
+) -> list[dict[str, Any] | None]:
+    return [
+        stage_checkpoints.persisted(investigation_id, key) if key else None
+        for key in keys
+    ]
+
+
+def _record_results(
+    investigation_id: str, recorded: list[tuple[str, dict[str, Any]]]
+) -> None:
+    for key, result in recorded:
+        stage_checkpoints.record_persisted(investigation_id, key, result)
+
+
+def _cancel_if_gone(investigation_id: str, error: CallbackDeliveryError) -> None:
+    """Cancel the investigation once the backend no longer knows it."""
+    # The only 404 the callback API returns is "Investigation not found":
+    # it was deleted, so nobody is waiting for the rest
+    if error.status_code == 404:
+        investigation_cancellations.cancel(
+            investigation_id, "Investigation no longer exists"
+        )
+
+
+def _accumulate(
+    state: MutableMapping[str, Any],
+    callback_type: str,
+    data: dict[str, Any],
+    result: dict[str, Any],
+) -> None:
+    """Accumulate a saved item in session state for downstream agents."""
+    # (append-only: the state delta carries just the new item)
+    if callback_type == "SOURCE_FOUND" and result.get("source_id"):
+        sources_accumulator.append(
+            state,
+            {
+                "source_id": result["source_id"],
+                "title": data.get("title", ""),
+                "url": data.get("url", ""),
+                "credibility_score": data.get("credibility_score", 0),
+                "key_claims": data.get("key_claims", []),
+                "summary": data.get("summary", ""),
+            },
+        )
+        if config.debug_mode:
+            source_count = len(sources_accumulator.items(state))
+            print(f"📊 Accumulated {source_count} sources in session state")
+
+    elif callback_type == "CLAIM_EXTRACTED" and result.get("claim_id"):
+        claims_accumulator.append(
+            state,
+            {
+                "claim_id": result["claim_id"],
+                "claim_text": data.get("claim_text", ""),
+                "source_ids": data.get("source_ids", []),
+                "importance_score": data.get("importance_score", 0),
+            },
+        )
+        if config.debug_mode:
+            claim_count = len(claims_accumulator.items(state))
+            print(f"📊 Accumulated {claim_count} claims in session state")
@@ -33,7 +33,7 @@ def is_blocked_content(content: str) -> bool:
     return any(indicator in content_lower for indicator in BLOCKED_CONTENT_INDICATORS)
 
 
-def jina_reader_tool(
+async def jina_reader_tool(
     url: str,
     tool_context: ToolContext,
 ) -> dict[str, Any]:
@@ -46,6 +46,11 @@ def jina_reader_tool(
     Returns:
         Extracted content with metadata
     """
+    return await fetch_url(url)
+
+
+async def fetch_url(url: str) -> dict[str, Any]:
+    """Fetch one page via Jina Reader (shared by the tool and code-driven discovery)."""
     domain = urlparse(url).netloc
 
     # Jina Reader endpoint (no API key needed for basic usage)
@@ -56,7 +61,9 @@ def jina_reader_tool(
         print(f"\n📖 JINA READER: {url}")
 
     try:
-        response = httpx.get(jina_url, timeout=30)
+        # Async, so cancelling the investigation aborts the request
+        async with httpx.AsyncClient(timeout=30) as client:
+            response = await client.get(jina_url)
         content = response.text[:5000]  # Limit for LLM processing
 
         # Check for blocked/error content
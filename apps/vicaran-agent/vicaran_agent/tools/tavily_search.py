@@ -24,7 +24,7 @@ class SearchResponse(TypedDict):
     error: str | None
 
 
-def tavily_search_tool(
+async def tavily_search_tool(
     query: str,
     tool_context: ToolContext,
     max_results: int = 10,
@@ -39,6 +39,11 @@ def tavily_search_tool(
     Returns:
         Search results with titles, URLs, and snippets
     """
+    return await search_web(query, max_results)
+
+
+async def search_web(query: str, max_results: int = 10) -> SearchResponse:
+    """Run one Tavily search (shared by the tool and code-driven discovery)."""
     api_key = os.getenv("TAVILY_API_KEY")
     if not api_key:
         return {
@@ -65,7 +70,9 @@ def tavily_search_tool(
         print(f"\n🔍 TAVILY SEARCH: {query}")
 
     try:
-        response = httpx.post(api_url, json=payload, timeout=30)
+        # Async, so cancelling the investigation aborts the request
+        async with httpx.AsyncClient(timeout=30) as client:
+            response = await client.post(api_url, json=payload)
         response.raise_for_status()
         result = response.json()
 
@@ -0,0 +1,278 @@
+"""
+Callback transports for sending investigation progress to the Next.js backend.
+
+- HttpCallbackTransport: one POST per callback (request/response, the default)
+- StreamCallbackTransport: per-investigation channel that multiplexes all
+  callback types as NDJSON frames over a kept-alive connection and resolves
+  each event from its streamed acknowledgement. Falls back to HTTP when the
+  stream endpoint is unavailable.
+"""
+
+import asyncio
+import itertools
+import json
+from typing import Any
+
+import httpx
+
+from .config import config
+
+
+class CallbackDeliveryError(Exception):
+    """The backend rejected a callback or it could not be delivered."""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(f"HTTP {status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class StreamUnavailableError(Exception):
+    """The stream endpoint is not available; nothing was processed."""
+
+
+def build_callback_payload(
+    investigation_id: str, callback_type: str, data: dict[str, Any]
+) -> dict[str, Any]:
+    """Build the request body expected by the agent-callback API."""
+    # API expects 'type' not 'callback_type'
+    return {
+        "type": callback_type,
+        "investigation_id": investigation_id,
+        "data": data,
+    }
+
+
+class _PooledClient:
+    """Lazily created AsyncClient, rebuilt if the event loop changes."""
+
+    def __init__(
+        self, api_secret: str, transport: httpx.AsyncBaseTransport | None
+    ) -> None:
+        self._api_secret = api_secret
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def get(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=30,
+                transport=self._transport,
+                # Use X-Agent-Secret header to match existing API
+                headers={"X-Agent-Secret": self._api_secret},
+            )
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+
+# =============================================================================
+# REQUEST/RESPONSE TRANSPORT
+# =============================================================================
+
+
+class HttpCallbackTransport:
+    """Sends each callback as its own POST over a pooled connection."""
+
+    def __init__(
+        self,
+        api_url: str,
+        api_secret: str,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.api_url = api_url
+        self._client = _PooledClient(api_secret, transport)
+
+    async def send(
+        self, investigation_id: str, callback_type: str, data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Send one callback and return the API response body."""
+        try:
+            response = await self._client.get().post(
+                self.api_url,
+                json=build_callback_payload(investigation_id, callback_type, data),
+            )
+        except httpx.HTTPError as e:
+            raise CallbackDeliveryError(0, str(e) or type(e).__name__) from e
+        if not response.is_success:
+            raise CallbackDeliveryError(response.status_code, response.text[:200])
+        return response.json()
+
+    async def close_investigation(self, investigation_id: str) -> None:
+        """No per-investigation state to release."""
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+# =============================================================================
+# STREAMING TRANSPORT
+# =============================================================================
+
+
+class _InvestigationStream:
+    """Ordered, multiplexed callback channel for one investigation."""
+
+    def __init__(self, owner: "StreamCallbackTransport", investigation_id: str):
+        self._owner = owner
+        self.investigation_id = investigation_id
+        self._seq = itertools.count(1)
+        self._pending: list[tuple[int, dict[str, Any], asyncio.Future[Any]]] = []
+        self._pump_task: asyncio.Task[None] | None = None
+
+    async def submit(self, callback_type: str, data: dict[str, Any]) -> Any:
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        payload = build_callback_payload(self.investigation_id, callback_type, data)
+        self._pending.append((next(self._seq), payload, future))
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.create_task(self._pump())
+        return await future
+
+    async def _pump(self) -> None:
+        while self._pending:
+            # Short linger so events emitted together share one frame
+            await asyncio.sleep(self._owner.linger_seconds)
+            frame = self._pending[: self._owner.max_frame_events]
+            del self._pending[: len(frame)]
+            await self._send_frame(frame)
+
+    async def _send_frame(
+        self, frame: list[tuple[int, dict[str, Any], asyncio.Future[Any]]]
+    ) -> None:
+        waiting = {seq: future for seq, _, future in frame}
+        body = "".join(
+            json.dumps({"seq": seq, **payload}) + "\n" for seq, payload, _ in frame
+        )
+        try:
+            async with self._owner.client.get().stream(
+                "POST",
+                self._owner.stream_url,
+                content=body,
+                headers={"Content-Type": "application/x-ndjson"},
+            ) as response:
+                if response.status_code in (404, 405, 501):
+                    raise StreamUnavailableError(
+                        f"stream endpoint returned {response.status_code}"
+                    )
+                if not response.is_success:
+                    detail = (await response.aread()).decode(errors="replace")[:200]
+                    error = CallbackDeliveryError(response.status_code, detail)
+                    for future in waiting.values():
+                        if not future.done():
+                            future.set_exception(error)
+                    return
+                # Acks arrive as the backend processes each event
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    ack = json.loads(line)
+                    future = waiting.pop(ack.get("seq"), None)
+                    # The caller may have been cancelled meanwhile
+                    if future is None or future.done():
+                        continue
+                    status = int(ack.get("status", 500))
+                    ack_body = ack.get("body") or {}
+                    if 200 <= status < 300:
+                        future.set_result(ack_body)
+                    else:
+                        future.set_exception(
+                            CallbackDeliveryError(status, json.dumps(ack_body)[:200])
+                        )
+            missing = CallbackDeliveryError(502, "No acknowledgement received")
+            for future in waiting.values():
+                if not future.done():
+                    future.set_exception(missing)
+        except (StreamUnavailableError, httpx.ConnectError) as e:
+            # Nothing reached the backend, so the caller can safely fall back
+            for future in waiting.values():
+                if not future.done():
+                    future.set_exception(StreamUnavailableError(str(e)))
+        except (httpx.HTTPError, ValueError) as e:
+            error = CallbackDeliveryError(0, str(e) or type(e).__name__)
+            for future in waiting.values():
+                if not future.done():
+                    future.set_exception(error)
+
+    async def close(self) -> None:
+        if self._pump_task is not None:
+            await asyncio.gather(self._pump_task, return_exceptions=True)
+
+
+class StreamCallbackTransport:
+    """Multiplexes callbacks per investigation over a persistent channel."""
+
+    def __init__(
+        self,
+        stream_url: str,
+        api_secret: str,
+        fallback: HttpCallbackTransport,
+        linger_seconds: float = 0.025,
+        max_frame_events: int = 50,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.stream_url = stream_url
+        self.fallback = fallback
+        self.linger_seconds = linger_seconds
+        self.max_frame_events = max_frame_events
+        self.client = _PooledClient(api_secret, transport)
+        self.stream_available = True
+        self._streams: dict[str, _InvestigationStream] = {}
+
+    async def send(
+        self, investigation_id: str, callback_type: str, data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Send one callback through the investigation's stream."""
+        if not self.stream_available:
+            return await self.fallback.send(investigation_id, callback_type, data)
+
+        stream = self._streams.get(investigation_id)
+        if stream is None:
+            stream = _InvestigationStream(self, investigation_id)
+            self._streams[investigation_id] = stream
+        try:
+            return await stream.submit(callback_type, data)
+        except StreamUnavailableError as e:
+            if self.stream_available and config.debug_mode:
+                print(f"⚠️ CALLBACK STREAM UNAVAILABLE ({e}), using HTTP callbacks")
+            self.stream_available = False
+            return await self.fallback.send(investigation_id, callback_type, data)
+
+    async def close_investigation(self, investigation_id: str) -> None:
+        """Drain and drop the stream for a finished investigation."""
+        stream = self._streams.pop(investigation_id, None)
+        if stream is not None:
+            await stream.close()
+
+    async def close(self) -> None:
+        for investigation_id in list(self._streams):
+            await self.close_investigation(investigation_id)
+        await self.client.aclose()
+        await self.fallback.close()
+
+
+def create_callback_transport() -> HttpCallbackTransport | StreamCallbackTransport:
+    """Build the transport selected by config.callback_transport."""
+    http_transport = HttpCallbackTransport(config.callback_api_url, config.agent_secret)
+    if config.callback_transport != "stream":
+        return http_transport
+    stream_url = config.callback_stream_url or (
+        config.callback_api_url.rstrip("/") + "/stream"
+    )
+    return StreamCallbackTransport(
+        stream_url=stream_url,
+        api_secret=config.agent_secret,
+        fallback=http_transport,
+        linger_seconds=config.callback_stream_linger_ms / 1000,
+        max_frame_events=config.callback_stream_max_frame_events,
+    )
+
+
+# Global transport instance (clients are created lazily on first use)
+callback_transport = create_callback_transport()
@@ -7,6 +7,7 @@ import { createInvestigation, deleteInvestigation } from "@/lib/queries/investig
 import { saveInitialSources } from "@/lib/queries/sources";
 import { createClient } from "@/lib/supabase/server";
 import { AdkSessionService } from "@/lib/adk/session-service";
+import { cancelInvestigationRun } from "@/lib/adk/cancel-investigation";
 
 /**
  * Create a new investigation and trigger the ADK agent
@@ -94,6 +95,7 @@ export async function createInvestigationAction(formData: FormData): Promise<nev
             body: JSON.stringify({
                 userId: user.id,
                 sessionId: adkSession.id,
+                investigationId: investigation.id,
                 message: firstMessage,
             }),
         }).catch((error) => {
@@ -131,6 +133,11 @@ export async function deleteInvestigationAction(investigationId: string): Promis
     }
 
     try {
+        // Abandoned: stop the agent run so it frees its model quota
+        await cancelInvestigationRun(investigationId, {
+            reason: "Investigation deleted by the user",
+        });
+
         const deleted = await deleteInvestigation(investigationId, user.id);
 
         if (!deleted) {
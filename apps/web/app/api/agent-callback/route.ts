@@ -174,7 +174,7 @@ export async function POST(request: NextRequest): Promise<Response> {
                             target: [sources.investigation_id, sources.url],
                             set: {
                                 title: payload.data.title,
-                                content_snippet: payload.data.content_snippet,
+                                content_snippet: payload.data.content_snippet || payload.data.summary,
                                 credibility_score: payload.data.credibility_score,
                             },
                         })
@@ -0,0 +1,63 @@
+import { NextRequest, NextResponse } from "next/server";
+import { POST as handleCallback } from "../route";
+
+// Streaming variant of the agent callback API.
+// The agent sends NDJSON frames ({ seq, type, investigation_id, data } per line)
+// multiplexing every callback type for one investigation. Each event is processed
+// in order by the regular callback handler and acknowledged as soon as it is done
+// with an NDJSON line: { seq, status, body }.
+export async function POST(request: NextRequest): Promise<Response> {
+    const secret = request.headers.get("X-Agent-Secret");
+    if (secret !== process.env.AGENT_SECRET) {
+        return NextResponse.json(
+            { error: "Unauthorized - Invalid agent secret" },
+            { status: 401 }
+        );
+    }
+
+    const lines = (await request.text()).split("\n").filter((line) => line.trim());
+    const encoder = new TextEncoder();
+
+    const stream = new ReadableStream({
+        async start(controller) {
+            for (const line of lines) {
+                let seq: number | null = null;
+                try {
+                    const { seq: frameSeq, ...callback } = JSON.parse(line);
+                    seq = frameSeq ?? null;
+
+                    const response = await handleCallback(
+                        new NextRequest(request.url, {
+                            method: "POST",
+                            headers: {
+                                "Content-Type": "application/json",
+                                "X-Agent-Secret": secret ?? "",
+                            },
+                            body: JSON.stringify(callback),
+                        })
+                    );
+                    const body = await response.json().catch(() => ({}));
+                    controller.enqueue(
+                        encoder.encode(JSON.stringify({ seq, status: response.status, body }) + "\n")
+                    );
+                } catch (error) {
+                    console.error("Agent callback stream error:", error);
+                    controller.enqueue(
+                        encoder.encode(
+                            JSON.stringify({
+                                seq,
+                                status: 400,
+                                body: { error: "Invalid stream frame" },
+                            }) + "\n"
+                        )
+                    );
+                }
+            }
+            controller.close();
+        },
+    });
+
+    return new Response(stream, {
+        headers: { "Content-Type": "application/x-ndjson" },
+    });
+}
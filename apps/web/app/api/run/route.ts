@@ -1,5 +1,6 @@
 import { NextRequest } from "next/server";
 import { getCurrentUserId } from "@/lib/auth";
+import { cancelInvestigationRun } from "@/lib/adk/cancel-investigation";
 import { devLog } from "@/lib/utils/logger";
 
 interface ADKAgentRequest {
@@ -13,6 +14,9 @@ interface ADKAgentRequest {
   streaming: boolean;
 }
 
+// Longest an investigation run may take before it is cancelled
+const AGENT_RUN_TIMEOUT_MS = 45 * 60 * 1000;
+
 export async function POST(request: NextRequest): Promise<Response> {
   try {
     // Step 1: Get user ID
@@ -22,7 +26,12 @@ export async function POST(request: NextRequest): Promise<Response> {
     }
 
     // Step 2: Extract and validate request data
-    const { userId: requestUserId, message, sessionId } = await request.json();
+    const {
+      userId: requestUserId,
+      message,
+      sessionId,
+      investigationId,
+    } = await request.json();
 
     devLog("[ADK CHAT] 📋 Processing request:", {
       requestUserId,
@@ -59,6 +68,7 @@ export async function POST(request: NextRequest): Promise<Response> {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify(agentRequest),
+      signal: AbortSignal.timeout(AGENT_RUN_TIMEOUT_MS),
     })
       .then((response) => {
         if (!response.ok) {
@@ -69,6 +79,15 @@ export async function POST(request: NextRequest): Promise<Response> {
       })
       .catch((error) => {
         console.error("[ADK CHAT] Agent trigger error:", error);
+        // Aborting the request does not stop the run on the agent server
+        const timedOut =
+          error instanceof Error && error.name === "TimeoutError";
+        if (investigationId && timedOut) {
+          void cancelInvestigationRun(investigationId, {
+            reason: "Investigation request timed out",
+            notify: true,
+          });
+        }
       });
 
     // Step 6: Return success response
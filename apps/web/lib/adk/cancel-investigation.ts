@@ -0,0 +1,65 @@
+import {
+  getEndpointForPath,
+  shouldUseAgentEngine,
+} from "@/lib/config/backend-config";
+import { getAuthHeaders } from "@/lib/config/server-auth";
+import { devLog } from "@/lib/utils/logger";
+
+export interface CancelInvestigationOptions {
+  reason?: string;
+  // Ask the agent to report INVESTIGATION_FAILED (not needed for deletions)
+  notify?: boolean;
+}
+
+/**
+ * Stops an investigation's agent run so it releases its model quota.
+ *
+ * Best effort: failures are logged, never thrown, so callers can use it
+ * while abandoning or deleting an investigation.
+ */
+export async function cancelInvestigationRun(
+  investigationId: string,
+  {
+    reason = "Cancelled by the user",
+    notify = false,
+  }: CancelInvestigationOptions = {}
+): Promise<boolean> {
+  // Agent Engine exposes it as a class method (AgentEngineApp.cancel_investigation)
+  const request = shouldUseAgentEngine()
+    ? {
+        endpoint: getEndpointForPath(""),
+        body: {
+          class_method: "cancel_investigation",
+          input: { investigation_id: investigationId, reason, notify },
+        },
+      }
+    : {
+        endpoint: getEndpointForPath(
+          `/investigations/${investigationId}/cancel`
+        ),
+        body: { reason, notify },
+      };
+
+  try {
+    const response = await fetch(request.endpoint, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+        ...(await getAuthHeaders()),
+      },
+      body: JSON.stringify(request.body),
+    });
+    if (!response.ok) {
+      console.error(
+        "❌ [CANCEL_INVESTIGATION] Agent cancel failed:",
+        response.status
+      );
+      return false;
+    }
+    devLog("🛑 [CANCEL_INVESTIGATION] Agent run cancelled:", investigationId);
+    return true;
+  } catch (error) {
+    console.error("❌ [CANCEL_INVESTIGATION] Agent cancel error:", error);
+    return false;
+  }
+}
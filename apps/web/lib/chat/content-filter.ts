@@ -16,6 +16,8 @@ const INTERNAL_MARKERS = [
     '[NO_CLAIMS_EXTRACTED]',
     '[NO_CLAIMS_TO_VERIFY]',
     '[BIAS_SKIPPED]',
+    '[BUDGET_SKIPPED]',
+    '[INVESTIGATION_CANCELLED]',
 ];
 
 /**